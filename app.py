@@ -1,13 +1,15 @@
 """
 智能简历数据库系统 - 主应用
 """
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, Response
 import io
 import json
 from werkzeug.utils import secure_filename
 import os
 import secrets
+import time
 from datetime import datetime
+import functools
 from functools import wraps
 from config import Config
 import ssl
@@ -86,12 +88,25 @@ def initialize_app():
         print("应用将继续启动...")
 
 # 初始化将在应用启动时执行（见文件末尾）
-from models import get_db_session, Resume, Position, Interview, User, GlobalAIConfig
+from models import get_db_session, remove_request_session, commit_serialized, Resume, Position, Interview, User, GlobalAIConfig, \
+    RESUME_SELECTABLE_FIELDS, RESUME_SORT_FIELDS, resume_list_columns
 from database_manager import get_database_manager
 from utils.file_parser import extract_text
-from utils.info_extractor import InfoExtractor
-from utils.ai_extractor import AIExtractor
-from utils.duplicate_checker import check_duplicate
+from utils.pdf_extractor import extract_pdf_intelligent, get_tier_stats
+from utils import parse_pool
+from utils.ai_extractor import AIExtractor, merge_extraction_results
+from utils import ai_loop
+from utils.ai_limiter import limiter_stats
+from utils.extraction_cache import get_extraction_cache, cache_key, file_sha256
+from utils.ai_cache import get_ai_cache
+from utils.duplicate_checker import check_duplicate, load_duplicate_candidates
+from utils.resume_search import build_match_query, apply_fulltext_search, relevance_page, count_matches
+from utils.pagination import keyset_page, clamp_page_size, CountCache, CursorError
+from utils.change_feed import ChangeFeed, SYNC_TABLES, changes_since
+from utils.funnel_stats import funnel_counts_by_position, funnel_counts_from_rollup, funnel_totals, funnel_rows
+from job_queue import ParseJobQueue, QueueFullError
+from metrics import StageTimer, parse_metrics, db_pool_metrics
+from parse_events import parse_events
 from utils.export import export_resumes_to_excel, export_interviews_to_excel
 from utils.export_pdf import export_resume_analysis_to_pdf, export_interview_round_analysis_to_pdf
 from openpyxl import Workbook
@@ -102,9 +117,8 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.pdfgen import canvas
 from reportlab.platypus import Table, TableStyle
-import threading
 from sqlalchemy import and_
-from sqlalchemy.orm import make_transient
+from sqlalchemy.orm import make_transient, load_only, joinedload
 import traceback
 import sys
 import re
@@ -139,6 +153,9 @@ app = Flask(__name__,
             static_folder='static')
 app.config.from_object(Config)
 
+# 每个请求共用一个数据库会话，请求结束时统一关闭（见 models.get_db_session）
+app.teardown_appcontext(remove_request_session)
+
 # 注册中文字体
 pdfmetrics.registerFont(UnicodeCIDFont('STSong-Light'))
 
@@ -236,12 +253,13 @@ def get_effective_ai_config():
     
     return config
 
-def create_ai_extractor(ai_config=None):
+def create_ai_extractor(ai_config=None, use_cache=True):
     """
     创建AI提取器实例
     
     Args:
         ai_config: 可选的AI配置字典，如果为None则使用get_effective_ai_config()
+        use_cache: 是否读取AI响应缓存（重新解析时传False）
     
     Returns:
         AIExtractor实例或None（如果AI未启用）
@@ -262,275 +280,14 @@ def create_ai_extractor(ai_config=None):
         return AIExtractor(
             api_key=api_key,
             api_base=ai_config.get('ai_api_base', ''),
-            model=ai_config.get('ai_model', 'gpt-3.5-turbo')
+            model=ai_config.get('ai_model', 'gpt-3.5-turbo'),
+            use_cache=use_cache
         )
     except Exception as e:
         print(f"创建AI提取器失败: {e}")
         return None
 
 
-# ============================================================================
-# 智能PDF解析功能
-# ============================================================================
-
-def extract_with_pymupdf(file_path):
-    """使用PyMuPDF提取PDF文本"""
-    try:
-        from utils.file_parser import FITZ_AVAILABLE
-        if not FITZ_AVAILABLE:
-            return ""
-        
-        import fitz
-        pdf_doc = fitz.open(file_path)
-        page_texts = []
-        
-        for page_num in range(len(pdf_doc)):
-            page = pdf_doc[page_num]
-            page_text = page.get_text()
-            if page_text:
-                page_texts.append(page_text.strip())
-        
-        pdf_doc.close()
-        return "\n\n".join(page_texts)
-    except Exception as e:
-        print(f"PyMuPDF提取失败: {e}")
-        return ""
-
-def extract_with_pdfplumber(file_path):
-    """使用pdfplumber提取PDF文本（保持布局）"""
-    try:
-        from utils.file_parser import PDFPLUMBER_AVAILABLE
-        if not PDFPLUMBER_AVAILABLE:
-            return ""
-        
-        import pdfplumber
-        page_texts = []
-        
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    page_texts.append(page_text.strip())
-        
-        return "\n\n".join(page_texts)
-    except Exception as e:
-        print(f"pdfplumber提取失败: {e}")
-        return ""
-
-def extract_with_pdfminer(file_path):
-    """使用pdfminer提取PDF文本（中文优化）"""
-    try:
-        from pdfminer.high_level import extract_text as pdfminer_extract
-        text = pdfminer_extract(file_path)
-        return text.strip() if text else ""
-    except ImportError:
-        print("pdfminer.six 未安装，跳过pdfminer提取")
-        return ""
-    except Exception as e:
-        print(f"pdfminer提取失败: {e}")
-        return ""
-
-def select_best_result(results):
-    """
-    从多个提取结果中选择最佳结果
-    
-    Args:
-        results: [(method_name, text), ...] 格式的列表
-    
-    Returns:
-        最佳文本内容
-    """
-    if not results:
-        return ""
-    
-    best_text = ""
-    best_score = 0
-    
-    for method_name, text in results:
-        if not text or not text.strip():
-            continue
-        
-        # 计算评分：文本长度 + 中文字符数 * 2
-        text_length = len(text)
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fa5]', text))
-        unique_chars = len(set(text))
-        
-        # 判断是否为有效文本
-        if text_length < 50:
-            continue
-        
-        chinese_ratio = chinese_chars / text_length if text_length > 0 else 0
-        
-        # 评分标准：中文字符数、文本长度、唯一字符数
-        score = text_length + chinese_chars * 2 + unique_chars
-        
-        # 如果中文字符占比太低，降低评分
-        if chinese_ratio < 0.05:
-            score *= 0.5
-        
-        if score > best_score:
-            best_score = score
-            best_text = text
-    
-    return best_text if best_text else (results[0][1] if results else "")
-
-def should_merge(prev_line, current_line):
-    """
-    判断两行是否应该合并
-    
-    Args:
-        prev_line: 前一行文本
-        current_line: 当前行文本
-    
-    Returns:
-        bool: 是否应该合并
-    """
-    if not prev_line or not current_line:
-        return False
-    
-    # 如果前一行以中文标点结束，不合并
-    if re.search(r'[。！？；：，、]$', prev_line):
-        return False
-    
-    # 如果前一行以英文标点结束，不合并
-    if re.search(r'[.!?;:,\-]$', prev_line):
-        return False
-    
-    # 如果当前行以标点符号开头，不合并
-    if re.match(r'^[。！？；：，、.!?;:]', current_line):
-        return False
-    
-    # 如果前一行以数字或字母结尾，当前行以数字或字母开头，可能需要合并
-    if re.search(r'[0-9a-zA-Z]$', prev_line) and re.match(r'^[0-9a-zA-Z]', current_line):
-        return True
-    
-    # 如果前一行以中文字符结尾，当前行以中文字符开头，可能需要合并
-    if re.search(r'[\u4e00-\u9fa5]$', prev_line) and re.match(r'^[\u4e00-\u9fa5]', current_line):
-        # 检查前一行长度，如果太短可能是被错误分割的
-        if len(prev_line) < 20:
-            return True
-    
-    # 如果前一行以空格或短横线结尾，可能是被错误分割的
-    if prev_line.endswith(' ') or prev_line.endswith('-'):
-        return True
-    
-    return False
-
-def is_complete_sentence(text):
-    """
-    判断文本是否是完整的句子
-    
-    Args:
-        text: 文本内容
-    
-    Returns:
-        bool: 是否是完整句子
-    """
-    if not text:
-        return False
-    
-    # 以中文标点结束
-    if re.search(r'[。！？；]$', text):
-        return True
-    
-    # 以英文标点结束
-    if re.search(r'[.!?;]$', text):
-        return True
-    
-    # 如果文本长度超过50且包含多个中文字符，可能是完整段落
-    if len(text) > 50 and len(re.findall(r'[\u4e00-\u9fa5]', text)) > 10:
-        return True
-    
-    return False
-
-def repair_line_breaks(text):
-    """
-    修复PDF提取的行混乱问题
-    合并被错误分割的中文行
-    
-    Args:
-        text: 原始文本
-    
-    Returns:
-        修复后的文本
-    """
-    if not text:
-        return text
-    
-    lines = text.split('\n')
-    repaired = []
-    buffer = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            # 空行：如果buffer有内容，先保存buffer
-            if buffer:
-                repaired.append(buffer)
-                buffer = ""
-            continue
-        
-        if buffer:
-            # 判断是否需要合并
-            if should_merge(buffer, line):
-                buffer += line
-            else:
-                # 不合并，保存buffer，开始新行
-                repaired.append(buffer)
-                buffer = line
-        else:
-            buffer = line
-        
-        # 检查buffer是否完整（以标点结束）
-        if is_complete_sentence(buffer):
-            repaired.append(buffer)
-            buffer = ""
-    
-    # 处理剩余的buffer
-    if buffer:
-        repaired.append(buffer)
-    
-    return '\n'.join(repaired)
-
-def extract_pdf_intelligent(file_path):
-    """
-    智能PDF提取：尝试多种方法，选择最佳结果，并修复行混乱问题
-    
-    Args:
-        file_path: PDF文件路径
-    
-    Returns:
-        提取并修复后的文本
-    """
-    results = []
-    
-    # 方法1：PyMuPDF（快速）
-    text1 = extract_with_pymupdf(file_path)
-    if text1:
-        results.append(("pymupdf", text1))
-    
-    # 方法2：pdfplumber（布局保持）
-    text2 = extract_with_pdfplumber(file_path)
-    if text2:
-        results.append(("pdfplumber", text2))
-    
-    # 方法3：pdfminer（中文优化）
-    text3 = extract_with_pdfminer(file_path)
-    if text3:
-        results.append(("pdfminer", text3))
-    
-    # 选择字符最多且中文比例合理的结果
-    best_text = select_best_result(results)
-    
-    if not best_text:
-        return ""
-    
-    # 修复行混乱问题
-    repaired_text = repair_line_breaks(best_text)
-    
-    return repaired_text
-
-
 @app.route('/')
 def index():
     """
@@ -730,6 +487,7 @@ def get_global_ai_config():
                         'ai_api_key_set': False,
                         'ai_api_base': Config.AI_API_BASE,
                         'ai_model': Config.AI_MODEL,
+                        'ai_pipeline': Config.AI_PIPELINE,
                         'created_by': None,
                         'updated_by': None,
                         'created_at': None,
@@ -754,6 +512,12 @@ def set_global_ai_config():
         # 验证必填字段
         ai_enabled = data.get('ai_enabled', True)
         ai_model = data.get('ai_model', 'gpt-3.5-turbo')
+        ai_pipeline = data.get('ai_pipeline')
+        if ai_pipeline is not None and ai_pipeline not in Config.AI_PIPELINES:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的解析流程: {ai_pipeline}（可选: {", ".join(Config.AI_PIPELINES)}）'
+            }), 400
         
         # 获取当前用户
         current_user = get_current_user()
@@ -773,6 +537,8 @@ def set_global_ai_config():
             global_config.ai_enabled = 1 if ai_enabled else 0
             global_config.ai_model = ai_model
             global_config.ai_api_base = data.get('ai_api_base', '')
+            if ai_pipeline is not None:
+                global_config.ai_pipeline = ai_pipeline
             global_config.updated_by = username
             
             # 处理API密钥（加密存储）
@@ -1314,54 +1080,84 @@ def get_education_levels():
         'data': Config.EDUCATION_LEVELS
     })
 
-def process_resume_async(resume_id, file_path):
-    """异步处理简历解析"""
+def process_resume_async(resume_id, file_path, use_ai_cache=True):
+    """
+    解析简历（解析任务队列的处理函数，各阶段耗时记录到 parse_metrics 和 resume.stage_timings）
+
+    工作线程只负责文本提取；启用AI时把AI阶段作为协程提交到常驻事件循环后立即返回，
+    工作线程随即去领取其他任务。AI阶段完成后，由队列的工作线程继续执行规则提取、查重和写库
+    （_finish_resume_parse）。因此同时处于AI阶段的简历数只受 Config.PARSE_MAX_IN_FLIGHT
+    和按服务商的AI限流约束，与工作线程数无关
+
+    Args:
+        use_ai_cache: 是否读取AI响应缓存；重新解析时传False，忽略此前缓存的回复重新请求AI
+
+    Returns:
+        None（已处理完），或 concurrent.futures.Future，结果为交给工作线程继续执行的函数
+    """
     db = get_db_session()
+    resume = None
+    created_by = None
+    # 每个阶段开始时推送解析进度
+    timer = StageTimer(parse_metrics, on_stage=lambda stage: parse_events.publish(
+        resume_id, 'stage', created_by=created_by, stage=stage))
     try:
         resume = db.query(Resume).filter_by(id=resume_id).first()
         if not resume:
-            return
+            return None
+        created_by = resume.created_by
         
         resume.parse_status = 'processing'
-        db.commit()
+        commit_serialized(db)
+        parse_events.publish(resume_id, 'processing', created_by=created_by)
         
         # 检测文件类型
         file_ext = os.path.splitext(file_path)[1].lower()
         is_word_file = file_ext in ['.doc', '.docx']
         
-        # 提取文本（PDF使用智能提取，Word使用原有方法）
-        if file_ext == '.pdf':
-            # PDF文件使用智能提取（多方法融合+行修复）
-            raw_text = extract_pdf_intelligent(file_path)
-        else:
-            # Word文件使用原有方法
-            raw_text = extract_text(file_path)
+        with timer.stage('extract_text'):
+            # 内容寻址缓存：同一文件（SHA-256相同）直接复用上次提取的文本和规则提取结果
+            extraction_cache = get_extraction_cache()
+            cache_entry = None
+            cache_key_value = None
+            if extraction_cache:
+                try:
+                    cache_key_value = cache_key(file_sha256(file_path))
+                    cache_entry = extraction_cache.get(cache_key_value)
+                except OSError as e:
+                    print(f"读取提取缓存失败: {e}")
+                    extraction_cache = None
+            
+            # 提取文本（PDF使用智能提取，Word使用原有方法；启用进程池时在子进程中执行）
+            if cache_entry:
+                raw_text = cache_entry['text']
+            else:
+                raw_text = parse_pool.extract_resume_text(file_path)
+                if raw_text and extraction_cache:
+                    extraction_cache.put(cache_key_value, raw_text)
         
         if not raw_text:
             raise Exception("无法从文件中提取文本，文件可能已损坏或格式不支持")
         
         # 异步任务使用全局配置（不依赖session）
-        # 优先级：全局配置 > 环境变量
-        db_config = get_db_session()
-        try:
-            global_config = db_config.query(GlobalAIConfig).first()
+        # 优先级：全局配置 > 环境变量（复用本任务的会话读取）
+        with db.no_autoflush:
+            global_config = db.query(GlobalAIConfig).first()
             if global_config:
                 from utils.encryption import decrypt_value
                 ai_enabled = bool(global_config.ai_enabled)
                 ai_api_key = decrypt_value(global_config.ai_api_key) if global_config.ai_api_key else ''
                 ai_api_base = global_config.ai_api_base or ''
                 ai_model = global_config.ai_model or 'gpt-3.5-turbo'
+                ai_pipeline = global_config.ai_pipeline or Config.AI_PIPELINE
             else:
                 # 使用环境变量
                 ai_enabled = Config.AI_ENABLED
                 ai_api_key = Config.AI_API_KEY
                 ai_api_base = Config.AI_API_BASE
                 ai_model = Config.AI_MODEL
-        finally:
-            db_config.close()
+                ai_pipeline = Config.AI_PIPELINE
         
-        # 如果链接了AI API，优先使用AI优化文本提取
-        text = raw_text
         ai_extractor = None
         if ai_enabled and ai_api_key:
             try:
@@ -1370,40 +1166,108 @@ def process_resume_async(resume_id, file_path):
                     'ai_api_key': ai_api_key,
                     'ai_api_base': ai_api_base,
                     'ai_model': ai_model
-                })
-                # 使用AI优化文本提取
-                optimized_text = ai_extractor.optimize_text_extraction(raw_text)
-                if optimized_text:
-                    text = optimized_text
-                    print(f"AI文本优化成功（模型: {ai_model}），文本长度: {len(text)} 字符")
-                else:
-                    print(f"AI文本优化失败（模型: {ai_model}），使用原始文本")
+                }, use_cache=use_ai_cache)
             except Exception as e:
-                print(f"AI文本优化失败（模型: {ai_model}），使用原始文本: {e}")
+                print(f"创建AI提取器失败（模型: {ai_model}），使用规则提取: {e}")
+    except Exception as e:
+        if resume is None:
+            raise
+        _record_parse_failure(db, resume, timer, e)
+        return None
+    finally:
+        # AI阶段可能持续较长时间，不占用数据库连接；后半段重新打开会话
+        db.close()
+    
+    extraction = (extraction_cache, cache_key_value, cache_entry)
+    if not ai_extractor:
+        _finish_resume_parse(resume_id, timer, raw_text, raw_text, None, extraction)
+        return None
+    
+    async def ai_stage():
+        text, ai_result = await _run_ai_stage(ai_extractor, ai_model, ai_pipeline, raw_text, is_word_file, timer)
+        return functools.partial(_finish_resume_parse, resume_id, timer, raw_text, text, ai_result, extraction)
+    
+    # AI阶段在常驻事件循环中执行，所有解析任务共用按服务商的并发/速率限制
+    return ai_loop.submit(ai_stage())
+
+async def _run_ai_stage(ai_extractor, ai_model, ai_pipeline, raw_text, is_word_file, timer):
+    """
+    简历解析的AI阶段（在AI事件循环中执行），返回 (用于信息提取的文本, AI提取结果)；
+    AI调用失败时退回原始文本和规则提取，不抛出异常
+    """
+    text = raw_text
+    ai_result = None
+    fused = False
+    # 如果链接了AI API，优先使用AI优化文本提取
+    try:
+        if ai_pipeline == 'fused':
+            # 单次调用：同时完成文本修正和信息提取；失败（或文本过长）时退回下面的两次调用
+            with timer.stage('ai_fused'):
+                fused_result = await ai_extractor.optimize_and_extract_async(raw_text, is_word_file=is_word_file)
+            if fused_result:
+                text, ai_result = fused_result
+                fused = True
+                print(f"AI单次解析成功（模型: {ai_model}），提取到 {len([k for k, v in ai_result.items() if v])} 个字段")
+            else:
+                print(f"AI单次解析未完成（模型: {ai_model}），改用文本优化+信息提取")
+        if not fused:
+            # 使用AI优化文本提取
+            with timer.stage('ai_optimize'):
+                optimized_text = await ai_extractor.optimize_text_extraction_async(raw_text)
+            if optimized_text:
+                text = optimized_text
+                print(f"AI文本优化成功（模型: {ai_model}），文本长度: {len(text)} 字符")
+            else:
+                print(f"AI文本优化失败（模型: {ai_model}），使用原始文本")
+    except Exception as e:
+        print(f"AI文本优化失败（模型: {ai_model}），使用原始文本: {e}")
+    
+    # AI辅助信息提取（单次调用模式已完成提取时跳过）
+    # 为了信息提取准确性，使用优化后的文本进行提取
+    if not fused:
+        try:
+            with timer.stage('ai_extract'):
+                ai_result = await ai_extractor.extract_with_ai_async(text, is_word_file=is_word_file)
+            if ai_result:
+                print(f"AI辅助信息提取成功（模型: {ai_model}，Word格式: {is_word_file}），提取到 {len([k for k, v in ai_result.items() if v])} 个字段")
+        except Exception as e:
+            print(f"AI辅助信息提取失败（模型: {ai_model}），继续使用规则提取: {e}")
+    
+    return text, ai_result
+
+def _finish_resume_parse(resume_id, timer, raw_text, text, ai_result, extraction):
+    """
+    简历解析的后半段（在解析队列的工作线程中执行）：规则提取并融合AI结果、查重，
+    解析结果与耗时记录一次提交
+
+    Args:
+        raw_text: 从文件提取的原始文本
+        text: 用于信息提取的文本（AI优化后的文本，未经优化时与 raw_text 相同）
+        ai_result: AI提取结果（可为None）
+        extraction: (提取缓存, 缓存键, 缓存条目)，见 process_resume_async
+    """
+    extraction_cache, cache_key_value, cache_entry = extraction
+    db = get_db_session()
+    resume = None
+    try:
+        resume = db.query(Resume).filter_by(id=resume_id).first()
+        if not resume:
+            return
+        created_by = resume.created_by
         
-        # 保存原始文本（优先保存优化后的文本，如果没有优化则保存原始文本）
-        # 注意：raw_text字段存储的是用于信息提取的文本（可能是优化后的）
-        # 如果需要保存真正的原始文本，可以添加新字段
+        # 保存用于信息提取的文本（可能是AI优化后的）
         resume.raw_text = text
         
-        # 如果使用了AI优化，原始文本和优化后的文本都保存
-        # 但为了信息提取准确性，使用优化后的文本进行提取
-        
-        # 规则提取
-        extractor = InfoExtractor()
-        
-        # AI辅助信息提取（如果启用）
-        ai_result = None
-        if ai_enabled and ai_api_key and ai_extractor:
-            try:
-                ai_result = ai_extractor.extract_with_ai(text, is_word_file=is_word_file)
-                if ai_result:
-                    print(f"AI辅助信息提取成功（模型: {ai_model}，Word格式: {is_word_file}），提取到 {len([k for k, v in ai_result.items() if v])} 个字段")
-            except Exception as e:
-                print(f"AI辅助信息提取失败（模型: {ai_model}），继续使用规则提取: {e}")
-        
-        # 融合规则提取和AI提取的结果
-        info = extractor.extract_all(text, ai_result=ai_result)
+        # 规则提取（启用进程池时在子进程中执行），并融合AI提取的结果
+        # 文本未经AI改写时，规则提取结果只取决于文件内容，可直接使用缓存
+        with timer.stage('rule_extract'):
+            if cache_entry and cache_entry.get('info') is not None and text == raw_text:
+                rule_info = cache_entry['info']
+            else:
+                rule_info = parse_pool.extract_resume_info(text)
+                if extraction_cache and text == raw_text:
+                    extraction_cache.put(cache_key_value, raw_text, rule_info)
+            info = merge_extraction_results(rule_info, ai_result)
         
         # 更新基本信息
         resume.name = info.get('name')
@@ -1421,7 +1285,6 @@ def process_resume_async(resume_id, file_path):
         resume.phone = info.get('phone')
         resume.email = info.get('email')
         resume.highest_education = info.get('highest_education')
-        resume.raw_text = text
         resume.error_message = None
         
         # 处理工作经历（统一使用AI API智能识别，无需外部验证）
@@ -1446,12 +1309,12 @@ def process_resume_async(resume_id, file_path):
             if work_years:
                 resume.earliest_work_year = min(work_years)
         
-        # 查重检测
-        existing_resumes = db.query(Resume).filter(
-            Resume.parse_status == 'success',
-            Resume.id != resume.id
-        ).all()
-        duplicate_id, similarity = check_duplicate(resume, existing_resumes)
+        # 查重检测（按身份键索引查找候选简历，只对候选计算相似度）
+        with timer.stage('duplicate_check'):
+            # 不触发autoflush：写入只在串行化提交时发生，避免查询时提前占用数据库写锁
+            with db.no_autoflush:
+                existing_resumes = load_duplicate_candidates(db, resume)
+            duplicate_id, similarity = check_duplicate(resume, existing_resumes)
         
         if similarity >= 80.0:
             resume.duplicate_status = '重复简历'
@@ -1464,16 +1327,53 @@ def process_resume_async(resume_id, file_path):
         
         resume.parse_status = 'success'
         resume.parse_time = datetime.now()
-        db.commit()
+        # 耗时记录与解析结果一次提交（每次提交都要占用写锁）：
+        # 本条记录的总耗时截至提交前；提交成功后才把总耗时计入全局直方图（提交失败时计为失败）
+        resume.stage_timings = dict(timer.finish(observe=False))
+        with timer.stage('commit'):
+            commit_serialized(db)
+        timer.finish()
+        parse_events.publish(resume_id, 'success', created_by=created_by)
         
     except Exception as e:
-        resume.parse_status = 'failed'
-        resume.error_message = str(e)
-        db.commit()
-        print(f"处理简历失败: {e}")
+        if resume is None:
+            raise
+        _record_parse_failure(db, resume, timer, e)
     finally:
         db.close()
 
+def _record_parse_failure(db, resume, timer, error):
+    """记录简历解析失败（先丢弃未提交或提交失败的修改，再单独提交失败状态）"""
+    db.rollback()
+    resume.parse_status = 'failed'
+    resume.error_message = str(error)
+    resume.stage_timings = dict(timer.finish(failed=True))
+    commit_serialized(db)
+    parse_events.publish(resume.id, 'failed', created_by=resume.created_by, message=str(error))
+    print(f"处理简历失败: {error}")
+
+# 简历解析任务队列（固定数量工作线程，任务持久化到 parse_jobs 表）
+parse_queue = ParseJobQueue(
+    process_resume_async,
+    max_workers=Config.PARSE_WORKERS,
+    max_pending=Config.PARSE_QUEUE_MAX,
+    max_in_flight=Config.PARSE_MAX_IN_FLIGHT
+)
+
+
+def start_parse_workers():
+    """
+    启动简历解析的后台工作（由服务器入口在 app.run 之前调用，导入 app 模块时不启动）：
+    恢复上次中断的任务并开始处理队列。测试和辅助脚本只导入 app 时不会创建子进程，
+    也不会把正在运行的服务器处理中的任务重置为排队状态
+    """
+    try:
+        # 先创建解析子进程，再启动工作线程（避免在多线程状态下fork）
+        parse_pool.warm_up()
+        parse_queue.start()
+    except Exception as e:
+        print(f"⚠️  简历解析队列启动失败: {e}")
+
 def get_current_user():
     """获取当前登录用户"""
     if 'user_id' not in session:
@@ -1624,72 +1524,13 @@ def get_statistics():
             except ValueError:
                 return jsonify({'success': False, 'message': '结束日期格式错误，应为YYYY-MM-DD'}), 400
 
-        # 1) 简历数（按上传时间）
-        resume_query = db_session.query(Resume)
-        if start_dt is not None:
-            resume_query = resume_query.filter(Resume.upload_time >= start_dt)
-        if end_dt is not None:
-            resume_query = resume_query.filter(Resume.upload_time <= end_dt)
-        if position:
-            resume_query = resume_query.filter(Resume.applied_position == position)
-        resume_count = resume_query.count()
-
-        # 2) 到面数（有一面时间视为到面，round1_time 非空）
-        interview_query = db_session.query(Interview)
-        if position:
-            interview_query = interview_query.filter(Interview.applied_position == position)
-
-        # 一面时间是字符串 YYYY-MM-DD，所以用字符串范围过滤
-        if start_date_str:
-            interview_query = interview_query.filter(
-                Interview.round1_time.isnot(None),
-                Interview.round1_time >= start_date_str
-            )
-        if end_date_str:
-            interview_query = interview_query.filter(
-                Interview.round1_time <= end_date_str
-            )
-        interview_count = interview_query.count()
-
-        # 3) 通过数（状态为"面试通过/已发offer/已入职"）
-        pass_statuses = ['面试通过', '已发offer', '已入职']
-        pass_query = db_session.query(Interview).filter(Interview.status.in_(pass_statuses))
-        if position:
-            pass_query = pass_query.filter(Interview.applied_position == position)
-        # 通过数暂不按时间字段细分，统一按 create_time 范围过滤
-        if start_dt is not None:
-            pass_query = pass_query.filter(Interview.create_time >= start_dt)
-        if end_dt is not None:
-            pass_query = pass_query.filter(Interview.create_time <= end_dt)
-        pass_count = pass_query.count()
-
-        # 4) Offer 数（按 offer_date 字符串日期）
-        offer_query = db_session.query(Interview).filter(
-            Interview.offer_issued == 1,
-            Interview.offer_date.isnot(None),
-            Interview.offer_date != ''
-        )
-        if position:
-            offer_query = offer_query.filter(Interview.applied_position == position)
-        if start_date_str:
-            offer_query = offer_query.filter(Interview.offer_date >= start_date_str)
-        if end_date_str:
-            offer_query = offer_query.filter(Interview.offer_date <= end_date_str)
-        offer_count = offer_query.count()
-
-        # 5) 入职数（按 onboard_date 字符串日期）
-        onboard_query = db_session.query(Interview).filter(
-            Interview.onboard == 1,
-            Interview.onboard_date.isnot(None),
-            Interview.onboard_date != ''
-        )
-        if position:
-            onboard_query = onboard_query.filter(Interview.applied_position == position)
-        if start_date_str:
-            onboard_query = onboard_query.filter(Interview.onboard_date >= start_date_str)
-        if end_date_str:
-            onboard_query = onboard_query.filter(Interview.onboard_date <= end_date_str)
-        onboard_count = onboard_query.count()
+        # 各指标按岗位汇总：默认对按日汇总表求和，否则直接分组聚合简历表和面试表（口径见 utils.funnel_stats）
+        if Config.STATS_USE_ROLLUP:
+            counts = funnel_counts_from_rollup(db_session, start_date_str, end_date_str, position=position or None)
+        else:
+            counts = funnel_counts_by_position(db_session, start_dt, end_dt, start_date_str, end_date_str,
+                                               position=position or None)
+        totals = funnel_totals(counts)
 
         # 如果指定了岗位，返回单个岗位的数据
         if position:
@@ -1697,152 +1538,17 @@ def get_statistics():
                 'success': True,
                 'data': {
                     'position': position,
-                    'resume_count': resume_count,
-                    'interview_count': interview_count,
-                    'pass_count': pass_count,
-                    'offer_count': offer_count,
-                    'onboard_count': onboard_count,
+                    **totals,
                 }
             })
         
-        # 返回统计范围信息
-        result_data = {
-            'scope': scope,
-            'available_scopes': available_scopes,
-            'user_role': current_user.role
-        }
-        
-        # 如果指定了岗位，返回单个岗位的数据
-        if position:
-            result_data.update({
-                'position': position,
-                'resume_count': resume_count,
-                'interview_count': interview_count,
-                'pass_count': pass_count,
-                'offer_count': offer_count,
-                'onboard_count': onboard_count,
-            })
-            return jsonify({
-                'success': True,
-                'data': result_data
-            })
-        
-        # 如果没有指定岗位，按岗位分组返回数据
-        from sqlalchemy import func
-        stats_by_position = []
-        
-        # 获取所有有数据的岗位（从简历和面试记录中）
-        all_positions = set()
-        # 从简历中获取岗位
-        resume_positions = db_session.query(Resume.applied_position).filter(
-            Resume.applied_position.isnot(None),
-            Resume.applied_position != ''
-        )
-        if start_dt is not None:
-            resume_positions = resume_positions.filter(Resume.upload_time >= start_dt)
-        if end_dt is not None:
-            resume_positions = resume_positions.filter(Resume.upload_time <= end_dt)
-        for pos in resume_positions.distinct():
-            if pos[0]:
-                all_positions.add(pos[0])
-        
-        # 从面试记录中获取岗位
-        interview_positions = db_session.query(Interview.applied_position).filter(
-            Interview.applied_position.isnot(None),
-            Interview.applied_position != ''
-        )
-        if start_date_str:
-            interview_positions = interview_positions.filter(
-                Interview.round1_time.isnot(None),
-                Interview.round1_time >= start_date_str
-            )
-        if end_date_str:
-            interview_positions = interview_positions.filter(
-                Interview.round1_time <= end_date_str
-            )
-        for pos in interview_positions.distinct():
-            if pos[0]:
-                all_positions.add(pos[0])
-        
-        # 为每个岗位计算统计数据
-        for pos_name in sorted(all_positions):
-            # 简历数
-            pos_resume_query = db_session.query(Resume).filter(Resume.applied_position == pos_name)
-            if start_dt is not None:
-                pos_resume_query = pos_resume_query.filter(Resume.upload_time >= start_dt)
-            if end_dt is not None:
-                pos_resume_query = pos_resume_query.filter(Resume.upload_time <= end_dt)
-            pos_resume_count = pos_resume_query.count()
-            
-            # 到面数
-            pos_interview_query = db_session.query(Interview).filter(Interview.applied_position == pos_name)
-            if start_date_str:
-                pos_interview_query = pos_interview_query.filter(
-                    Interview.round1_time.isnot(None),
-                    Interview.round1_time >= start_date_str
-                )
-            if end_date_str:
-                pos_interview_query = pos_interview_query.filter(Interview.round1_time <= end_date_str)
-            pos_interview_count = pos_interview_query.count()
-            
-            # 通过数
-            pos_pass_query = db_session.query(Interview).filter(
-                Interview.applied_position == pos_name,
-                Interview.status.in_(pass_statuses)
-            )
-            if start_dt is not None:
-                pos_pass_query = pos_pass_query.filter(Interview.create_time >= start_dt)
-            if end_dt is not None:
-                pos_pass_query = pos_pass_query.filter(Interview.create_time <= end_dt)
-            pos_pass_count = pos_pass_query.count()
-            
-            # Offer数
-            pos_offer_query = db_session.query(Interview).filter(
-                Interview.applied_position == pos_name,
-                Interview.offer_issued == 1,
-                Interview.offer_date.isnot(None),
-                Interview.offer_date != ''
-            )
-            if start_date_str:
-                pos_offer_query = pos_offer_query.filter(Interview.offer_date >= start_date_str)
-            if end_date_str:
-                pos_offer_query = pos_offer_query.filter(Interview.offer_date <= end_date_str)
-            pos_offer_count = pos_offer_query.count()
-            
-            # 入职数
-            pos_onboard_query = db_session.query(Interview).filter(
-                Interview.applied_position == pos_name,
-                Interview.onboard == 1,
-                Interview.onboard_date.isnot(None),
-                Interview.onboard_date != ''
-            )
-            if start_date_str:
-                pos_onboard_query = pos_onboard_query.filter(Interview.onboard_date >= start_date_str)
-            if end_date_str:
-                pos_onboard_query = pos_onboard_query.filter(Interview.onboard_date <= end_date_str)
-            pos_onboard_count = pos_onboard_query.count()
-            
-            stats_by_position.append({
-                'position': pos_name,
-                'resume_count': pos_resume_count,
-                'interview_count': pos_interview_count,
-                'pass_count': pos_pass_count,
-                'offer_count': pos_offer_count,
-                'onboard_count': pos_onboard_count,
-            })
-        
+        # 没有指定岗位时按岗位分组返回（时间范围内有简历或到面记录的岗位）
         # 如果没有岗位数据，返回空数组
         return jsonify({
             'success': True,
             'data': {
-                'by_position': stats_by_position,
-                'total': {
-                    'resume_count': resume_count,
-                    'interview_count': interview_count,
-                    'pass_count': pass_count,
-                    'offer_count': offer_count,
-                    'onboard_count': onboard_count,
-                }
+                'by_position': funnel_rows(counts),
+                'total': totals
             }
         })
     finally:
@@ -2069,6 +1775,7 @@ def upload_file():
     
     uploaded_count = 0
     failed_files = []
+    rejected_files = []
     resume_ids = []
     
     # 处理每个文件
@@ -2080,6 +1787,11 @@ def upload_file():
             failed_files.append(file.filename)
             continue
         
+        # 解析队列已满时不再保存文件，提示稍后重试
+        if parse_queue.is_full():
+            rejected_files.append(file.filename)
+            continue
+        
         try:
             original_name = file.filename
             name_part, ext = os.path.splitext(original_name)
@@ -2107,12 +1819,19 @@ def upload_file():
             db.add(resume)
             db.commit()
             resume_id = resume.id
-            db.close()
             
-            # 异步处理
-            thread = threading.Thread(target=process_resume_async, args=(resume_id, file_path))
-            thread.daemon = True
-            thread.start()
+            # 提交到解析队列（由工作线程按顺序处理）
+            try:
+                parse_queue.submit(resume_id, file_path, created_by=username)
+                parse_events.publish(resume_id, 'queued', created_by=username)
+            except QueueFullError:
+                db.delete(resume)
+                db.commit()
+                _remove_file_if_exists(file_path)
+                rejected_files.append(file.filename)
+                continue
+            finally:
+                db.close()
             
             uploaded_count += 1
             resume_ids.append(resume_id)
@@ -2122,38 +1841,177 @@ def upload_file():
     
     # 返回结果
     if uploaded_count > 0:
-        message = f'成功上传 {uploaded_count} 个文件，正在解析...'
+        message = f'成功上传 {uploaded_count} 个文件，已加入解析队列...'
         if failed_files:
             message += f'，{len(failed_files)} 个文件上传失败'
+        if rejected_files:
+            message += f'，{len(rejected_files)} 个文件因解析队列已满未上传，请稍后重试'
         return jsonify({
             'success': True,
             'message': message,
             'uploaded_count': uploaded_count,
-            'failed_count': len(failed_files),
-            'failed_files': failed_files,
+            'failed_count': len(failed_files) + len(rejected_files),
+            'failed_files': failed_files + rejected_files,
+            'rejected_files': rejected_files,
             'resume_ids': resume_ids
         })
+    elif rejected_files:
+        return jsonify({
+            'success': False,
+            'message': '解析队列已满，请稍后再试',
+            'rejected_files': rejected_files
+        }), 429
     else:
         return jsonify({
             'success': False,
             'message': f'所有文件上传失败：{", ".join(failed_files) if failed_files else "不支持的文件格式"}'
         }), 400
 
+@app.route('/api/parse-jobs/stats', methods=['GET'])
+@login_required
+def get_parse_job_stats():
+    """获取简历解析队列状态"""
+    try:
+        stats = parse_queue.get_stats()
+        stats['pdf_tiers'] = get_tier_stats()
+        extraction_cache = get_extraction_cache()
+        stats['extraction_cache'] = extraction_cache.get_stats() if extraction_cache else None
+        ai_cache = get_ai_cache()
+        stats['ai_cache'] = ai_cache.get_stats() if ai_cache else None
+        stats['stages'] = parse_metrics.get_summary()
+        return jsonify({
+            'success': True,
+            'data': stats
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/resumes/events', methods=['GET'])
+@login_required
+def resume_events():
+    """
+    简历解析进度事件流（Server-Sent Events）
+    推送当前用户上传的简历的状态变化：queued/processing/stage/success/failed
+    """
+    current_user = get_current_user()
+    username = current_user.username if current_user else None
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    subscription = parse_events.subscribe(username, last_event_id)
+
+    def generate():
+        try:
+            # 断线后浏览器3秒重连
+            yield 'retry: 3000\n\n'
+            while True:
+                event = subscription.get(timeout=Config.SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    # 心跳，防止代理断开空闲连接
+                    yield ': keep-alive\n\n'
+                    continue
+                data = json.dumps({k: v for k, v in event.items() if k != 'created_by'}, ensure_ascii=False)
+                yield f"id: {event['id']}\nevent: {event['status']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus指标端点（简历解析各阶段耗时、解析队列状态、数据库连接池），与 /health 一样无需登录"""
+    lines = parse_metrics.render_prometheus() + db_pool_metrics.render_prometheus()
+    try:
+        queue_stats = parse_queue.get_stats()
+        lines += ["# HELP resume_parse_jobs 解析任务数（按状态）",
+                  "# TYPE resume_parse_jobs gauge"]
+        for status, count in queue_stats['jobs'].items():
+            lines.append(f'resume_parse_jobs{{status="{status}"}} {count}')
+    except Exception as e:
+        print(f"读取解析队列状态失败: {e}")
+    provider_stats = limiter_stats()
+    lines += ["# HELP ai_provider_requests AI请求数（in_flight: 进行中，waiting: 等待限流名额）",
+              "# TYPE ai_provider_requests gauge"]
+    for stats in provider_stats:
+        for state in ('in_flight', 'waiting'):
+            lines.append(f'ai_provider_requests{{provider="{stats["provider"]}",state="{state}"}} {stats[state]}')
+    lines += ["# HELP ai_provider_requests_total 累计放行的AI请求数",
+              "# TYPE ai_provider_requests_total counter"]
+    lines += [f'ai_provider_requests_total{{provider="{stats["provider"]}"}} {stats["total"]}' for stats in provider_stats]
+    ai_cache = get_ai_cache()
+    if ai_cache:
+        cache_stats = ai_cache.get_stats()
+        lines += ["# HELP ai_cache_lookups_total AI响应缓存查询次数（按结果）",
+                  "# TYPE ai_cache_lookups_total counter",
+                  f'ai_cache_lookups_total{{result="hit"}} {cache_stats["hits"]}',
+                  f'ai_cache_lookups_total{{result="miss"}} {cache_stats["misses"]}',
+                  "# HELP ai_cache_bytes AI响应缓存占用的字节数",
+                  "# TYPE ai_cache_bytes gauge",
+                  f"ai_cache_bytes {cache_stats['total_bytes']}"]
+    lines += ["# HELP sync_event_subscribers 实时同步推送连接数",
+              "# TYPE sync_event_subscribers gauge",
+              f"sync_event_subscribers {change_feed.subscriber_count}"]
+    return Response('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# 列表总数缓存：翻页时不必每页重新 count()，简历或面试记录变化时清空
+resume_count_cache = CountCache(Config.LIST_COUNT_CACHE_SECONDS)
+resume_count_cache.invalidate_on_flush(Resume)
+interview_count_cache = CountCache(Config.LIST_COUNT_CACHE_SECONDS)
+interview_count_cache.invalidate_on_flush(Interview)
+
 @app.route('/api/resumes', methods=['GET'])
 def get_resumes():
-    """获取简历列表"""
+    """
+    获取简历列表
+
+    分页：优先使用游标（cursor，取上一页返回的 next_cursor），按 (排序列, id) 从上一页末尾继续读取；
+    没有游标时按 page 跳页（首页之外需要跳过前面的行）。
+    字段：默认只返回列表展示用的字段（models.RESUME_LIST_FIELDS），可用 fields=name,phone,... 指定；
+    简历正文不在列表中返回，通过 /api/resumes/<id> 获取。
+    """
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in RESUME_SELECTABLE_FIELDS]
+        if unknown:
+            return jsonify({'success': False, 'message': f'不支持的字段: {", ".join(unknown)}'}), 400
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+    
     db = get_db_session()
     
     # 分页
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = clamp_page_size(request.args.get('per_page', type=int),
+                               Config.RESUME_PAGE_SIZE, Config.LIST_MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor') or None
+    offset = 0 if cursor else (page - 1) * per_page
     
     # 筛选
     query = db.query(Resume)
     
-    # 搜索
-    search = request.args.get('search', '')
-    if search:
+    # 搜索（全文索引覆盖姓名、学校、专业、工作经历中的公司和职位以及简历正文，默认按相关度排序）
+    search = request.args.get('search', '').strip()
+    match_query = build_match_query(search) if search else None
+    sort_by = request.args.get('sort_by') or ('relevance' if match_query else 'upload_time')
+    if sort_by != 'relevance' and sort_by not in RESUME_SORT_FIELDS:
+        sort_by = 'upload_time'
+    if sort_by == 'relevance' and not match_query:
+        sort_by = 'upload_time'
+    sort_order = request.args.get('sort_order', 'desc')
+    # 只读取需要返回的列（以及排序列），简历正文等大字段不加载
+    load_columns = resume_list_columns(fields)
+    if sort_by != 'relevance':
+        load_columns.append(getattr(Resume, sort_by))
+    query = query.options(load_only(*load_columns))
+    if match_query and sort_by != 'relevance':
+        query, _ = apply_fulltext_search(query, match_query)
+    elif search and not match_query:
         query = query.filter(
             (Resume.name.like(f'%{search}%')) |
             (Resume.school.like(f'%{search}%')) |
@@ -2169,15 +2027,6 @@ def get_resumes():
     if education:
         query = query.filter(Resume.highest_education == education)
     
-    # 排序
-    sort_by = request.args.get('sort_by', 'upload_time')
-    sort_order = request.args.get('sort_order', 'desc')
-    if hasattr(Resume, sort_by):
-        if sort_order == 'desc':
-            query = query.order_by(getattr(Resume, sort_by).desc())
-        else:
-            query = query.order_by(getattr(Resume, sort_by).asc())
-    
     # 允许显示所有状态的简历（pending/processing/success/failed）
     # 用户可以通过状态筛选来查看特定状态的简历
     status_filter = request.args.get('status', '')
@@ -2185,8 +2034,25 @@ def get_resumes():
         query = query.filter(Resume.parse_status == status_filter)
     # 如果没有指定状态筛选，默认显示所有状态的简历
     
-    total = query.count()
-    resumes = query.offset((page - 1) * per_page).limit(per_page).all()
+    # 总数（同一筛选条件短时间内复用）；只有检索条件时直接从全文索引计数，不回表
+    def count_total():
+        if match_query and not (gender or education or status_filter):
+            return count_matches(db, match_query)
+        if match_query and sort_by == 'relevance':
+            return apply_fulltext_search(query, match_query)[0].count()
+        return query.count()
+    total = resume_count_cache.get_or_count((search, gender, education, status_filter), count_total)
+    
+    # 排序并读取一页
+    try:
+        if sort_by == 'relevance':
+            resumes, next_cursor = relevance_page(db, query, match_query, cursor, per_page, offset=offset)
+        else:
+            resumes, next_cursor = keyset_page(query, getattr(Resume, sort_by), Resume.id, sort_order == 'desc',
+                                               cursor, per_page, f'{sort_by}:{sort_order}', offset=offset)
+    except CursorError as e:
+        db.close()
+        return jsonify({'success': False, 'message': str(e)}), 400
     
     # 注意：查重检测在简历解析时完成，这里不需要重复检测
     # 如果需要对旧简历进行查重，可以单独运行查重脚本
@@ -2195,17 +2061,20 @@ def get_resumes():
     
     return jsonify({
         'success': True,
-        'data': [r.to_dict() for r in resumes],
+        'data': [r.to_summary_dict(fields) for r in resumes],
         'total': total,
         'page': page,
-        'per_page': per_page
+        'per_page': per_page,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
     })
 
 @app.route('/api/resumes/<int:resume_id>', methods=['GET'])
 def get_resume_detail(resume_id):
     """获取简历详情"""
     db = get_db_session()
-    resume = db.query(Resume).filter_by(id=resume_id).first()
+    # 详情包含正文（存放在 resume_texts 表），关闭会话前一并读取
+    resume = db.query(Resume).options(joinedload(Resume.text_record)).filter_by(id=resume_id).first()
     db.close()
     
     if not resume:
@@ -2400,12 +2269,15 @@ def export_single(resume_id):
 
 @app.route('/api/export/batch', methods=['POST'])
 def export_batch():
-    """批量导出"""
-    data = request.json
+    """批量导出，请求体: { "resume_ids": [...] } 或 { "all": true }（导出全部简历）"""
+    data = request.json or {}
     resume_ids = data.get('resume_ids', [])
     
     db = get_db_session()
-    resumes = db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
+    if data.get('all'):
+        resumes = db.query(Resume).order_by(Resume.upload_time.desc(), Resume.id.desc()).all()
+    else:
+        resumes = db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
     db.close()
     
     if not resumes:
@@ -2518,7 +2390,7 @@ def export_resume_analysis_pdf(resume_id):
 
 请只返回JSON格式，不要包含其他文字说明。"""
 
-                        response_text = ai_extractor._call_ai_api(prompt)
+                        response_text = ai_extractor._call_ai_api(prompt, accept=AIExtractor.has_json_object)
 
                         # 解析JSON
                         import re
@@ -2590,10 +2462,17 @@ def export_resume_analysis_pdf(resume_id):
 
 @app.route('/api/interviews', methods=['GET'])
 def list_interviews():
-    """获取面试流程列表，可按姓名/岗位搜索"""
+    """
+    获取面试流程列表，可按姓名/岗位搜索
+
+    按更新时间倒序游标分页：首页不带 cursor，之后传入上一页返回的 next_cursor。
+    """
     session = get_db_session()
     try:
         search = (request.args.get('search') or '').strip()
+        per_page = clamp_page_size(request.args.get('per_page', type=int),
+                                   Config.INTERVIEW_PAGE_SIZE, Config.LIST_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor') or None
         # 关联简历表以便生成身份验证码（使用LEFT JOIN处理简历不存在的情况）
         query = session.query(Interview, Resume).outerjoin(Resume, Interview.resume_id == Resume.id)
         if search:
@@ -2602,8 +2481,14 @@ def list_interviews():
                 (Interview.name.like(like)) |
                 (Interview.applied_position.like(like))
             )
-        rows = query.order_by(Interview.update_time.desc()).all()
+        try:
+            rows, next_cursor = keyset_page(query, Interview.update_time, Interview.id, True, cursor, per_page,
+                                            'update_time:desc', row_key=lambda row: row[0])
+        except CursorError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        total = interview_count_cache.get_or_count(search, lambda: query.count())
         data = []
+        backfill = {}
         for iv, res in rows:
             d = iv.to_dict()
             # 身份验证码：优先使用面试记录中存储的，如果为空则动态生成
@@ -2619,12 +2504,7 @@ def list_interviews():
                         identity_code = res.name
                     # 同时更新候选人姓名为简历中的姓名，确保一致性
                     d['name'] = res.name
-                    # 更新面试记录中的身份验证码（异步更新，不阻塞返回）
-                    try:
-                        iv.identity_code = identity_code
-                        session.commit()
-                    except:
-                        session.rollback()
+                    backfill[iv.id] = identity_code
                 elif iv.name:
                     # 简历不存在，使用面试记录中的冗余姓名（无法获取手机号）
                     identity_code = iv.name
@@ -2634,7 +2514,20 @@ def list_interviews():
                     d['name'] = res.name
             d['identity_code'] = identity_code
             data.append(d)
-        return jsonify({'success': True, 'data': data})
+        # 回写生成的身份验证码：整页一次提交，并保留原更新时间（否则记录会跳到列表最前，打乱翻页顺序）
+        if backfill:
+            try:
+                for interview_id, identity_code in backfill.items():
+                    session.query(Interview).filter(Interview.id == interview_id).update(
+                        {Interview.identity_code: identity_code,
+                         Interview.update_time: Interview.update_time,
+                         Interview.updated_at: Interview.updated_at},
+                        synchronize_session=False)
+                session.commit()
+            except Exception:
+                session.rollback()
+        return jsonify({'success': True, 'data': data, 'total': total, 'per_page': per_page,
+                        'next_cursor': next_cursor, 'has_more': next_cursor is not None})
     except Exception as e:
         return jsonify({'success': False, 'message': f'获取面试列表失败: {str(e)}'}), 500
     finally:
@@ -3341,7 +3234,7 @@ def analyze_interview_doc(interview_id):
 }}"""
 
         try:
-            response_text = ai_extractor._call_ai_api(prompt)
+            response_text = ai_extractor._call_ai_api(prompt, accept=AIExtractor.has_json_object)
 
             # 解析JSON
             import re
@@ -4197,68 +4090,143 @@ def delete_position(position_id):
             'message': f'删除岗位失败: {str(e)}'
         }), 500
 
+# 实时同步的各表版本号缓存：本进程提交修改后立即失效并唤醒推送连接
+change_feed = ChangeFeed(Config.SYNC_VERSION_CACHE_SECONDS, Config.SYNC_MAX_SUBSCRIBERS)
+change_feed.invalidate_on_commit(Resume, Interview, Position)
+
+
+def _parse_sync_versions(values):
+    """从请求参数读取客户端持有的各表版本号（未带的表不参与比较），版本号无效时抛出 ValueError"""
+    since = {}
+    for table in SYNC_TABLES:
+        value = values.get(table)
+        if value is None or value == '':
+            continue
+        try:
+            since[table] = int(value)
+        except ValueError:
+            raise ValueError(f'无效的版本号: {table}={value}')
+    return since
+
+
+def _sync_result(db, since, versions, want_ids):
+    """比较版本号得到各表是否有更新，want_ids 时附带变化的记录ID"""
+    updates = {table: table in since and versions[table] > since[table] for table in SYNC_TABLES}
+    result = {
+        'success': True,
+        'updates': updates,
+        'versions': versions,
+        'current_time': datetime.now().isoformat()
+    }
+    if want_ids:
+        result['changes'] = {table: changes_since(db, table, since[table], Config.SYNC_MAX_CHANGED_IDS)
+                             for table in SYNC_TABLES if updates[table]}
+    return result
+
+
 @app.route('/api/sync/check', methods=['GET'])
 @login_required
 def check_sync():
-    """检查数据更新（用于实时同步）"""
+    """
+    检查数据更新（用于实时同步；浏览器不支持或推送连接已满时的定时检查）
+
+    客户端带上次返回的各表版本号（?resumes=&interviews=&positions=），只比较版本号判断哪些表有变化；
+    带 ids=1 时同时返回变化的记录ID（{'ids', 'deleted', 'truncated'}）。首次检查不带版本号，只返回当前版本号。
+    """
     try:
-        last_sync_time = request.args.get('last_sync', '')
         current_user = get_current_user()
         if not current_user:
             return jsonify({'success': False, 'message': '未登录'}), 401
-        
+
+        try:
+            since = _parse_sync_versions(request.args)
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        want_ids = request.args.get('ids') in ('1', 'true')
+
         db = get_db_session()
         try:
-            updates = {
-                'resumes': False,
-                'interviews': False,
-                'positions': False
-            }
-            
-            if last_sync_time:
-                try:
-                    last_sync = datetime.fromisoformat(last_sync_time.replace('Z', '+00:00'))
-                except:
-                    last_sync = None
-                
-                if last_sync:
-                    # 检查简历更新
-                    resume_count = db.query(Resume).filter(
-                        Resume.updated_at > last_sync
-                    ).count()
-                    if resume_count > 0:
-                        updates['resumes'] = True
-                    
-                    # 检查面试流程更新
-                    interview_count = db.query(Interview).filter(
-                        Interview.updated_at > last_sync
-                    ).count()
-                    if interview_count > 0:
-                        updates['interviews'] = True
-                    
-                    # 检查岗位更新
-                    position_count = db.query(Position).filter(
-                        Position.updated_at > last_sync
-                    ).count()
-                    if position_count > 0:
-                        updates['positions'] = True
-            
-            return jsonify({
-                'success': True,
-                'updates': updates,
-                'current_time': datetime.now().isoformat()
-            })
+            return jsonify(_sync_result(db, since, change_feed.versions(db), want_ids))
         finally:
             db.close()
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+
+@app.route('/api/sync/events', methods=['GET'])
+@login_required
+def sync_events():
+    """
+    数据更新推送（Server-Sent Events），取代定时检查
+
+    连接参数同 /api/sync/check；简历、面试流程或岗位有变化时推送 sync 事件（内容同 /api/sync/check 带 ids=1 的返回），
+    事件ID为各表版本号，断线重连时浏览器带回 Last-Event-ID，从该版本继续。
+    连接数达到上限时返回503，前端退回定时检查；连接保持 SYNC_STREAM_MAX_SECONDS 后由服务端关闭，浏览器自动重连。
+    """
+    try:
+        since = _parse_sync_versions(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    last_event_id = request.headers.get('Last-Event-ID') or ''
+    if last_event_id:
+        try:
+            since = _parse_sync_versions(dict(zip(SYNC_TABLES, last_event_id.split('-'))))
+        except ValueError:
+            pass
+    if not change_feed.subscribe():
+        return jsonify({'success': False, 'message': '实时同步连接数已满'}), 503
+
+    def event_message(result):
+        event_id = '-'.join(str(result['versions'][table]) for table in SYNC_TABLES)
+        return f"id: {event_id}\nevent: sync\ndata: {json.dumps(result, ensure_ascii=False)}\n\n"
+
+    def generate():
+        # 断线后浏览器3秒重连
+        yield 'retry: 3000\n\n'
+        current = since
+        if len(current) < len(SYNC_TABLES):
+            # 首次连接：先推送当前版本号
+            db = get_db_session()
+            try:
+                result = _sync_result(db, current, change_feed.versions(db), want_ids=False)
+            finally:
+                db.close()
+            current = {**result['versions'], **current}
+            yield event_message(result)
+        deadline = time.monotonic() + Config.SYNC_STREAM_MAX_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            versions = change_feed.wait_for_change(
+                current, min(Config.SSE_HEARTBEAT_SECONDS, remaining), get_db_session)
+            if versions is None:
+                # 心跳，防止代理断开空闲连接
+                yield ': keep-alive\n\n'
+                continue
+            db = get_db_session()
+            try:
+                result = _sync_result(db, current, versions, want_ids=True)
+            finally:
+                db.close()
+            current = versions
+            yield event_message(result)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # 连接关闭时释放名额（即使生成器尚未开始执行）
+    response.call_on_close(change_feed.unsubscribe)
+    return response
+
 @app.route('/api/resumes/<int:resume_id>/match-analysis', methods=['POST'])
 def analyze_resume_match(resume_id):
     """分析简历与岗位的匹配度"""
     try:
         data = request.json
         applied_position = data.get('applied_position', '').strip()
+        refresh = bool(data.get('refresh'))  # 为真时不使用AI响应缓存，重新请求分析
         
         if not applied_position:
             return jsonify({
@@ -4374,7 +4342,7 @@ def analyze_resume_match(resume_id):
 请只返回JSON格式，不要包含其他文字说明。"""
         
         try:
-            response_text = ai_extractor._call_ai_api(prompt)
+            response_text = ai_extractor._call_ai_api(prompt, use_cache=not refresh, accept=AIExtractor.has_json_object)
             
             # 尝试解析JSON响应
             try:
@@ -4551,6 +4519,7 @@ if __name__ == '__main__':
     print('=' * 50)
     print()
     
+    start_parse_workers()
     try:
         app.run(debug=debug, host=host, port=port, use_reloader=False)
     except Exception as e:
@@ -6,8 +6,9 @@ import os
 # 基础配置
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
-DATABASE_PATH = os.path.join(BASE_DIR, 'database.db')
+DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(BASE_DIR, 'database.db')
 EXPORT_FOLDER = os.path.join(BASE_DIR, 'exports')
+CACHE_FOLDER = os.path.join(BASE_DIR, 'cache')
 
 # 确保目录存在
 for folder in [UPLOAD_FOLDER, EXPORT_FOLDER]:
@@ -31,7 +32,34 @@ class Config:
     AI_API_KEY = os.environ.get('OPENAI_API_KEY') or os.environ.get('AI_API_KEY') or os.environ.get('DEEPSEEK_API_KEY') or ''
     AI_API_BASE = os.environ.get('OPENAI_API_BASE') or os.environ.get('AI_API_BASE') or ''  # 如果为空，将根据模型自动选择
     AI_MODEL = os.environ.get('AI_MODEL') or 'gpt-3.5-turbo'  # 可选: gpt-3.5-turbo, gpt-4, gpt-4-turbo, deepseek-chat, deepseek-coder, qwen-turbo, qwen-plus等
+    # AI解析流程：two_step 先优化文本再提取信息（两次调用），fused 单次调用同时完成（失败时退回两次调用）；
+    # 管理员在全局AI配置中设置后以全局配置为准
+    AI_PIPELINE = os.environ.get('AI_PIPELINE', 'two_step')
+    AI_PIPELINES = ('two_step', 'fused')
     
+    # AI接口HTTP连接：每个服务商的连接池大小、连接/读取超时（秒），429/5xx/连接失败的重试次数和退避时间（秒）
+    AI_HTTP_POOL_SIZE = int(os.environ.get('AI_HTTP_POOL_SIZE', 8))
+    AI_HTTP_CONNECT_TIMEOUT = float(os.environ.get('AI_HTTP_CONNECT_TIMEOUT', 10))
+    AI_HTTP_READ_TIMEOUT = float(os.environ.get('AI_HTTP_READ_TIMEOUT', 60))
+    AI_HTTP_MAX_RETRIES = int(os.environ.get('AI_HTTP_MAX_RETRIES', 2))
+    AI_HTTP_BACKOFF_SECONDS = float(os.environ.get('AI_HTTP_BACKOFF_SECONDS', 1))
+    AI_HTTP_BACKOFF_MAX_SECONDS = float(os.environ.get('AI_HTTP_BACKOFF_MAX_SECONDS', 20))
+
+    # AI请求限流（按服务商）：并发请求数上限、每秒请求数（0为不限速）和允许的突发请求数；
+    # 解析任务的AI阶段在常驻事件循环中执行，发送请求使用固定数量的I/O线程
+    AI_PROVIDER_MAX_CONCURRENCY = int(os.environ.get('AI_PROVIDER_MAX_CONCURRENCY', 4))
+    AI_PROVIDER_RATE = float(os.environ.get('AI_PROVIDER_RATE', 5))
+    AI_PROVIDER_BURST = int(os.environ.get('AI_PROVIDER_BURST', 5))
+    AI_IO_THREADS = int(os.environ.get('AI_IO_THREADS', 8))
+    # 长文本AI优化：单份文本同时优化的段数
+    AI_OPTIMIZE_PARALLEL_CHUNKS = int(os.environ.get('AI_OPTIMIZE_PARALLEL_CHUNKS', 4))
+
+    # AI响应缓存（按服务商+模型+temperature+消息内容的SHA-256复用模型返回的文本）
+    AI_CACHE_ENABLED = os.environ.get('AI_CACHE_ENABLED', 'true').lower() == 'true'
+    AI_CACHE_PATH = os.environ.get('AI_CACHE_PATH') or os.path.join(CACHE_FOLDER, 'ai_responses.db')
+    AI_CACHE_TTL_SECONDS = int(os.environ.get('AI_CACHE_TTL_SECONDS', 7 * 24 * 3600))  # 过期时间（秒，0为不过期）
+    AI_CACHE_MAX_MB = int(os.environ.get('AI_CACHE_MAX_MB', 100))  # 缓存总大小上限（MB）
+
     # 支持的AI模型列表（用于前端选择）
     AI_MODELS = [
         {'value': 'gpt-3.5-turbo', 'label': 'GPT-3.5 Turbo (OpenAI)', 'provider': 'OpenAI'},
@@ -43,8 +71,80 @@ class Config:
         {'value': 'qwen-plus', 'label': 'Qwen Plus (阿里云)', 'provider': 'Alibaba'},
     ]
     
-    # OCR功能已移除，所有文档通过AI API处理
-    
+    # 简历解析任务队列配置
+    PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', 2))  # 并发解析的工作线程数
+    PARSE_QUEUE_MAX = int(os.environ.get('PARSE_QUEUE_MAX', 500))  # 排队任务上限，超出后拒绝上传（429）
+    # 同时处理中的任务上限（含等待AI回复的任务）：AI阶段在事件循环中执行、不占用工作线程，
+    # 实际的AI请求并发和速率由 AI_PROVIDER_* 限制
+    PARSE_MAX_IN_FLIGHT = int(os.environ.get('PARSE_MAX_IN_FLIGHT', 50))
+    # 进程池模式（可选）：文本提取与规则提取在独立进程中执行，绕开GIL；数据库写入仍在工作线程中
+    PARSE_PROCESS_POOL = os.environ.get('PARSE_PROCESS_POOL', 'false').lower() == 'true'
+    PARSE_PROCESS_WORKERS = int(os.environ.get('PARSE_PROCESS_WORKERS', 0)) or (os.cpu_count() or 1)
+
+    # PDF分级提取：PyMuPDF结果质量达标时不再运行pdfplumber/pdfminer
+    PDF_TIERED_EXTRACTION = os.environ.get('PDF_TIERED_EXTRACTION', 'true').lower() == 'true'
+    PDF_TIER_MIN_CHARS = int(os.environ.get('PDF_TIER_MIN_CHARS', 200))  # 最少字符数
+    PDF_TIER_MIN_CHINESE_RATIO = float(os.environ.get('PDF_TIER_MIN_CHINESE_RATIO', 0.1))  # 最低中文占比
+    PDF_TIER_MIN_UNIQUE_CHARS = int(os.environ.get('PDF_TIER_MIN_UNIQUE_CHARS', 50))  # 最少不同字符数
+    PDF_TIER_MIN_LINE_SCORE = float(os.environ.get('PDF_TIER_MIN_LINE_SCORE', 0.8))  # 非碎片行最低占比
+
+    # 简历提取结果缓存（按文件SHA-256 + 提取器版本复用文本和规则提取结果）
+    EXTRACTION_CACHE_ENABLED = os.environ.get('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+    EXTRACTION_CACHE_FOLDER = os.environ.get('EXTRACTION_CACHE_FOLDER') or os.path.join(CACHE_FOLDER, 'extraction')
+    EXTRACTION_CACHE_MAX_MB = int(os.environ.get('EXTRACTION_CACHE_MAX_MB', 200))  # 缓存总大小上限（MB）
+
+    # 扫描件OCR：页面并行识别（常驻OCR工作线程池）
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', 0)) or min(4, os.cpu_count() or 1)
+    OCR_LANG = os.environ.get('OCR_LANG', 'chi_sim+eng')
+    # Tesseract语言数据目录（留空时自动查找 /usr/share/tesseract-ocr/*/tessdata）
+    OCR_TESSDATA_PATH = os.environ.get('OCR_TESSDATA_PATH') or os.environ.get('TESSDATA_PREFIX', '')
+    OCR_TARGET_DPI = int(os.environ.get('OCR_TARGET_DPI', 200))  # 渲染目标DPI
+    OCR_MAX_PIXELS = int(os.environ.get('OCR_MAX_PIXELS', 8000000))  # 单页位图像素上限，超大页面自动降低DPI
+    OCR_DOC_TIME_BUDGET = float(os.environ.get('OCR_DOC_TIME_BUDGET', 60))  # 单份文档OCR总时限（秒）
+
+    # SQLite并发配置（WAL模式下读不阻塞写；多个写入者通过忙等待超时排队）
+    SQLITE_WAL = os.environ.get('SQLITE_WAL', 'true').lower() == 'true'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 30000))  # 等待写锁的最长时间（毫秒）
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # WAL模式下NORMAL即可保证一致性
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 65536))  # 每个连接的页缓存大小（KB）
+    SQLITE_MMAP_SIZE_MB = int(os.environ.get('SQLITE_MMAP_SIZE_MB', 256))  # 内存映射读取大小（MB）
+    # 后台任务的写入在进程内串行提交
+    SQLITE_SERIALIZE_BACKGROUND_WRITES = os.environ.get('SQLITE_SERIALIZE_BACKGROUND_WRITES', 'true').lower() == 'true'
+
+    # 数据库连接池（全进程共用一个引擎；请求内的会话在请求结束时统一归还连接）
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))  # 常驻连接数
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))  # 高峰时允许额外创建的连接数
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))  # 连接耗尽时等待空闲连接的最长时间（秒）
+
+    # 简历查重：默认只比对共享身份键（手机号/邮箱/姓名）的候选简历；设为true则与全部已解析简历比对
+    DUPLICATE_FULL_SCAN = os.environ.get('DUPLICATE_FULL_SCAN', 'false').lower() == 'true'
+    DUPLICATE_MAX_CANDIDATES = int(os.environ.get('DUPLICATE_MAX_CANDIDATES', 1000))  # 单次查重的候选上限
+
+    # 简历正文压缩级别（zlib 1-9，越大压缩率越高、写入越慢）
+    RESUME_TEXT_COMPRESS_LEVEL = int(os.environ.get('RESUME_TEXT_COMPRESS_LEVEL', 6))
+
+    # 简历全文检索：匹配数不超过该值时按相关度（bm25）排序，超过时按上传时间倒序
+    SEARCH_RANK_LIMIT = int(os.environ.get('SEARCH_RANK_LIMIT', 500))
+
+    # 数据统计从按日汇总表（funnel_daily）读取；设为false则直接聚合简历和面试记录
+    STATS_USE_ROLLUP = os.environ.get('STATS_USE_ROLLUP', 'true').lower() == 'true'
+
+    # 列表分页：默认每页条数、单页上限，以及列表总数缓存的有效期（秒，设为0不缓存）
+    RESUME_PAGE_SIZE = int(os.environ.get('RESUME_PAGE_SIZE', 10))
+    INTERVIEW_PAGE_SIZE = int(os.environ.get('INTERVIEW_PAGE_SIZE', 50))
+    LIST_MAX_PAGE_SIZE = int(os.environ.get('LIST_MAX_PAGE_SIZE', 200))
+    LIST_COUNT_CACHE_SECONDS = float(os.environ.get('LIST_COUNT_CACHE_SECONDS', 30))
+
+    # 实时同步：各表版本号的进程内缓存有效期（秒），单次检查最多返回的变更记录ID数
+    SYNC_VERSION_CACHE_SECONDS = float(os.environ.get('SYNC_VERSION_CACHE_SECONDS', 2))
+    SYNC_MAX_CHANGED_IDS = int(os.environ.get('SYNC_MAX_CHANGED_IDS', 200))
+    # 实时同步推送（SSE）：同时在线的连接数上限（超出时前端退回定时检查），单个连接的最长保持时间（秒，到期后浏览器自动重连）
+    SYNC_MAX_SUBSCRIBERS = int(os.environ.get('SYNC_MAX_SUBSCRIBERS', 200))
+    SYNC_STREAM_MAX_SECONDS = float(os.environ.get('SYNC_STREAM_MAX_SECONDS', 300))
+
+    # 解析进度推送（SSE）心跳间隔（秒）
+    SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+
     # 教育层级选项（用于面试登记表学历下拉）
     EDUCATION_LEVELS = ['博士', '硕士', '本科', '大专', '高中', '职高', '初中', '其他']
 
@@ -6,6 +6,12 @@ import json
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from utils.password_hash import generate_password_hash, check_password_hash
+from utils.resume_search import (
+    FTS_CREATE_TABLE, FTS_INSERT_SQL, FTS_DELETE_SQL, build_match_query, rank_sql, search_row
+)
+
+# 写入全文索引的简历字段（更新这些字段时需要重建该简历的索引）
+SEARCH_SOURCE_FIELDS = {'name', 'school', 'major', 'work_experience', 'raw_text'}
 
 
 class D1Adapter:
@@ -104,7 +110,23 @@ class D1Adapter:
             now
         )
         result = await self.db.prepare(sql).bind(*params).run()
-        return result.meta.last_row_id
+        resume_id = result.meta.last_row_id
+        resume = await self.get_resume(resume_id)
+        if resume:
+            await self._index_resume(resume_id, resume)
+        return resume_id
+    
+    async def _index_resume(self, resume_id: int, resume: Dict[str, Any], delete: bool = False) -> None:
+        """
+        同步全文索引（D1的触发器无法调用Python分词函数，由适配器在写入简历时维护）
+        
+        Args:
+            resume_id: 简历ID
+            resume: 简历数据；删除时必须是写入索引时的内容
+            delete: 是否从索引中删除
+        """
+        sql = FTS_DELETE_SQL if delete else FTS_INSERT_SQL
+        await self.db.prepare(sql).bind(resume_id, *search_row(resume)).run()
     
     async def get_resume(self, resume_id: int) -> Optional[Dict[str, Any]]:
         """获取简历"""
@@ -141,27 +163,45 @@ class D1Adapter:
         sql = f"UPDATE resumes SET {', '.join(set_clauses)} WHERE id = ?"
         params.append(resume_id)
         
+        reindex = bool(SEARCH_SOURCE_FIELDS & set(updates))
+        old_resume = await self.get_resume(resume_id) if reindex else None
         await self.db.prepare(sql).bind(*params).run()
+        if old_resume:
+            await self._index_resume(resume_id, old_resume, delete=True)
+            await self._index_resume(resume_id, await self.get_resume(resume_id))
         return True
     
     async def list_resumes(self, filters: Dict[str, Any] = None, 
                           limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """列出简历"""
-        sql = "SELECT * FROM resumes WHERE 1=1"
+        """列出简历（filters['search'] 使用全文索引检索并按相关度排序）"""
+        sql = "SELECT resumes.* FROM resumes"
         params = []
+        order_by = "upload_time DESC"
+        
+        filters = filters or {}
+        # search 在所有索引列中检索，name 只在姓名列中检索，两者合并为一个MATCH表达式
+        name_match = build_match_query(filters.get('name'), columns=('name',)) if filters.get('name') else None
+        match_parts = [build_match_query(filters.get('search')) if filters.get('search') else None, name_match]
+        match_parts = [part for part in match_parts if part]
+        if match_parts:
+            sql += f" JOIN ({rank_sql('?')}) AS ranked ON ranked.resume_id = resumes.id"
+            params.append(' AND '.join(match_parts))
+            order_by = "ranked.rank, upload_time DESC"
+        sql += " WHERE 1=1"
         
         if filters:
             if 'parse_status' in filters:
                 sql += " AND parse_status = ?"
                 params.append(filters['parse_status'])
-            if 'name' in filters and filters['name']:
+            if filters.get('name') and not name_match:
+                # 姓名中没有可检索的文字（如只有标点）时退回 LIKE
                 sql += " AND name LIKE ?"
                 params.append(f"%{filters['name']}%")
             if 'applied_position' in filters and filters['applied_position']:
                 sql += " AND applied_position LIKE ?"
                 params.append(f"%{filters['applied_position']}%")
         
-        sql += " ORDER BY upload_time DESC LIMIT ? OFFSET ?"
+        sql += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
         results = await self.db.prepare(sql).bind(*params).all()
@@ -169,8 +209,11 @@ class D1Adapter:
     
     async def delete_resume(self, resume_id: int) -> bool:
         """删除简历"""
+        old_resume = await self.get_resume(resume_id)
         sql = "DELETE FROM resumes WHERE id = ?"
         await self.db.prepare(sql).bind(resume_id).run()
+        if old_resume:
+            await self._index_resume(resume_id, old_resume, delete=True)
         return True
     
     def _normalize_resume(self, row: Dict[str, Any]) -> Dict[str, Any]:
@@ -431,7 +474,8 @@ class D1Adapter:
         """初始化数据库表（如果不存在）"""
         # 这里可以执行CREATE TABLE IF NOT EXISTS语句
         # 由于D1数据库可能已经通过迁移脚本创建，这里主要是确保表存在
-        pass
+        # 简历全文索引（无内容FTS5表，由 create/update/delete_resume 同步）
+        await self.db.prepare(FTS_CREATE_TABLE).run()
     
     def check_password(self, password_hash: str, password: str) -> bool:
         """验证密码"""
@@ -5,9 +5,8 @@
 import os
 import logging
 from typing import Optional, Any, Dict, List
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import text, inspect
+from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
@@ -90,22 +89,14 @@ class DatabaseManager:
             raise
     
     def _init_sqlite(self):
-        """初始化 SQLite 数据库"""
+        """初始化 SQLite 数据库（复用 models.engine，整个进程只有一个引擎和连接池）"""
         from config import Config
+        from models import engine, Session
         
-        database_path = os.environ.get('DATABASE_PATH', Config.DATABASE_PATH)
-        
-        # 创建 SQLite 引擎
-        self.engine = create_engine(
-            f'sqlite:///{database_path}',
-            echo=False,
-            poolclass=StaticPool,
-            connect_args={'check_same_thread': False}
-        )
-        
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine = engine
+        self.Session = Session
         self.db_type = 'sqlite'
-        logger.info(f"SQLite 数据库已初始化: {database_path}")
+        logger.info(f"SQLite 数据库已初始化: {Config.DATABASE_PATH}")
     
     def get_session(self) -> Optional[Session]:
         """获取数据库会话（SQLite）"""
@@ -193,7 +184,9 @@ class DatabaseManager:
         
         if self.db_type == 'sqlite' and self.engine:
             from config import Config
-            status['sqlite_path'] = os.environ.get('DATABASE_PATH', Config.DATABASE_PATH)
+            from metrics import db_pool_metrics
+            status['sqlite_path'] = Config.DATABASE_PATH
+            status['pool'] = db_pool_metrics.snapshot()
             
             # 获取表列表
             try:
@@ -223,7 +216,10 @@ def get_database_manager() -> DatabaseManager:
 
 
 def get_db_session() -> Optional[Session]:
-    """获取数据库会话（兼容现有代码）"""
+    """获取数据库会话（兼容现有代码，等同于 models.get_db_session）"""
     manager = get_database_manager()
+    if manager.db_type == 'sqlite':
+        from models import get_db_session as get_models_session
+        return get_models_session()
     return manager.get_session()
 
@@ -0,0 +1,304 @@
+"""
+简历解析任务队列
+任务持久化到 parse_jobs 表，由固定数量的工作线程按提交顺序（FIFO）处理；
+排队任务超过上限时拒绝提交（背压），应用重启后自动恢复未完成的任务。
+处理函数可以返回 Future 把任务的后续步骤挂起（如等待AI回复），工作线程随即领取下一个任务，
+Future 完成后再由工作线程继续执行，同时处理中的任务数由 max_in_flight 限制
+"""
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Optional, Dict, Any, Tuple
+
+from sqlalchemy import func
+
+from models import get_db_session, commit_serialized, ParseJob, Resume
+
+
+class QueueFullError(Exception):
+    """排队任务数已达上限"""
+
+
+class ParseJobQueue:
+    """持久化的简历解析任务队列（固定大小工作线程池）"""
+
+    # 同一任务最多执行次数（防止导致进程崩溃的文件在每次重启后反复执行）
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, handler: Callable[[int, str], Any], max_workers: int = 2,
+                 max_pending: int = 500, poll_interval: float = 2.0,
+                 session_factory: Callable = get_db_session,
+                 max_in_flight: Optional[int] = None):
+        """
+        初始化任务队列
+
+        Args:
+            handler: 任务处理函数，签名为 handler(resume_id, file_path)。返回 None 表示任务已完成；
+                     返回 concurrent.futures.Future 表示任务挂起，Future 的结果（可调用对象或None）
+                     由工作线程继续执行，返回值按同样规则处理
+            max_workers: 工作线程数（同时执行处理函数的任务数）
+            max_pending: 排队（pending）任务上限，超出后 submit 抛出 QueueFullError
+            poll_interval: 空闲工作线程轮询数据库的间隔（秒）
+            session_factory: 数据库会话工厂（默认使用 models.get_db_session）
+            max_in_flight: 已领取、尚未完成的任务数上限（含挂起的任务），默认等于工作线程数
+        """
+        self.handler = handler
+        self.session_factory = session_factory
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.max_in_flight = max(self.max_workers, int(max_in_flight or 0))
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._claim_lock = threading.Lock()
+        self._workers = []
+        self._started = False
+        # 挂起的任务完成后待继续执行的步骤 (job_id, step)，优先于领取新任务
+        self._ready = deque()
+        self._in_flight = 0
+
+    def start(self) -> int:
+        """
+        恢复未完成的任务并启动工作线程（重复调用无副作用）
+
+        Returns:
+            恢复后处于排队状态的任务数
+        """
+        with self._cond:
+            if self._started:
+                return 0
+            self._started = True
+
+        pending = self.recover()
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f'parse-worker-{i + 1}')
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+        print(f"✓ 简历解析队列已启动（工作线程: {self.max_workers}，同时处理上限: {self.max_in_flight}，"
+              f"排队上限: {self.max_pending}，待处理: {pending}）")
+        return pending
+
+    def recover(self) -> int:
+        """
+        恢复上次运行中断的任务：processing 状态重置为 pending，超过重试次数的标记为失败
+
+        Returns:
+            恢复后处于排队状态的任务数
+        """
+        db = self.session_factory()
+        try:
+            interrupted = db.query(ParseJob).filter(ParseJob.status == 'processing').all()
+            for job in interrupted:
+                resume = db.query(Resume).filter_by(id=job.resume_id).first()
+                if (job.attempts or 0) >= self.MAX_ATTEMPTS:
+                    job.status = 'failed'
+                    job.error_message = f'解析任务多次中断（{job.attempts} 次），已放弃'
+                    job.finished_at = datetime.now()
+                    if resume:
+                        resume.parse_status = 'failed'
+                        resume.error_message = job.error_message
+                else:
+                    job.status = 'pending'
+                    if resume:
+                        resume.parse_status = 'pending'
+            db.commit()
+            return db.query(ParseJob).filter(ParseJob.status == 'pending').count()
+        finally:
+            db.close()
+
+    def pending_count(self) -> int:
+        """当前排队中的任务数"""
+        db = self.session_factory()
+        try:
+            return db.query(ParseJob).filter(ParseJob.status == 'pending').count()
+        finally:
+            db.close()
+
+    def is_full(self) -> bool:
+        """排队任务是否已达上限"""
+        return self.pending_count() >= self.max_pending
+
+    def submit(self, resume_id: int, file_path: str, created_by: Optional[str] = None) -> int:
+        """
+        提交解析任务
+
+        Args:
+            resume_id: 简历ID
+            file_path: 待解析文件路径
+            created_by: 提交者用户名
+
+        Returns:
+            任务ID
+
+        Raises:
+            QueueFullError: 排队任务数已达上限
+        """
+        db = self.session_factory()
+        try:
+            pending = db.query(ParseJob).filter(ParseJob.status == 'pending').count()
+            if pending >= self.max_pending:
+                raise QueueFullError(f'解析队列已满（{pending}/{self.max_pending}），请稍后再试')
+
+            job = ParseJob(
+                resume_id=resume_id,
+                file_path=file_path,
+                status='pending',
+                attempts=0,
+                created_by=created_by
+            )
+            db.add(job)
+            db.commit()
+            job_id = job.id
+        finally:
+            db.close()
+
+        with self._cond:
+            self._cond.notify()
+        return job_id
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列状态统计"""
+        db = self.session_factory()
+        try:
+            counts = {}
+            for status in ('pending', 'processing', 'success', 'failed'):
+                counts[status] = db.query(ParseJob).filter(ParseJob.status == status).count()
+        finally:
+            db.close()
+
+        with self._cond:
+            in_flight = self._in_flight
+
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'max_in_flight': self.max_in_flight,
+            'in_flight': in_flight,
+            'running': self._started,
+            'jobs': counts
+        }
+
+    def _claim_next(self) -> Optional[Tuple[int, int, str]]:
+        """
+        按FIFO顺序领取下一个排队任务，返回 (job_id, resume_id, file_path)
+
+        用带状态条件的UPDATE领取（WHERE status='pending'），只有更新到一行才算领取成功；
+        多个进程共用同一个数据库时，同一任务只会被一个进程领取，失败的一方继续尝试下一个任务
+        """
+        with self._claim_lock:
+            db = self.session_factory()
+            try:
+                while True:
+                    job = db.query(ParseJob.id, ParseJob.resume_id, ParseJob.file_path).filter(
+                        ParseJob.status == 'pending'
+                    ).order_by(ParseJob.id.asc()).first()
+                    if not job:
+                        return None
+
+                    claimed = db.query(ParseJob).filter(
+                        ParseJob.id == job.id,
+                        ParseJob.status == 'pending'
+                    ).update({
+                        ParseJob.status: 'processing',
+                        ParseJob.attempts: func.coalesce(ParseJob.attempts, 0) + 1,
+                        ParseJob.started_at: datetime.now()
+                    }, synchronize_session=False)
+                    commit_serialized(db)
+                    if claimed == 1:
+                        return job.id, job.resume_id, job.file_path
+            finally:
+                db.close()
+
+    def _finish(self, job_id: int, error: Optional[str] = None) -> None:
+        """记录任务结束状态（以简历的解析结果为准）"""
+        db = self.session_factory()
+        try:
+            job = db.query(ParseJob).filter_by(id=job_id).first()
+            if not job:
+                return
+
+            if error is None:
+                resume = db.query(Resume).filter_by(id=job.resume_id).first()
+                if resume and resume.parse_status == 'failed':
+                    error = resume.error_message or '解析失败'
+
+            job.status = 'failed' if error else 'success'
+            job.error_message = error
+            job.finished_at = datetime.now()
+            commit_serialized(db)
+        finally:
+            db.close()
+
+    def _next_task(self) -> Optional[Tuple[int, Callable[[], Any]]]:
+        """取下一个要执行的步骤 (job_id, step)：先继续挂起后已完成的任务，未达上限时再领取新任务"""
+        with self._cond:
+            if self._ready:
+                return self._ready.popleft()
+            if self._in_flight >= self.max_in_flight:
+                return None
+            self._in_flight += 1
+
+        try:
+            claimed = self._claim_next()
+        except Exception as e:
+            print(f"领取解析任务失败: {e}")
+            claimed = None
+
+        if claimed is None:
+            with self._cond:
+                self._in_flight -= 1
+            return None
+        job_id, resume_id, file_path = claimed
+        return job_id, functools.partial(self.handler, resume_id, file_path)
+
+    def _run_step(self, job_id: int, step: Callable[[], Any]) -> None:
+        """执行任务的一个步骤；返回 Future 时挂起任务，否则记录任务结束"""
+        try:
+            result = step()
+        except Exception as e:
+            print(f"解析任务 {job_id} 执行失败: {e}")
+            self._complete(job_id, str(e))
+            return
+
+        if isinstance(result, Future):
+            result.add_done_callback(lambda future: self._resume(job_id, future))
+        else:
+            self._complete(job_id)
+
+    def _resume(self, job_id: int, future: Future) -> None:
+        """挂起的步骤完成（在完成 Future 的线程中回调）：把后续步骤交给工作线程执行"""
+        def step():
+            next_step = future.result()
+            return next_step() if callable(next_step) else None
+
+        with self._cond:
+            self._ready.append((job_id, step))
+            self._cond.notify()
+
+    def _complete(self, job_id: int, error: Optional[str] = None) -> None:
+        """任务结束：记录状态并释放处理名额"""
+        try:
+            self._finish(job_id, error)
+        except Exception as e:
+            print(f"更新解析任务 {job_id} 状态失败: {e}")
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def _worker_loop(self) -> None:
+        """工作线程主循环"""
+        while True:
+            task = self._next_task()
+            if task is None:
+                with self._cond:
+                    if not self._ready:
+                        self._cond.wait(timeout=self.poll_interval)
+                continue
+
+            job_id, step = task
+            self._run_step(job_id, step)
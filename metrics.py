@@ -0,0 +1,300 @@
+"""
+简历解析阶段耗时统计
+每个阶段的耗时写入直方图（Prometheus分桶 + 最近样本的p50/p95/p99），并记录失败次数；
+单份简历的各阶段耗时由 StageTimer 收集，保存到 resumes.stage_timings 供前端展示。
+数据库连接池的借出次数、占用数和连接持有时长由 PoolMetrics 统计。
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable
+
+# 直方图分桶上限（秒）
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# 用于计算分位数的最近样本数
+RESERVOIR_SIZE = 1024
+
+# 阶段名称（中文用于前端展示）
+STAGE_LABELS = {
+    'extract_text': '文本提取',
+    'ai_optimize': 'AI文本优化',
+    'ai_extract': 'AI信息提取',
+    'ai_fused': 'AI单次解析',
+    'rule_extract': '规则提取',
+    'duplicate_check': '查重',
+    'commit': '保存',
+    'total': '总计',
+}
+
+
+class Histogram:
+    """单个阶段的耗时直方图（线程安全）"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.failures = 0
+        self._samples = deque(maxlen=RESERVOIR_SIZE)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += seconds
+            if failed:
+                self.failures += 1
+            self._samples.append(seconds)
+            for i, upper in enumerate(self.buckets):
+                if seconds <= upper:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """最近样本的分位数（无样本时返回None）"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(int(q * len(samples)), len(samples) - 1)
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative = []
+            total = 0
+            for count in self.bucket_counts:
+                total += count
+                cumulative.append(total)
+            data = {
+                'count': self.count,
+                'sum': self.sum,
+                'failures': self.failures,
+                'buckets': list(zip(self.buckets, cumulative))
+            }
+        for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            data[name] = self.quantile(q)
+        return data
+
+
+class StageMetrics:
+    """按阶段汇总的耗时统计"""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> Histogram:
+        with self._lock:
+            if stage not in self._histograms:
+                self._histograms[stage] = Histogram()
+            return self._histograms[stage]
+
+    def observe(self, stage: str, seconds: float, failed: bool = False) -> None:
+        self.histogram(stage).observe(seconds, failed)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """各阶段的次数、失败次数、平均值和分位数（秒）"""
+        with self._lock:
+            stages = dict(self._histograms)
+        summary = {}
+        for stage, histogram in stages.items():
+            data = histogram.snapshot()
+            summary[stage] = {
+                'label': STAGE_LABELS.get(stage, stage),
+                'count': data['count'],
+                'failures': data['failures'],
+                'avg': round(data['sum'] / data['count'], 4) if data['count'] else None,
+                'p50': data['p50'],
+                'p95': data['p95'],
+                'p99': data['p99'],
+            }
+        return summary
+
+    def render_prometheus(self) -> List[str]:
+        """生成Prometheus文本格式的指标行"""
+        with self._lock:
+            stages = sorted(self._histograms.items())
+        snapshots = [(stage, histogram.snapshot()) for stage, histogram in stages]
+
+        lines = [f"# HELP {self.name}_seconds {self.description}",
+                 f"# TYPE {self.name}_seconds histogram"]
+        for stage, data in snapshots:
+            for upper, count in data['buckets']:
+                lines.append(f'{self.name}_seconds_bucket{{stage="{stage}",le="{upper}"}} {count}')
+            lines.append(f'{self.name}_seconds_bucket{{stage="{stage}",le="+Inf"}} {data["count"]}')
+            lines.append(f'{self.name}_seconds_sum{{stage="{stage}"}} {data["sum"]:.6f}')
+            lines.append(f'{self.name}_seconds_count{{stage="{stage}"}} {data["count"]}')
+
+        lines += [f"# HELP {self.name}_quantile_seconds {self.description}（最近{RESERVOIR_SIZE}次的分位数）",
+                  f"# TYPE {self.name}_quantile_seconds gauge"]
+        for stage, data in snapshots:
+            for name, q in (('p50', '0.5'), ('p95', '0.95'), ('p99', '0.99')):
+                if data[name] is not None:
+                    lines.append(f'{self.name}_quantile_seconds{{stage="{stage}",quantile="{q}"}} {data[name]:.6f}')
+
+        lines += [f"# HELP {self.name}_failures_total 阶段失败次数",
+                  f"# TYPE {self.name}_failures_total counter"]
+        for stage, data in snapshots:
+            lines.append(f'{self.name}_failures_total{{stage="{stage}"}} {data["failures"]}')
+        return lines
+
+
+class StageTimer:
+    """
+    单份简历的阶段计时器：每个阶段的耗时同时写入全局直方图和本次解析的耗时记录
+
+    用法:
+        timer = StageTimer(parse_metrics)
+        with timer.stage('extract_text'):
+            ...
+        resume.stage_timings = timer.timings
+    """
+
+    def __init__(self, metrics: StageMetrics, on_stage: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            metrics: 写入的全局阶段统计
+            on_stage: 可选回调，每个阶段开始时以阶段名称调用（用于推送解析进度）
+        """
+        self.metrics = metrics
+        self.on_stage = on_stage
+        self.timings = {}
+        self._started = time.perf_counter()
+        self._total_observed = False
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.on_stage:
+            try:
+                self.on_stage(name)
+            except Exception as e:
+                print(f"阶段回调失败: {e}")
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[name] = round(self.timings.get(name, 0) + elapsed, 4)
+            self.metrics.observe(name, elapsed, failed)
+
+    def finish(self, failed: bool = False, observe: bool = True) -> Dict[str, float]:
+        """
+        记录总耗时并返回本次解析的各阶段耗时（秒）
+
+        Args:
+            failed: 本次解析是否失败
+            observe: 是否写入全局 total 直方图；False 时只计算耗时（如需先把耗时随结果一起提交）。
+                     同一计时器的 total 只写入一次，重复调用不会重复计数
+        """
+        elapsed = time.perf_counter() - self._started
+        self.timings['total'] = round(elapsed, 4)
+        if observe and not self._total_observed:
+            self._total_observed = True
+            self.metrics.observe('total', elapsed, failed)
+        return self.timings
+
+
+class PoolMetrics:
+    """数据库连接池统计：借出/新建次数、当前借出数及峰值、每次借出的持有时长"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.connects = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.hold_time = Histogram()
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def attach(self, engine) -> None:
+        """监听引擎连接池的事件"""
+        from sqlalchemy import event
+        self._pool = engine.pool
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop('checked_out_at', None)
+        if started is None:
+            return
+        self.hold_time.observe(time.perf_counter() - started)
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'checked_out': self.checked_out,
+                'peak_checked_out': self.peak_checked_out,
+            }
+        if self._pool is not None and hasattr(self._pool, 'size'):
+            data['pool_size'] = self._pool.size()
+            data['overflow'] = self._pool.overflow()
+        hold = self.hold_time.snapshot()
+        data['hold_seconds'] = {'count': hold['count'], 'sum': hold['sum'],
+                                'p50': hold['p50'], 'p95': hold['p95'], 'p99': hold['p99']}
+        return data
+
+    def render_prometheus(self) -> List[str]:
+        """生成Prometheus文本格式的指标行"""
+        data = self.snapshot()
+        hold = self.hold_time.snapshot()
+        lines = [f"# HELP {self.name}_checkouts_total 连接借出次数",
+                 f"# TYPE {self.name}_checkouts_total counter",
+                 f"{self.name}_checkouts_total {data['checkouts']}",
+                 f"# HELP {self.name}_connects_total 新建数据库连接次数",
+                 f"# TYPE {self.name}_connects_total counter",
+                 f"{self.name}_connects_total {data['connects']}",
+                 f"# HELP {self.name}_checked_out 当前借出的连接数",
+                 f"# TYPE {self.name}_checked_out gauge",
+                 f"{self.name}_checked_out {data['checked_out']}",
+                 f"# HELP {self.name}_checked_out_peak 借出连接数峰值",
+                 f"# TYPE {self.name}_checked_out_peak gauge",
+                 f"{self.name}_checked_out_peak {data['peak_checked_out']}"]
+        if 'pool_size' in data:
+            lines += [f"# HELP {self.name}_size 连接池常驻连接数",
+                      f"# TYPE {self.name}_size gauge",
+                      f"{self.name}_size {data['pool_size']}",
+                      f"# HELP {self.name}_overflow 连接池当前溢出连接数",
+                      f"# TYPE {self.name}_overflow gauge",
+                      f"{self.name}_overflow {data['overflow']}"]
+        lines += [f"# HELP {self.name}_hold_seconds 每次借出连接的持有时长（秒）",
+                  f"# TYPE {self.name}_hold_seconds histogram"]
+        for upper, count in hold['buckets']:
+            lines.append(f'{self.name}_hold_seconds_bucket{{le="{upper}"}} {count}')
+        lines.append(f'{self.name}_hold_seconds_bucket{{le="+Inf"}} {hold["count"]}')
+        lines.append(f'{self.name}_hold_seconds_sum {hold["sum"]:.6f}')
+        lines.append(f'{self.name}_hold_seconds_count {hold["count"]}')
+        return lines
+
+
+# 简历解析各阶段耗时
+parse_metrics = StageMetrics('resume_parse_stage', '简历解析各阶段耗时（秒）')
+
+# 数据库连接池（models.engine）
+db_pool_metrics = PoolMetrics('db_pool')
@@ -1,12 +1,25 @@
 """
 数据模型
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, JSON, text
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, JSON, LargeBinary, text, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship, deferred, Session as SASession
+from sqlalchemy.pool import QueuePool
+from flask import has_app_context
+from flask.globals import app_ctx
 from datetime import datetime
 from config import Config
+from utils.duplicate_checker import identity_keys
+from utils.resume_search import FTS_MIGRATION, FTS_TEXT_TRIGGERS, register_search_functions
+from utils.funnel_stats import FUNNEL_DAILY_MIGRATION
+from utils.change_feed import CHANGE_FEED_MIGRATION
+from metrics import db_pool_metrics
 import json
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
 from werkzeug.security import generate_password_hash, check_password_hash
 
 Base = declarative_base()
@@ -58,14 +71,25 @@ class Resume(Base):
     parse_status = Column(String(50), default='pending')  # pending/success/failed
     parse_time = Column(DateTime)
     error_message = Column(Text)
+    stage_timings = Column(JSON)  # 各解析阶段耗时（秒），如 {'extract_text': 0.8, 'total': 3.2}
     
     # 查重信息
     duplicate_status = Column(String(50))  # 重复状态：None/重复简历
     duplicate_similarity = Column(Float)  # 重合度（0-100）
     duplicate_resume_id = Column(Integer)  # 匹配到的重复简历ID
     
-    # 原始文本内容
-    raw_text = Column(Text)
+    # 查重身份键（归一化后建索引，由 name/phone/email 自动生成，见 identity_keys）
+    phone_key = Column(String(50), index=True)  # 手机号数字
+    phone_tail = Column(String(7), index=True)  # 手机号后7位
+    email_key = Column(String(100), index=True)  # 小写邮箱
+    email_local = Column(String(100), index=True)  # 邮箱用户名部分
+    name_key = Column(String(100), index=True)  # 归一化姓名
+    
+    # 原始文本内容：压缩后存放在 resume_texts 表（见 ResumeText），通过 raw_text 属性按需读写
+    text_record = relationship('ResumeText', primaryjoin='Resume.id == foreign(ResumeText.resume_id)',
+                               uselist=False, lazy='select', cascade='all, delete-orphan', passive_deletes=True)
+    # 旧版本存放正文的列，已迁移到 resume_texts 并清空；保留列定义以兼容旧数据库和已发布的索引迁移
+    legacy_raw_text = deferred(Column('raw_text', Text))
     
     # 操作记录字段
     created_by = Column(String(100))  # 创建者（上传者）
@@ -100,6 +124,7 @@ class Resume(Base):
             'parse_status': self.parse_status,
             'parse_time': self.parse_time.isoformat() if self.parse_time else None,
             'error_message': self.error_message,
+            'stage_timings': self.stage_timings,
             'duplicate_status': self.duplicate_status,
             'duplicate_similarity': self.duplicate_similarity,
             'duplicate_resume_id': self.duplicate_resume_id,
@@ -110,8 +135,288 @@ class Resume(Base):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+    @property
+    def raw_text(self):
+        """简历正文（首次访问时从 resume_texts 读取并解压）"""
+        return decompress_text(self.text_record.content) if self.text_record else None
+
+    @raw_text.setter
+    def raw_text(self, value):
+        if not value:
+            self.text_record = None
+        elif self.text_record is None:
+            self.text_record = ResumeText.from_text(value)
+        else:
+            self.text_record.set_text(value)
+
+    def to_summary_dict(self, fields=None):
+        """
+        转换为列表用的精简字典（只读取 fields 中的字段，不会触发延迟加载的简历正文等大字段）
+
+        Args:
+            fields: 字段名列表（to_dict 中的键，不含 raw_text），默认 RESUME_LIST_FIELDS
+        """
+        data = {}
+        for field in fields or RESUME_LIST_FIELDS:
+            value = getattr(self, field)
+            data[field] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+
+
+def compress_text(value):
+    """把正文压缩为 zlib 数据（UTF-8 编码）"""
+    if value is None:
+        return None
+    return zlib.compress(value.encode('utf-8'), Config.RESUME_TEXT_COMPRESS_LEVEL)
+
+
+def decompress_text(data):
+    """解压 compress_text() 的结果"""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode('utf-8')
+
+
+class ResumeText(Base):
+    """
+    简历正文（zlib压缩后单独存放）
+
+    正文占简历记录的大部分字节，单独存放后 resumes 表的列表、统计和查重扫描不再读取正文，
+    同样的页缓存能容纳更多简历行；正文只在查看详情、重新解析等需要时按简历ID读取。
+    """
+    __tablename__ = 'resume_texts'
+
+    resume_id = Column(Integer, primary_key=True)  # 对应简历ID
+    content = Column(LargeBinary, nullable=False)  # zlib压缩后的UTF-8正文
+    original_size = Column(Integer)  # 压缩前字节数
+
+    @classmethod
+    def from_text(cls, value):
+        record = cls()
+        record.set_text(value)
+        return record
+
+    def set_text(self, value):
+        self.content = compress_text(value)
+        self.original_size = len(value.encode('utf-8'))
+
+
+# 简历列表默认返回的字段（完整内容，包括简历正文和工作经历，通过 /api/resumes/<id> 获取）
+RESUME_LIST_FIELDS = (
+    'id', 'file_name', 'upload_time', 'name', 'gender', 'age', 'earliest_work_year', 'phone', 'email',
+    'highest_education', 'school', 'major', 'applied_position', 'match_score', 'match_level', 'match_position',
+    'parse_status', 'parse_time', 'duplicate_status', 'duplicate_similarity', 'duplicate_resume_id', 'created_by',
+)
+
+# 列表接口可以通过 fields 参数选择的字段
+RESUME_SELECTABLE_FIELDS = frozenset(RESUME_LIST_FIELDS) | {
+    'birth_year', 'age_from_resume', 'school_original', 'major_original', 'work_experience',
+    'error_message', 'stage_timings', 'updated_by', 'created_at', 'updated_at',
+}
+
+# 简历列表可排序的字段（/api/resumes?sort_by= 及其分页游标只接受这些列；JSON列和已迁移的旧正文列不可排序）
+RESUME_SORT_FIELDS = RESUME_SELECTABLE_FIELDS - {'work_experience', 'stage_timings'}
+
+
+def resume_list_columns(fields=None):
+    """列表查询需要从数据库读取的列（配合 load_only 使用，其余列延迟加载）"""
+    fields = fields or RESUME_LIST_FIELDS
+    names = {'id', 'upload_time'} | set(fields)
+    return [getattr(Resume, name) for name in sorted(names)]
+
+
+def earliest_work_year(work_experience):
+    """工作经历中最早的开始年份（没有有效年份时返回None）"""
+    years = [exp.get('start_year') for exp in work_experience or []
+             if isinstance(exp, dict) and isinstance(exp.get('start_year'), int)]
+    return min(years) if years else None
+
+
+@event.listens_for(Resume, 'before_insert')
+@event.listens_for(Resume, 'before_update')
+def _fill_earliest_work_year(mapper, connection, target):
+    """最早工作年份为空时从工作经历计算后保存（列表只读取这一列，不加载工作经历）"""
+    if target.earliest_work_year is None and target.work_experience:
+        target.earliest_work_year = earliest_work_year(target.work_experience)
+
+
+# 为最早工作年份为空的已有简历从工作经历（JSON数组）补算一次
+EARLIEST_WORK_YEAR_BACKFILL = (
+    "UPDATE resumes SET earliest_work_year = ("
+    "SELECT MIN(json_extract(value, '$.start_year')) FROM json_each(resumes.work_experience) "
+    "WHERE json_type(value, '$.start_year') = 'integer') "
+    "WHERE earliest_work_year IS NULL AND json_valid(work_experience) "
+    "AND json_type(work_experience) = 'array'"
+)
+
+
+IDENTITY_KEY_COLUMNS = ('phone_key', 'phone_tail', 'email_key', 'email_local', 'name_key')
+
+
+@event.listens_for(Resume, 'before_insert')
+@event.listens_for(Resume, 'before_update')
+def _update_identity_keys(mapper, connection, target):
+    """保存简历时根据姓名、手机号、邮箱同步查重身份键"""
+    for column, value in identity_keys(target.name, target.phone, target.email).items():
+        setattr(target, column, value)
+
+
+def backfill_identity_keys(conn, batch_size=500):
+    """为已有简历补全查重身份键（仅处理尚未生成身份键的记录）"""
+    rows = conn.execute(text(
+        "SELECT id, name, phone, email FROM resumes "
+        "WHERE phone_key IS NULL AND email_key IS NULL AND name_key IS NULL "
+        "AND (name IS NOT NULL OR phone IS NOT NULL OR email IS NOT NULL)"
+    )).fetchall()
+    updates = []
+    for resume_id, name, phone, email in rows:
+        keys = identity_keys(name, phone, email)
+        if any(keys.values()):
+            keys['id'] = resume_id
+            updates.append(keys)
+    assignments = ', '.join(f"{column} = :{column}" for column in IDENTITY_KEY_COLUMNS)
+    for start in range(0, len(updates), batch_size):
+        conn.execute(text(f"UPDATE resumes SET {assignments} WHERE id = :id"), updates[start:start + batch_size])
+    if updates:
+        print(f"✓ 已为 {len(updates)} 份简历生成查重身份键")
+
+
+# 索引迁移：(版本号, [建索引/建表语句])，已执行的版本记录在 PRAGMA user_version 中
+# 新增索引时追加新版本，不要修改已发布的版本
+INDEX_MIGRATIONS = [
+    (1, [
+        # 简历列表：默认按上传时间排序，可按解析状态/性别/学历筛选
+        "CREATE INDEX IF NOT EXISTS ix_resumes_upload_time ON resumes (upload_time)",
+        "CREATE INDEX IF NOT EXISTS ix_resumes_parse_status_upload_time ON resumes (parse_status, upload_time)",
+        "CREATE INDEX IF NOT EXISTS ix_resumes_gender_upload_time ON resumes (gender, upload_time)",
+        "CREATE INDEX IF NOT EXISTS ix_resumes_education_upload_time ON resumes (highest_education, upload_time)",
+        # 统计：按岗位和上传时间
+        "CREATE INDEX IF NOT EXISTS ix_resumes_applied_position_upload_time ON resumes (applied_position, upload_time)",
+        # 实时同步检查
+        "CREATE INDEX IF NOT EXISTS ix_resumes_updated_at ON resumes (updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_updated_at ON interviews (updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_positions_updated_at ON positions (updated_at)",
+        # 面试流程：按简历、身份验证码、评价/登记表链接token查找，列表按更新时间排序
+        "CREATE INDEX IF NOT EXISTS ix_interviews_resume_id ON interviews (resume_id)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_identity_code ON interviews (identity_code)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_round1_comment_token ON interviews (round1_comment_token)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_round2_comment_token ON interviews (round2_comment_token)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_round3_comment_token ON interviews (round3_comment_token)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_registration_form_token ON interviews (registration_form_token)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_update_time ON interviews (update_time)",
+        # 统计：到面（一面时间）、通过（状态+创建时间）、offer、入职，以及按岗位筛选
+        "CREATE INDEX IF NOT EXISTS ix_interviews_round1_time ON interviews (round1_time)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_applied_position_round1_time ON interviews (applied_position, round1_time)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_status_create_time ON interviews (status, create_time)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_offer_issued_offer_date ON interviews (offer_issued, offer_date)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_onboard_onboard_date ON interviews (onboard, onboard_date)",
+    ]),
+    # 简历全文检索：FTS5索引表、同步触发器及已有简历的回填（见 utils.resume_search）
+    (2, FTS_MIGRATION),
+    # 简历正文压缩后移到 resume_texts 表：先停用旧触发器，回填正文并清空旧列，再换成读取 resume_texts 的触发器
+    # （旧列清空前后索引内容不变，回填期间无需重建全文索引；清空后的空间需 VACUUM 才会还给文件系统）
+    (3, [
+        "DROP TRIGGER IF EXISTS resumes_fts_update",
+        ("INSERT OR IGNORE INTO resume_texts (resume_id, content, original_size) "
+         "SELECT id, compress_text(raw_text), length(CAST(raw_text AS BLOB)) FROM resumes "
+         "WHERE raw_text IS NOT NULL AND raw_text <> ''"),
+        "UPDATE resumes SET raw_text = NULL WHERE raw_text IS NOT NULL",
+    ] + FTS_TEXT_TRIGGERS),
+    # 招聘漏斗按日汇总：增量维护触发器及按已有记录生成汇总（见 utils.funnel_stats）
+    (4, FUNNEL_DAILY_MIGRATION),
+    # 实时同步的数据变更版本：简历、面试流程、岗位写入时记录变更并更新版本号（见 utils.change_feed）
+    (5, CHANGE_FEED_MIGRATION),
+    # 简历列表只读取 earliest_work_year，不再加载工作经历：补全为空的最早工作年份
+    (6, [EARLIEST_WORK_YEAR_BACKFILL]),
+]
+
+
+def apply_index_migrations(conn):
+    """执行尚未执行的索引迁移，并更新 PRAGMA user_version"""
+    current_version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+    for version, statements in INDEX_MIGRATIONS:
+        if version <= current_version:
+            continue
+        for statement in statements:
+            conn.execute(text(statement))
+        # PRAGMA 不支持参数绑定，version 为代码中的整数常量
+        conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+        conn.commit()
+        print(f"✓ 数据库索引迁移完成（版本 {version}）")
+    # 更新统计信息，帮助查询规划器选择索引
+    if current_version < INDEX_MIGRATIONS[-1][0]:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+
+@event.listens_for(Engine, 'connect')
+def register_sqlite_functions(dbapi_connection, connection_record):
+    """为所有SQLite连接注册全文检索触发器使用的分词、正文压缩/解压函数（触发器在任何连接上写入简历时都会调用）"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        register_search_functions(dbapi_connection)
+        dbapi_connection.create_function('compress_text', 1, compress_text, deterministic=True)
+        dbapi_connection.create_function('resume_text', 1, decompress_text, deterministic=True)
+
+
+def configure_sqlite_engine(sqlite_engine):
+    """
+    为SQLite引擎注册连接钩子：每个新连接启用WAL（读写互不阻塞）、忙等待超时、
+    synchronous=NORMAL，并设置页缓存和内存映射大小（参数见 Config.SQLITE_*）
+    """
+    synchronous = Config.SQLITE_SYNCHRONOUS.upper()
+    if synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+        synchronous = 'NORMAL'
+
+    @event.listens_for(sqlite_engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {int(Config.SQLITE_BUSY_TIMEOUT_MS)}")
+            if Config.SQLITE_WAL:
+                cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute(f"PRAGMA synchronous = {synchronous}")
+            # 负数表示以KB为单位
+            cursor.execute(f"PRAGMA cache_size = -{int(Config.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size = {int(Config.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        finally:
+            cursor.close()
+
+    return sqlite_engine
+
+
+# 后台任务（解析队列等）的写入串行化：SQLite同一时刻只允许一个写事务，
+# 后台线程在进程内排队提交，避免多个线程同时争抢数据库写锁（忙等待轮询、超时报 database is locked）
+_background_write_lock = threading.Lock()
+
+
+@contextmanager
+def serialized_write():
+    """后台任务写入数据库时使用（Config.SQLITE_SERIALIZE_BACKGROUND_WRITES 关闭时不加锁）"""
+    if not Config.SQLITE_SERIALIZE_BACKGROUND_WRITES:
+        yield
+        return
+    with _background_write_lock:
+        yield
+
+
+def commit_serialized(db):
+    """串行化提交后台任务的会话（会话应关闭autoflush或使用 no_autoflush，保证写入只发生在提交时）"""
+    with serialized_write():
+        db.commit()
+
+
 # 数据库初始化
-engine = create_engine(f'sqlite:///{Config.DATABASE_PATH}', echo=False)
+# 整个进程共用一个引擎（database_manager 也复用它），连接池大小见 Config.DB_POOL_*
+engine = configure_sqlite_engine(create_engine(
+    f'sqlite:///{Config.DATABASE_PATH}',
+    echo=False,
+    poolclass=QueuePool,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT,
+    connect_args={'check_same_thread': False}
+))
+db_pool_metrics.attach(engine)
 
 def init_database():
     """初始化数据库，创建所有表"""
@@ -158,6 +463,15 @@ def migrate_database():
                 conn.execute(text("ALTER TABLE resumes ADD COLUMN created_at DATETIME"))
             if 'updated_at' not in columns:
                 conn.execute(text("ALTER TABLE resumes ADD COLUMN updated_at DATETIME"))
+            if 'stage_timings' not in columns:
+                conn.execute(text("ALTER TABLE resumes ADD COLUMN stage_timings JSON"))
+            for column, column_type in (('phone_key', 'VARCHAR(50)'), ('phone_tail', 'VARCHAR(7)'),
+                                        ('email_key', 'VARCHAR(100)'), ('email_local', 'VARCHAR(100)'),
+                                        ('name_key', 'VARCHAR(100)')):
+                if column not in columns:
+                    conn.execute(text(f"ALTER TABLE resumes ADD COLUMN {column} {column_type}"))
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_resumes_{column} ON resumes ({column})"))
+            backfill_identity_keys(conn)
             conn.commit()
             
             # 为 positions 表添加字段（先检查表是否存在）
@@ -201,6 +515,21 @@ def migrate_database():
             except Exception:
                 # 表不存在，稍后会在初始化时创建
                 pass
+
+            # 为 global_ai_config 表添加字段
+            try:
+                conn.execute(text("SELECT 1 FROM global_ai_config LIMIT 1"))
+                result = conn.execute(text("PRAGMA table_info(global_ai_config)"))
+                columns = {row[1] for row in result}
+                if 'ai_pipeline' not in columns:
+                    conn.execute(text("ALTER TABLE global_ai_config ADD COLUMN ai_pipeline VARCHAR(20) DEFAULT 'two_step'"))
+                conn.commit()
+            except Exception:
+                # 表不存在，稍后会在初始化时创建
+                pass
+            
+            # 热点查询的二级索引（按版本执行）
+            apply_index_migrations(conn)
     except Exception as e:
         print(f"警告: 数据库迁移时出错（可能表不存在）: {e}")
         # 不抛出异常，让应用继续启动
@@ -441,6 +770,7 @@ class GlobalAIConfig(Base):
     ai_api_key = Column(Text)  # API密钥（加密存储）
     ai_api_base = Column(String(500))  # API基础URL
     ai_model = Column(String(100), default='gpt-3.5-turbo')  # AI模型
+    ai_pipeline = Column(String(20), default='two_step')  # 解析流程：two_step 文本优化+信息提取两次调用，fused 单次调用
     
     # 操作记录
     created_by = Column(String(100))  # 创建者（管理员用户名）
@@ -460,6 +790,7 @@ class GlobalAIConfig(Base):
             'ai_enabled': bool(self.ai_enabled),
             'ai_api_base': self.ai_api_base,
             'ai_model': self.ai_model,
+            'ai_pipeline': self.ai_pipeline or 'two_step',
             'created_by': self.created_by,
             'updated_by': self.updated_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -524,6 +855,78 @@ class User(Base):
             # 员工权限
             return permission == 'view_personal'
 
+class FunnelDaily(Base):
+    """
+    招聘漏斗按日汇总（由 resumes/interviews 上的触发器增量维护，见 utils.funnel_stats）
+
+    每行是某天、某岗位、某创建者的各项数量；各指标按各自的日期归入某天（简历按上传时间、到面按一面时间等），
+    日期为空的记录归入 day=''，未填岗位归入 position=''。
+    """
+    __tablename__ = 'funnel_daily'
+    # 以主键 (day, position, created_by) 聚簇存放，按日期范围求和时顺序读取，不需要回表
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    day = Column(String(10), primary_key=True, default='')  # YYYY-MM-DD
+    position = Column(String(200), primary_key=True, default='')  # 岗位
+    created_by = Column(String(100), primary_key=True, default='')  # 创建者（用户名）
+    resume_count = Column(Integer, nullable=False, default=0, server_default='0')
+    interview_count = Column(Integer, nullable=False, default=0, server_default='0')
+    pass_count = Column(Integer, nullable=False, default=0, server_default='0')
+    offer_count = Column(Integer, nullable=False, default=0, server_default='0')
+    onboard_count = Column(Integer, nullable=False, default=0, server_default='0')
+
+
+class ChangeLog(Base):
+    """数据变更记录（由 resumes/interviews/positions 上的触发器写入，只保留最近的变更，见 utils.change_feed）"""
+    __tablename__ = 'change_log'
+    # AUTOINCREMENT：清理旧记录后序号也不会重复使用，保证版本号只增不减
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)  # 全局变更序号
+    table_name = Column(String(50), nullable=False)  # 变更的表
+    row_id = Column(Integer, nullable=False)  # 变更记录的ID
+    op = Column(String(10), nullable=False)  # insert/update/delete
+
+
+class ChangeVersion(Base):
+    """各表当前的数据版本号（最后一次变更的序号，由触发器维护）"""
+    __tablename__ = 'change_versions'
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
+
+
+class ParseJob(Base):
+    """简历解析任务数据模型（持久化任务队列，重启后可恢复）"""
+    __tablename__ = 'parse_jobs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # 自增ID即FIFO顺序
+    resume_id = Column(Integer, nullable=False)  # 关联的简历ID
+    file_path = Column(String(500), nullable=False)  # 待解析文件路径
+    status = Column(String(50), default='pending', index=True)  # pending/processing/success/failed
+    attempts = Column(Integer, default=0)  # 已执行次数（含重启恢复后的重试）
+    error_message = Column(Text)
+
+    # 操作记录字段
+    created_by = Column(String(100))  # 提交者（上传者）
+    created_at = Column(DateTime, default=datetime.now)  # 入队时间
+    started_at = Column(DateTime)  # 开始处理时间
+    finished_at = Column(DateTime)  # 处理结束时间
+
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'resume_id': self.resume_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error_message': self.error_message,
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
 # 确保表存在
 Base.metadata.create_all(engine)
 
@@ -718,7 +1121,50 @@ init_database()
 # 然后执行迁移（添加新字段）
 migrate_database()
 
+class RequestSession(SASession):
+    """
+    请求作用域的会话：同一请求内多次调用 get_db_session() 得到同一个会话。
+    调用方的 close() 只在最后一个使用者关闭时才真正关闭，
+    嵌套调用的辅助函数（如 get_current_user）关闭会话不会影响外层仍在使用的对象；
+    请求结束时由 remove_request_session 统一关闭，出错路径上漏掉的 close() 不会泄漏连接。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.users = 0
+
+    def close(self):
+        if self.users > 1:
+            self.users -= 1
+            return
+        self.users = 0
+        super().close()
+
+
+def _app_context_scope():
+    return id(app_ctx._get_current_object())
+
+
+# 按Flask应用上下文划分的会话注册表
+request_session = scoped_session(sessionmaker(bind=engine, class_=RequestSession), scopefunc=_app_context_scope)
+
+
+def remove_request_session(exception=None):
+    """请求结束时关闭本次请求的会话（注册为 app.teardown_appcontext）"""
+    if has_app_context() and request_session.registry.has():
+        request_session().users = 0
+        request_session.remove()
+
+
 def get_db_session():
-    """获取数据库会话"""
+    """
+    获取数据库会话
+    在Flask请求（应用上下文）中返回本次请求共用的会话；
+    在解析任务等后台线程中每次返回新的会话，由调用方负责关闭
+    """
+    if has_app_context():
+        db = request_session()
+        db.users += 1
+        return db
     return Session()
 
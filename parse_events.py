@@ -0,0 +1,125 @@
+"""
+简历解析进度事件
+解析流程在状态变化时发布事件（queued/processing/stage/success/failed），
+/api/resumes/events 通过SSE推送给上传者，前端无需轮询简历列表。
+事件仅在当前进程内分发；保留最近的事件，断线重连时按 Last-Event-ID 补发。
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+# 保留的最近事件数（用于断线重连补发）
+HISTORY_SIZE = 1000
+
+# 每个订阅者的待发送事件上限，超出时丢弃最旧的事件
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """单个SSE连接的订阅"""
+
+    def __init__(self, broker: 'ParseEventBroker', username: Optional[str]):
+        self.broker = broker
+        self.username = username
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def accepts(self, event: Dict[str, Any]) -> bool:
+        """只接收本人上传的简历的事件（username为None时接收全部）"""
+        return self.username is None or event.get('created_by') == self.username
+
+    def put(self, event: Dict[str, Any]) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """等待下一条事件，超时返回None"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class ParseEventBroker:
+    """进程内的解析事件发布/订阅（线程安全）"""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._next_id = 1
+
+    def publish(self, resume_id: int, status: str, created_by: Optional[str] = None,
+                stage: Optional[str] = None, message: Optional[str] = None) -> Dict[str, Any]:
+        """
+        发布解析事件
+
+        Args:
+            resume_id: 简历ID
+            status: queued/processing/stage/success/failed
+            created_by: 上传者用户名（用于按用户过滤）
+            stage: status为stage时的阶段名称（见 metrics.STAGE_LABELS）
+            message: 失败原因等附加信息
+        """
+        with self._lock:
+            event = {
+                'id': self._next_id,
+                'resume_id': resume_id,
+                'status': status,
+                'stage': stage,
+                'message': message,
+                'created_by': created_by,
+                'timestamp': time.time()
+            }
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = [s for s in self._subscribers if s.accepts(event)]
+        for subscription in subscribers:
+            subscription.put(event)
+        return event
+
+    def subscribe(self, username: Optional[str] = None, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        订阅事件
+
+        Args:
+            username: 只接收该用户上传的简历的事件
+            last_event_id: 断线重连时客户端收到的最后一个事件ID，之后的事件会先补发
+        """
+        subscription = Subscription(self, username)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id and subscription.accepts(event):
+                        subscription.put(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """最近的事件（调试用）"""
+        with self._lock:
+            return list(self._history)[-limit:]
+
+
+# 全局解析事件
+parse_events = ParseEventBroker()
@@ -10,6 +10,7 @@ from datetime import datetime
 from models import get_db_session, Resume
 from utils.file_parser import extract_text
 from utils.info_extractor import InfoExtractor
+from utils.extraction_cache import extract_with_cache
 # 外部API验证已移除，统一使用AI API智能识别
 
 def reparse_all_resumes():
@@ -44,8 +45,8 @@ def reparse_all_resumes():
                     failed_count += 1
                     continue
                 
-                # 提取文本
-                text = extract_text(resume.file_path)
+                # 提取文本和信息（文件未变化时直接复用缓存结果）
+                text, info = extract_with_cache(resume.file_path, 'file_parser', extract_text, extractor.extract_all)
                 if not text:
                     print(f"  ❌ 无法提取文本")
                     resume.parse_status = 'failed'
@@ -53,9 +54,6 @@ def reparse_all_resumes():
                     failed_count += 1
                     continue
                 
-                # 提取信息
-                info = extractor.extract_all(text)
-                
                 # 更新基本信息
                 resume.name = info.get('name')
                 resume.gender = info.get('gender')
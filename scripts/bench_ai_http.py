@@ -0,0 +1,125 @@
+"""
+AI接口调用开销对比：每次 requests.post 新建连接（原实现） vs 按 api_base 复用的连接池（utils.http_pool）
+使用本地桩服务器（默认启用TLS，自签名证书由 openssl 生成；没有 openssl 时退回HTTP），
+--connect-delay-ms 模拟建立新连接时的网络往返（真实环境中TCP+TLS握手约需2-3个往返）
+
+用法:
+    python -m scripts.bench_ai_http [--calls 50] [--connect-delay-ms 30] [--no-tls]
+"""
+import argparse
+import json
+import os
+import shutil
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from utils.http_pool import post_json, close_sessions
+
+RESPONSE = json.dumps({'choices': [{'message': {'content': '{"name": "张三"}'}}]}, ensure_ascii=False).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # 响应头和响应体分两次发送，避免与客户端的延迟确认叠加出40ms等待
+
+    def setup(self):
+        # 新连接的额外延迟（模拟握手往返）
+        time.sleep(self.server.connect_delay)
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_certificate(directory: str):
+    """生成 127.0.0.1 的自签名证书，没有 openssl 时返回None"""
+    if not shutil.which('openssl'):
+        return None
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-keyout', key, '-out', cert, '-subj', '/CN=127.0.0.1',
+                    '-addext', 'subjectAltName=IP:127.0.0.1'],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return cert, key
+
+
+def start_server(connect_delay: float, certificate):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.connect_delay = connect_delay
+    server.connections = 0
+    scheme = 'http'
+    if certificate:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*certificate)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'{scheme}://127.0.0.1:{server.server_address[1]}/v1'
+
+
+def time_calls(call, count: int) -> list:
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = call()
+        assert response.status_code == 200
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI接口调用：新建连接 vs 连接池')
+    parser.add_argument('--calls', type=int, default=50, help='每种方式的调用次数')
+    parser.add_argument('--connect-delay-ms', type=float, default=30, help='新连接的模拟握手延迟（毫秒）')
+    parser.add_argument('--no-tls', action='store_true', help='使用HTTP（不测TLS握手）')
+    args = parser.parse_args()
+
+    certificate = None if args.no_tls else make_certificate(tempfile.mkdtemp())
+    if certificate:
+        # 两种方式都通过环境变量信任自签名证书
+        os.environ['REQUESTS_CA_BUNDLE'] = certificate[0]
+    server, api_base = start_server(args.connect_delay_ms / 1000, certificate)
+    url = f'{api_base}/chat/completions'
+    headers = {'Content-Type': 'application/json', 'Authorization': 'Bearer test'}
+    payload = {'model': 'stub', 'messages': [{'role': 'user', 'content': '简历正文' * 500}]}
+
+    results = {}
+    connections = server.connections
+    results['每次新建连接（原实现）'] = (time_calls(lambda: requests.post(url, headers=headers, json=payload, timeout=60),
+                                             args.calls), server.connections - connections)
+    connections = server.connections
+    results['连接池复用（http_pool）'] = (time_calls(lambda: post_json(api_base, url, headers, payload), args.calls),
+                                         server.connections - connections)
+    close_sessions()
+    server.shutdown()
+
+    print(f"{'TLS' if certificate else 'HTTP'}，模拟握手延迟 {args.connect_delay_ms:.0f}ms，每种方式 {args.calls} 次调用")
+    print(f"{'':<22}{'中位数(ms)':>12}{'P95(ms)':>10}{'新建连接数':>10}")
+    for label, (timings, opened) in results.items():
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f"{label:<22}{statistics.median(timings):>12.2f}{p95:>10.2f}{opened:>10}")
+    old, new = (statistics.median(t) for t, _ in results.values())
+    print(f"每次调用节省约 {old - new:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
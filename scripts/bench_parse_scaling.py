@@ -0,0 +1,100 @@
+"""
+解析吞吐基准测试：对比线程池与进程池在不同并发数下的简历解析速度（份/秒）
+
+用法:
+    python -m scripts.bench_parse_scaling [--count 40] [--workers 1,2,4,8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import parse_pool
+
+SAMPLE_LINES = [
+    '个人简历',
+    '姓名：张三    性别：男    年龄：28岁',
+    '手机：13800138000    邮箱：zhangsan@example.com',
+    '最高学历：本科    毕业院校：西安交通大学    专业：计算机科学与技术',
+    '工作经历',
+    '2019.07-2022.06  北京某某科技有限公司  后端开发工程师',
+    '负责订单系统的设计与开发，参与微服务拆分，优化数据库查询性能。',
+    '2022.07-至今  上海某某网络技术有限公司  高级开发工程师',
+    '主导支付网关重构，搭建监控告警体系，带领三人小组完成核心模块交付。',
+    '项目经历',
+    '简历解析平台：支持PDF与Word文档的批量解析和信息抽取，日处理量上万份。',
+]
+
+
+def build_samples(directory: str, count: int, pages: int = 2) -> list:
+    """生成测试用的中文简历PDF"""
+    import fitz
+
+    paths = []
+    for i in range(count):
+        doc = fitz.open()
+        for _ in range(pages):
+            page = doc.new_page()
+            y = 60
+            for _ in range(4):
+                for line in SAMPLE_LINES:
+                    page.insert_text((50, y), line, fontname='china-s', fontsize=10)
+                    y += 16
+        path = os.path.join(directory, f'sample_{i}.pdf')
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def parse_one(file_path: str) -> int:
+    """单份简历的CPU阶段：文本提取 + 规则提取"""
+    text = parse_pool.extract_resume_text_local(file_path)
+    info = parse_pool.extract_resume_info_local(text)
+    return len(info)
+
+
+def run(executor_cls, workers: int, paths: list) -> float:
+    kwargs = {'max_workers': workers}
+    if executor_cls is ProcessPoolExecutor:
+        kwargs['mp_context'] = multiprocessing.get_context('fork')
+        kwargs['initializer'] = parse_pool._init_worker
+    with executor_cls(**kwargs) as executor:
+        # 预热：排除进程创建和库加载时间
+        list(executor.map(parse_one, paths[:workers]))
+        start = time.perf_counter()
+        list(executor.map(parse_one, paths))
+        elapsed = time.perf_counter() - start
+    return len(paths) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历解析吞吐基准测试')
+    parser.add_argument('--count', type=int, default=40, help='测试简历数量')
+    default_workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    parser.add_argument('--workers', default=','.join(str(w) for w in default_workers),
+                        help='逗号分隔的并发数列表')
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(',') if w.strip()]
+
+    directory = tempfile.mkdtemp(prefix='bench_parse_')
+    try:
+        paths = build_samples(directory, args.count)
+        print(f"CPU核数: {os.cpu_count()}，测试简历: {len(paths)} 份")
+        print(f"{'并发数':>6} {'线程池(份/秒)':>14} {'进程池(份/秒)':>14} {'加速比':>8}")
+        for workers in worker_counts:
+            thread_rate = run(ThreadPoolExecutor, workers, paths)
+            process_rate = run(ProcessPoolExecutor, workers, paths)
+            print(f"{workers:>6} {thread_rate:>14.2f} {process_rate:>14.2f} {process_rate / thread_rate:>8.2f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+简历列表基准测试：对比列表返回完整字段（to_dict，包含简历正文和工作经历）与精简字段（load_only + to_summary_dict）
+的响应大小和耗时
+
+用法:
+    python -m scripts.bench_resume_list [--count 2000] [--repeat 20] [--text-size 6000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, load_only
+
+from models import Base, Resume, compress_text, configure_sqlite_engine, resume_list_columns
+
+PAGE_SIZES = (10, 50, 200, 1000)
+
+
+def build_database(path: str, count: int, text_size: int, seed: int = 42) -> None:
+    """生成测试简历（正文长度约 text_size 个字符，与应用相同压缩后存入 resume_texts 表）"""
+    rng = random.Random(seed)
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    Base.metadata.create_all(engine)
+    words = '负责系统设计开发优化数据库查询性能主导重构搭建监控告警体系带领小组完成核心模块交付熟悉中间件'
+    insert = text(
+        "INSERT INTO resumes (id, file_name, file_path, name, school, major, phone, work_experience, "
+        "parse_status, upload_time) VALUES (:id, :file_name, '/tmp/bench.pdf', :name, '浙江大学', '软件工程', "
+        ":phone, :work_experience, 'success', datetime('now', :offset))"
+    )
+    insert_text = text(
+        "INSERT INTO resume_texts (resume_id, content, original_size) VALUES (:id, :content, :original_size)"
+    )
+    with engine.begin() as conn:
+        batch = []
+        for i in range(count):
+            experiences = [{'company': f'公司{j}', 'position': '工程师', 'start_year': 2010 + j, 'end_year': 2012 + j,
+                            'description': ''.join(rng.choice(words) for _ in range(200))}
+                           for j in range(rng.randint(1, 4))]
+            raw_text = ''.join(rng.choice(words) for _ in range(text_size))
+            batch.append({
+                'id': i + 1,
+                'file_name': f'resume_{i}.pdf',
+                'name': f'候选人{i}',
+                'phone': f'138{i:08d}',
+                'work_experience': json.dumps(experiences, ensure_ascii=False),
+                'content': compress_text(raw_text),
+                'original_size': len(raw_text.encode('utf-8')),
+                'offset': f'-{i} minutes',
+            })
+            if len(batch) >= 500:
+                conn.execute(insert, batch)
+                conn.execute(insert_text, batch)
+                batch = []
+        if batch:
+            conn.execute(insert, batch)
+            conn.execute(insert_text, batch)
+    engine.dispose()
+
+
+def measure(func, repeat: int):
+    timings, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func())
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历列表基准测试（完整字段 vs 精简字段）')
+    parser.add_argument('--count', type=int, default=2000, help='生成的简历数量')
+    parser.add_argument('--repeat', type=int, default=20, help='每种情况的重复次数')
+    parser.add_argument('--text-size', type=int, default=6000, help='每份简历正文的字符数')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_list.db')
+    build_database(path, args.count, args.text_size)
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    Session = sessionmaker(bind=engine)
+
+    # 与 /api/resumes 相同：按上传时间倒序取一页并序列化为JSON；每次使用新会话，避免复用已加载的对象
+    def full_page(size):
+        db = Session()
+        rows = db.query(Resume).order_by(Resume.upload_time.desc(), Resume.id.desc()).limit(size).all()
+        payload = json.dumps([r.to_dict() for r in rows], ensure_ascii=False)
+        db.close()
+        return payload.encode('utf-8')
+
+    def summary_page(size):
+        db = Session()
+        rows = db.query(Resume).options(load_only(*resume_list_columns())) \
+            .order_by(Resume.upload_time.desc(), Resume.id.desc()).limit(size).all()
+        payload = json.dumps([r.to_summary_dict() for r in rows], ensure_ascii=False)
+        db.close()
+        return payload.encode('utf-8')
+
+    print(f"简历数: {args.count}，正文约 {args.text_size} 字")
+    print(f"\n{'每页':>6}{'完整KB':>10}{'精简KB':>10}{'完整p50':>10}{'精简p50':>10}  (毫秒)")
+    for size in PAGE_SIZES:
+        if size > args.count:
+            continue
+        repeat = max(args.repeat // (size // 50 + 1), 3)
+        full_ms, full_bytes = measure(lambda: full_page(size), repeat)
+        summary_ms, summary_bytes = measure(lambda: summary_page(size), repeat)
+        print(f"{size:>6}{full_bytes / 1024:>10.1f}{summary_bytes / 1024:>10.1f}{full_ms:>10.2f}{summary_ms:>10.2f}")
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
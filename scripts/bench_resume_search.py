@@ -0,0 +1,157 @@
+"""
+简历检索基准测试：在临时数据库中生成大量简历，对比全文索引（FTS5）与 LIKE '%词%' 的检索耗时
+
+用法:
+    python -m scripts.bench_resume_search [--count 100000] [--repeat 20] [--db /tmp/bench_search.db]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, ResumeText, apply_index_migrations, compress_text, configure_sqlite_engine
+from utils.resume_search import build_match_query, relevance_page, count_matches
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾萧田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢'
+GIVEN_CHARS = '伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀兰霞平刚桂英华玉萍红娥玲芬燕彬鹏辉建国志成'
+SCHOOLS = ['北京大学', '清华大学', '西安交通大学', '浙江大学', '复旦大学', '上海交通大学', '南京大学', '武汉大学',
+           '中山大学', '四川大学', '哈尔滨工业大学', '华中科技大学', '西北工业大学', '电子科技大学', '同济大学']
+MAJORS = ['计算机科学与技术', '软件工程', '电子信息工程', '机械设计制造及其自动化', '会计学', '金融学',
+          '汉语言文学', '法学', '市场营销', '人力资源管理', '通信工程', '自动化']
+COMPANIES = ['北京字节跳动科技有限公司', '阿里巴巴网络技术有限公司', '深圳市腾讯计算机系统有限公司',
+             '华为技术有限公司', '上海某某网络技术有限公司', '西安某某软件有限公司', '中国建设银行', '京东集团']
+POSITIONS = ['后端开发工程师', '前端开发工程师', '测试工程师', '产品经理', '数据分析师', '会计', '人事专员', '运维工程师']
+SENTENCES = [
+    '负责订单系统的设计与开发，参与微服务拆分，优化数据库查询性能。',
+    '主导支付网关重构，搭建监控告警体系，带领三人小组完成核心模块交付。',
+    '熟悉Python、Java和Go语言，掌握MySQL、Redis、Kafka等中间件。',
+    '参与公司年度预算编制，负责费用报销审核与月度结账工作。',
+    '组织校园招聘活动，完成全年招聘计划，优化员工入职流程。',
+    '使用Vue和React开发管理后台，提升页面加载速度约百分之四十。',
+]
+
+# (说明, 检索词)
+QUERIES = [
+    ('姓名', None),  # 运行时取一个已生成的姓名
+    ('学校部分词', '交通'),
+    ('公司', '字节跳动'),
+    ('职位', '数据分析'),
+    ('正文英文', 'kafka'),
+    ('多词', '浙江 软件'),
+]
+
+
+def build_database(path: str, count: int, seed: int = 42) -> None:
+    """生成测试简历（正文与应用相同压缩后存入 resume_texts 表，由触发器写入全文索引）"""
+    rng = random.Random(seed)
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        apply_index_migrations(conn)
+
+    batch = []
+    insert = text(
+        "INSERT INTO resumes (id, file_name, file_path, name, school, major, work_experience, parse_status, upload_time) "
+        "VALUES (:id, :file_name, '/tmp/bench.pdf', :name, :school, :major, :work_experience, 'success', datetime('now'))"
+    )
+    insert_text = text(
+        "INSERT INTO resume_texts (resume_id, content, original_size) VALUES (:id, :content, :original_size)"
+    )
+    with engine.begin() as conn:
+        for i in range(count):
+            name = rng.choice(SURNAMES) + ''.join(rng.choice(GIVEN_CHARS) for _ in range(rng.choice((1, 2))))
+            experiences = [{'company': rng.choice(COMPANIES), 'position': rng.choice(POSITIONS)}
+                           for _ in range(rng.randint(1, 3))]
+            raw_text = '\n'.join([name, rng.choice(SCHOOLS), rng.choice(MAJORS)]
+                                 + [rng.choice(SENTENCES) for _ in range(8)])
+            batch.append({
+                'id': i + 1,
+                'file_name': f'resume_{i}.pdf',
+                'name': name,
+                'school': rng.choice(SCHOOLS),
+                'major': rng.choice(MAJORS),
+                'work_experience': json.dumps(experiences),
+                'content': compress_text(raw_text),
+                'original_size': len(raw_text.encode('utf-8')),
+            })
+            if len(batch) >= 1000:
+                conn.execute(insert, batch)
+                conn.execute(insert_text, batch)
+                batch = []
+        if batch:
+            conn.execute(insert, batch)
+            conn.execute(insert_text, batch)
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+    engine.dispose()
+
+
+def time_call(func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {'p50': statistics.median(timings), 'p95': timings[min(int(len(timings) * 0.95), len(timings) - 1)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历检索基准测试（FTS5 vs LIKE）')
+    parser.add_argument('--count', type=int, default=100000, help='生成的简历数量')
+    parser.add_argument('--repeat', type=int, default=20, help='每个查询的重复次数')
+    parser.add_argument('--db', help='复用已生成的测试数据库（不存在时生成到该路径）')
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), 'bench_search.db')
+    if not os.path.exists(path):
+        print(f"生成 {args.count} 份简历...")
+        started = time.perf_counter()
+        build_database(path, args.count)
+        print(f"  写入耗时 {time.perf_counter() - started:.1f}s，数据库大小 {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    db = sessionmaker(bind=engine)()
+    total = db.query(Resume).count()
+    sample_name = db.query(Resume.name).filter(Resume.id == total // 2).scalar()
+    print(f"简历数: {total}")
+    print(f"\n{'查询':<10}{'检索词':<12}{'匹配数':>8}{'首页p50':>10}{'首页p95':>10}{'计数p50':>10}{'LIKE p50':>10}  (毫秒)")
+
+    for label, term in QUERIES:
+        term = term or sample_name
+        match = build_match_query(term)
+        like = f'%{term.split()[0]}%'
+
+        # 与 /api/resumes?search= 相同：按相关度（常见词按上传时间）取第一页，只有检索条件时从索引计数
+        def first_page():
+            return relevance_page(db, db.query(Resume.id, Resume.name), match, None, 10)
+
+        # 原实现：各字段和正文逐行 LIKE（正文需从 resume_texts 解压）
+        def like_page():
+            body = func.resume_text(ResumeText.content)
+            return db.query(Resume.id, Resume.name).outerjoin(ResumeText, ResumeText.resume_id == Resume.id).filter(
+                Resume.name.like(like) | Resume.school.like(like) | Resume.major.like(like) | body.like(like)
+            ).order_by(Resume.upload_time.desc()).limit(10).all()
+
+        matches = count_matches(db, match)
+        page = time_call(first_page, args.repeat)
+        count = time_call(lambda: count_matches(db, match), args.repeat)
+        baseline = time_call(like_page, max(args.repeat // 5, 1))
+        print(f"{label:<10}{term:<12}{matches:>8}{page['p50']:>10.2f}{page['p95']:>10.2f}"
+              f"{count['p50']:>10.2f}{baseline['p50']:>10.2f}")
+    db.close()
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
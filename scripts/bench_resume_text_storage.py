@@ -0,0 +1,116 @@
+"""
+简历正文存储对比：正文直接存放在 resumes.raw_text（迁移版本2）与压缩后移到 resume_texts 表（迁移版本3）
+的数据库大小和 resumes 表扫描耗时；同时验证迁移后正文和检索结果不变
+
+用法:
+    python -m scripts.bench_resume_text_storage [--count 2000] [--repeat 10] [--text-size 6000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from models import INDEX_MIGRATIONS, apply_index_migrations, configure_sqlite_engine
+from scripts.bench_resume_list import build_database
+
+# (说明, SQL)：需要扫描 resumes 表的查询
+SCANS = [
+    ('全表计数（非索引条件）', "SELECT count(*) FROM resumes WHERE school LIKE '%大学%'"),
+    ('统计分组', "SELECT applied_position, parse_status, count(*) FROM resumes GROUP BY applied_position, parse_status"),
+    ('按上传者统计', "SELECT created_by, count(*) FROM resumes GROUP BY created_by"),
+    ('查重全量加载', "SELECT id, name, phone, email, school, major, work_experience FROM resumes WHERE parse_status = 'success'"),
+    ('导出全部字段', "SELECT * FROM resumes ORDER BY upload_time DESC"),
+]
+
+
+def time_scans(path: str, repeat: int) -> dict:
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    results = {}
+    with engine.connect() as conn:
+        for label, sql in SCANS:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(text(sql)).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[label] = statistics.median(timings)
+        results['resumes表页数'] = conn.execute(
+            text("SELECT count(*) FROM dbstat WHERE name = 'resumes'")).scalar() if _has_dbstat(conn) else None
+    engine.dispose()
+    return results
+
+
+def _has_dbstat(conn) -> bool:
+    try:
+        conn.execute(text("SELECT 1 FROM dbstat LIMIT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def snapshot(conn) -> tuple:
+    """迁移前后应一致的内容：正文摘要和一个检索结果"""
+    texts = conn.execute(text(
+        "SELECT count(*), sum(length(coalesce(raw_text, ''))) FROM ("
+        "SELECT r.id, coalesce(r.raw_text, resume_text(t.content)) AS raw_text "
+        "FROM resumes r LEFT JOIN resume_texts t ON t.resume_id = r.id)")).one()
+    hits = conn.execute(text("SELECT count(*) FROM resumes_fts WHERE resumes_fts MATCH '\"监控 控告 告警\"'")).scalar()
+    return tuple(texts), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历正文存储对比（内联 vs 压缩分表）')
+    parser.add_argument('--count', type=int, default=2000, help='生成的简历数量')
+    parser.add_argument('--repeat', type=int, default=10, help='每个查询的重复次数')
+    parser.add_argument('--text-size', type=int, default=6000, help='每份简历正文的字符数')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_text.db')
+    print(f"生成 {args.count} 份简历（正文约 {args.text_size} 字，存放在 resumes.raw_text）...")
+    build_database(path, args.count, args.text_size)
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    with engine.connect() as conn:
+        for version, statements in INDEX_MIGRATIONS:
+            if version <= 2:
+                for statement in statements:
+                    conn.execute(text(statement))
+        conn.execute(text("PRAGMA user_version = 2"))
+        conn.commit()
+        conn.execute(text("VACUUM"))
+        before_snapshot = snapshot(conn)
+    engine.dispose()
+    before_size = os.path.getsize(path)
+    before = time_scans(path, args.repeat)
+
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{path}'))
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        apply_index_migrations(conn)
+        migrate_seconds = time.perf_counter() - started
+        # 清空旧列后的空闲页需要 VACUUM 才会还给文件系统
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        conn.execute(text("VACUUM"))
+        after_snapshot = snapshot(conn)
+        conn.execute(text("INSERT INTO resumes_fts(resumes_fts) VALUES ('integrity-check')"))
+    engine.dispose()
+    after_size = os.path.getsize(path)
+    after = time_scans(path, args.repeat)
+
+    print(f"迁移耗时 {migrate_seconds:.1f}s，迁移前后正文与检索结果一致: {before_snapshot == after_snapshot}")
+    print(f"\n{'':<16}{'迁移前':>12}{'迁移后':>12}")
+    print(f"{'数据库大小(MB)':<16}{before_size / 1024 / 1024:>12.1f}{after_size / 1024 / 1024:>12.1f}")
+    for label in before:
+        if before[label] is None:
+            continue
+        unit = '' if label.endswith('页数') else '(毫秒)'
+        print(f"{label + unit:<16}{before[label]:>12.2f}{after[label]:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""按简历和面试记录整表重建招聘漏斗按日汇总（funnel_daily）
+
+汇总表平时由触发器增量维护；直接改库、恢复备份或调整统计口径后运行本脚本重建。
+
+用法:
+    python -m scripts.rebuild_funnel_daily
+"""
+import time
+
+from models import engine
+from utils.funnel_stats import rebuild_funnel_daily
+
+
+def main() -> None:
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        rows = rebuild_funnel_daily(conn)
+    print(f"✓ 招聘漏斗按日汇总已重建：{rows} 行，耗时 {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
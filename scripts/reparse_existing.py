@@ -3,6 +3,7 @@ from datetime import datetime
 from models import get_db_session, Resume
 from utils.info_extractor import InfoExtractor
 from utils.file_parser import extract_text
+from utils.extraction_cache import extract_with_cache
 
 
 def reparse_all(batch_size: int = 50) -> None:
@@ -18,16 +19,21 @@ def reparse_all(batch_size: int = 50) -> None:
         processed = 0
         for resume in query.yield_per(batch_size):
             text = resume.raw_text
+            info = None
             if not text:
                 try:
-                    text = extract_text(resume.file_path)
+                    # 文件未变化时直接复用缓存的文本和规则提取结果；未命中时提取的结果同样直接用于更新字段
+                    text, info = extract_with_cache(resume.file_path, 'file_parser', extract_text, extractor.extract_all)
                     resume.raw_text = text
                 except Exception as err:
                     resume.parse_status = 'failed'
                     resume.error_message = str(err)
-                continue
+                    continue
+                if not text:
+                    continue
 
-            info = extractor.extract_all(text)
+            if info is None:
+                info = extractor.extract_all(text)
             resume.name = info.get('name')
             resume.gender = info.get('gender')
             resume.birth_year = info.get('birth_year')
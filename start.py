@@ -74,7 +74,8 @@ def main():
     
     # 启动应用
     try:
-        from app import app
+        from app import app, start_parse_workers
+        start_parse_workers()
         app.run(debug=True, host='0.0.0.0', port=port, use_reloader=False)
     except Exception as e:
         print(f'❌ 启动失败: {e}')
@@ -4,6 +4,10 @@ let perPage = 10;
 let totalPages = 1;
 let sortBy = 'upload_time';
 let sortOrder = 'desc';
+let sortChosen = false; // 用户是否点击过列头排序（未点击时搜索结果按相关度排序）
+let pageCursors = {};     // 简历列表各页的分页游标（页码 -> 上一页返回的 next_cursor）
+let pageCursorKey = '';   // 游标对应的筛选/排序条件，条件变化时清空
+let interviewCursor = null; // 面试流程列表下一页的游标
 let selectedResumes = new Set();
 let currentResumeData = null;
 let aiConfigStatus = null; // AI配置状态缓存
@@ -11,38 +15,24 @@ let interviewedResumeIds = new Set(); // 已邀约面试的简历ID集合
 let selectedInterviews = new Set();   // 面试流程列表中选中的行ID
 let educationLevels = [];
 let currentUser = null; // 当前登录用户信息
-let lastSyncTime = null; // 最后同步时间
-let syncInterval = null; // 同步定时器
+let syncVersions = null; // 实时同步：上次拿到的各表数据版本号
+let displayedResumeIds = new Set(); // 简历列表当前页显示的简历ID
+let syncInterval = null; // 同步定时器（浏览器不支持推送或推送连接已满时使用）
+let syncEventSource = null; // 数据更新推送（SSE）连接
 
-// 实时同步检查
+// 实时同步检查：带上次返回的各表版本号，服务端只返回有变化的表及变化的记录ID
 function checkSync() {
-    if (!lastSyncTime) {
-        lastSyncTime = new Date().toISOString();
-        return;
+    const params = new URLSearchParams();
+    if (syncVersions) {
+        Object.keys(syncVersions).forEach(table => params.append(table, syncVersions[table]));
+        params.append('ids', '1');
     }
-    
-    fetch(`/api/sync/check?last_sync=${encodeURIComponent(lastSyncTime)}`)
+
+    fetch(`/api/sync/check?${params.toString()}`)
         .then(response => response.json())
         .then(result => {
             if (result.success) {
-                const updates = result.updates;
-                const currentModule = document.querySelector('.module.active');
-                
-                // 如果有更新，刷新对应的列表
-                if (updates.resumes && currentModule && currentModule.id === 'module-upload') {
-                    loadResumes(currentPage);
-                }
-                if (updates.interviews && currentModule && currentModule.id === 'module-interview') {
-                    loadInterviews();
-                }
-                if (updates.positions && currentModule && currentModule.id === 'module-positions') {
-                    loadPositions();
-                }
-                
-                // 更新同步时间
-                if (result.current_time) {
-                    lastSyncTime = result.current_time;
-                }
+                applySyncResult(result);
             }
         })
         .catch(error => {
@@ -50,17 +40,79 @@ function checkSync() {
         });
 }
 
-// 启动实时同步
+// 根据同步结果刷新有变化的列表，并记录新的版本号
+function applySyncResult(result) {
+    const updates = result.updates || {};
+    const changes = result.changes || {};
+    const currentModule = document.querySelector('.module.active');
+    
+    // 如果有更新，刷新对应的列表
+    if (updates.resumes && currentModule && currentModule.id === 'module-upload'
+        && resumeChangesVisible(changes.resumes)) {
+        loadResumes(currentPage);
+    }
+    if (updates.interviews && currentModule && currentModule.id === 'module-interview') {
+        loadInterviews();
+    }
+    if (updates.positions && currentModule && currentModule.id === 'module-positions') {
+        loadPositions();
+    }
+    
+    // 更新版本号
+    if (result.versions) {
+        syncVersions = result.versions;
+    }
+}
+
+// 简历变化是否影响当前页：第一页可能出现新简历；其他页按游标翻页，只有本页显示的简历变化时才需要刷新
+function resumeChangesVisible(change) {
+    if (!change || change.truncated || currentPage === 1) {
+        return true;
+    }
+    return [...(change.ids || []), ...(change.deleted || [])].some(id => displayedResumeIds.has(id));
+}
+
+// 启动实时同步：优先使用服务端推送（SSE），数据有变化时才收到消息；不可用时退回每5秒检查一次
 function startSync() {
-    // 每5秒检查一次更新
+    stopSync();
+    if (typeof EventSource === 'undefined') {
+        startSyncPolling();
+        return;
+    }
+    const params = new URLSearchParams();
+    if (syncVersions) {
+        Object.keys(syncVersions).forEach(table => params.append(table, syncVersions[table]));
+    }
+    syncEventSource = new EventSource(`/api/sync/events?${params.toString()}`);
+    syncEventSource.addEventListener('sync', e => applySyncResult(JSON.parse(e.data)));
+    syncEventSource.onerror = () => {
+        // 浏览器会自动重连；连接被拒绝（如连接数已满）时退回定时检查，1分钟后再尝试推送
+        if (syncEventSource && syncEventSource.readyState === EventSource.CLOSED) {
+            syncEventSource = null;
+            startSyncPolling();
+            setTimeout(() => {
+                if (syncInterval) {
+                    startSync();
+                }
+            }, 60000);
+        }
+    };
+}
+
+function startSyncPolling() {
     if (syncInterval) {
         clearInterval(syncInterval);
     }
+    checkSync();
     syncInterval = setInterval(checkSync, 5000);
 }
 
 // 停止实时同步
 function stopSync() {
+    if (syncEventSource) {
+        syncEventSource.close();
+        syncEventSource = null;
+    }
     if (syncInterval) {
         clearInterval(syncInterval);
         syncInterval = null;
@@ -142,6 +194,7 @@ function logout() {
     if (!confirm('确定要退出登录吗？')) {
         return;
     }
+    stopResumeEvents();
     fetch('/api/logout', { method: 'POST' })
         .then(() => {
             window.location.href = '/login';
@@ -785,8 +838,6 @@ function deleteUser(userId) {
 
 // 初始化
 document.addEventListener('DOMContentLoaded', function() {
-    // 初始化同步时间
-    lastSyncTime = new Date().toISOString();
     // 启动实时同步
     startSync();
     
@@ -987,18 +1038,30 @@ function loadResumes(page = 1) {
     const params = new URLSearchParams({
         page: page,
         per_page: perPage,
-        sort_by: sortBy,
         sort_order: sortOrder
     });
     
+    // 搜索时未指定排序列则由后端按相关度排序
+    if (!search || sortChosen) params.append('sort_by', sortBy);
     if (search) params.append('search', search);
     if (gender) params.append('gender', gender);
     if (education) params.append('education', education);
     
+    // 已知该页游标时按游标读取（后端从上一页末尾继续，不必跳过前面的行）；否则按页码跳页
+    const cursorKey = `${perPage}|${params.get('sort_by') || ''}|${sortOrder}|${search}|${gender}|${education}`;
+    if (cursorKey !== pageCursorKey) {
+        pageCursors = {};
+        pageCursorKey = cursorKey;
+    }
+    if (page > 1 && pageCursors[page]) params.append('cursor', pageCursors[page]);
+    
     fetch(`/api/resumes?${params}`)
         .then(response => response.json())
         .then(data => {
             if (data.success) {
+                if (data.next_cursor && pageCursorKey === cursorKey) {
+                    pageCursors[page + 1] = data.next_cursor;
+                }
                 const currentIds = new Set(data.data.map(item => item.id));
                 selectedResumes.forEach(id => {
                     if (!currentIds.has(id)) {
@@ -1032,15 +1095,15 @@ function displayResumes(resumes) {
         return;
     }
     
+    displayedResumeIds = new Set(resumes.map(r => r.id));
     if (resumes.length === 0) {
         tbody.innerHTML = '<tr><td colspan="16" class="loading">暂无数据</td></tr>';
         return;
     }
     
-    // 检查是否有正在处理的简历，如果有则设置自动刷新
+    // 检查是否有正在处理的简历：优先订阅解析进度事件（SSE），浏览器不支持时退回3秒定时刷新
     const hasProcessing = resumes.some(r => r.parse_status === 'pending' || r.parse_status === 'processing');
-    if (hasProcessing) {
-        // 如果有正在处理的简历，3秒后自动刷新
+    if (hasProcessing && !startResumeEvents()) {
         if (window.refreshTimer) {
             clearTimeout(window.refreshTimer);
         }
@@ -1115,7 +1178,7 @@ function displayResumes(resumes) {
         const viewButtonClass = parseStatus !== 'success' ? 'btn btn-small btn-view btn-disabled' : 'btn btn-small btn-view';
         
         return `
-        <tr class="${isSelected ? 'selected' : ''}">
+        <tr class="${isSelected ? 'selected' : ''}" data-resume-id="${resume.id}">
             <td><input type="checkbox" value="${resume.id}" ${isSelected ? 'checked' : ''} ${parseStatus !== 'success' ? 'disabled' : ''} onchange="toggleResume(${resume.id}, this)"></td>
             <td>${escapeHtml(resume.applied_position) || '-'}</td>
             <td>${identityCode}</td>
@@ -1129,7 +1192,7 @@ function displayResumes(resumes) {
             <td>${escapeHtml(resume.school) || '-'}</td>
             <td>${escapeHtml(resume.major) || '-'}</td>
             <td>${duplicateDisplay}</td>
-            <td>${statusDisplay}</td>
+            <td class="parse-status-cell">${statusDisplay}</td>
             <td>${escapeHtml(resume.created_by || '-')}</td>
             <td>
                 <button class="${viewButtonClass}" ${viewButtonDisabled} onclick="viewDetail(${resume.id})">查看/编辑</button>
@@ -1144,6 +1207,75 @@ function displayResumes(resumes) {
     }).join('');
 }
 
+// 解析进度事件流（SSE）
+let resumeEventSource = null;
+let resumeReloadTimer = null;
+
+// 订阅当前用户上传的简历的解析进度，返回是否已订阅
+function startResumeEvents() {
+    if (resumeEventSource) {
+        return true;
+    }
+    if (typeof EventSource === 'undefined') {
+        return false;
+    }
+    resumeEventSource = new EventSource('/api/resumes/events');
+    // 连接建立（或重连）前可能错过了事件，若列表中仍有处理中的简历则刷新一次
+    resumeEventSource.onopen = () => {
+        if (document.querySelector('#resumeTableBody .status-pending, #resumeTableBody .status-processing')) {
+            scheduleResumeReload();
+        }
+    };
+    ['queued', 'processing', 'stage'].forEach(type => {
+        resumeEventSource.addEventListener(type, e => updateResumeStatusCell(JSON.parse(e.data)));
+    });
+    ['success', 'failed'].forEach(type => {
+        resumeEventSource.addEventListener(type, () => scheduleResumeReload());
+    });
+    resumeEventSource.onerror = () => {
+        // 浏览器会自动重连；连接被关闭（如登录失效）时丢弃，下次需要时重新订阅
+        if (resumeEventSource && resumeEventSource.readyState === EventSource.CLOSED) {
+            resumeEventSource = null;
+        }
+    };
+    return true;
+}
+
+function stopResumeEvents() {
+    if (resumeEventSource) {
+        resumeEventSource.close();
+        resumeEventSource = null;
+    }
+}
+
+// 批量上传时会连续收到多个完成事件，合并为一次列表刷新
+function scheduleResumeReload() {
+    if (resumeReloadTimer) {
+        return;
+    }
+    resumeReloadTimer = setTimeout(() => {
+        resumeReloadTimer = null;
+        const currentModule = document.querySelector('.module.active');
+        if (currentModule && currentModule.id === 'module-upload') {
+            loadResumes(currentPage);
+        }
+    }, 500);
+}
+
+// 根据解析事件就地更新列表中的状态单元格（不重新请求列表）
+function updateResumeStatusCell(event) {
+    const cell = document.querySelector(`#resumeTableBody tr[data-resume-id="${event.resume_id}"] .parse-status-cell`);
+    if (!cell) {
+        return;
+    }
+    if (event.status === 'queued') {
+        cell.innerHTML = '<span class="status-pending">待处理</span>';
+    } else {
+        const stageLabel = event.stage && STAGE_LABELS[event.stage] ? `（${STAGE_LABELS[event.stage]}）` : '';
+        cell.innerHTML = `<span class="status-processing">处理中${escapeHtml(stageLabel)}</span>`;
+    }
+}
+
 function getStatusIcon(status) {
     if (!status || status === '未校验') return '';
     
@@ -1159,6 +1291,7 @@ function getStatusIcon(status) {
 
 // 排序
 function sortTable(column) {
+    sortChosen = true;
     if (sortBy === column) {
         sortOrder = sortOrder === 'asc' ? 'desc' : 'asc';
     } else {
@@ -1241,6 +1374,28 @@ function viewDetail(id) {
         });
 }
 
+// 解析各阶段耗时（秒），与后端 metrics.STAGE_LABELS 对应
+const STAGE_LABELS = {
+    extract_text: '文本提取',
+    ai_optimize: 'AI文本优化',
+    ai_extract: 'AI信息提取',
+    ai_fused: 'AI单次解析',
+    rule_extract: '规则提取',
+    duplicate_check: '查重',
+    commit: '保存',
+    total: '总计'
+};
+
+function formatStageTimings(timings) {
+    if (!timings) {
+        return '';
+    }
+    return Object.keys(STAGE_LABELS)
+        .filter(stage => timings[stage] !== undefined)
+        .map(stage => `${STAGE_LABELS[stage]} ${Number(timings[stage]).toFixed(2)}s`)
+        .join(' / ');
+}
+
 function displayDetail(resume) {
     currentResumeData = resume;
     const modal = document.getElementById('detailModal');
@@ -1255,6 +1410,7 @@ function displayDetail(resume) {
         : '';
     const parseStatus = resume.parse_status || '-';
     const errorMessage = resume.error_message || '';
+    const stageTimingsText = formatStageTimings(resume.stage_timings);
     
     content.innerHTML = `
         <h3>编辑简历信息</h3>
@@ -1271,6 +1427,9 @@ function displayDetail(resume) {
             <label>解析时间
                 <input type="text" value="${escapeHtml(resume.parse_time || '')}" disabled>
             </label>
+            <label>解析耗时
+                <input type="text" value="${escapeHtml(stageTimingsText)}" title="${escapeHtml(stageTimingsText)}" disabled>
+            </label>
             <label>应聘岗位
                 <select id="editAppliedPosition" class="form-select">
                     <option value="">请选择岗位</option>
@@ -1970,43 +2129,35 @@ function exportSelected() {
 
 function exportAll() {
     if (confirm('确定要导出所有简历吗？')) {
-        // 获取所有简历ID
-        fetch(`/api/resumes?per_page=1000`)
-            .then(response => response.json())
-            .then(data => {
-                if (data.success && data.data.length > 0) {
-                    const ids = data.data.map(r => r.id);
-                    fetch('/api/export/batch', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({
-                            resume_ids: ids
-                        })
-                    })
-                    .then(response => {
-                        if (response.ok) {
-                            return response.blob();
-                        }
-                        throw new Error('导出失败');
-                    })
-                    .then(blob => {
-                        const url = window.URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.download = `简历全部导出_${new Date().toISOString().split('T')[0]}.xlsx`;
-                        a.click();
-                        window.URL.revokeObjectURL(url);
-                    })
-                    .catch(error => {
-                        console.error('Error:', error);
-                        alert('导出失败，请重试');
-                    });
-                } else {
-                    alert('没有可导出的简历');
-                }
+        fetch('/api/export/batch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                all: true
+            })
+        })
+        .then(response => {
+            if (response.ok) {
+                return response.blob();
+            }
+            return response.json().then(data => {
+                throw new Error(data.message || '导出失败');
             });
+        })
+        .then(blob => {
+            const url = window.URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = `简历全部导出_${new Date().toISOString().split('T')[0]}.xlsx`;
+            a.click();
+            window.URL.revokeObjectURL(url);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert(error.message === '没有可导出的简历' ? error.message : '导出失败，请重试');
+        });
     }
 }
 
@@ -2075,12 +2226,19 @@ function inviteInterview(resumeId) {
     });
 }
 
-// 加载面试流程列表
-function loadInterviews() {
+// 加载面试流程列表（append为true时在列表末尾追加下一页）
+function loadInterviews(append = false) {
     const tbody = document.getElementById('interviewTableBody');
     if (!tbody) return;
 
-    tbody.innerHTML = '<tr><td colspan="10" class="loading">加载中...</td></tr>';
+    const moreRow = document.getElementById('interviewLoadMoreRow');
+    if (append === true && moreRow) {
+        moreRow.innerHTML = '<td colspan="10" class="loading">加载中...</td>';
+    } else {
+        append = false;
+        interviewCursor = null;
+        tbody.innerHTML = '<tr><td colspan="10" class="loading">加载中...</td></tr>';
+    }
 
     const searchInput = document.getElementById('interviewSearchInput');
     const search = searchInput ? (searchInput.value || '').trim() : '';
@@ -2088,58 +2246,80 @@ function loadInterviews() {
     if (search) {
         params.append('search', search);
     }
+    if (append && interviewCursor) {
+        params.append('cursor', interviewCursor);
+    }
 
     fetch(`/api/interviews?${params.toString()}`)
         .then(response => response.json())
         .then(result => {
             if (result.success) {
                 const list = result.data || [];
-                if (list.length === 0) {
+                if (!append && list.length === 0) {
                     tbody.innerHTML = '<tr><td colspan="10" class="loading">暂无面试记录</td></tr>';
                     return;
                 }
-                tbody.innerHTML = list.map(item => {
-                    const isSelected = selectedInterviews.has(item.id);
-                    const identityCode = escapeHtml(item.identity_code || '-');
-                    const name = escapeHtml(item.name || '-');
-                    const position = escapeHtml(item.applied_position || '-');
-                    const status = escapeHtml(item.status || '待面试');
-                    const time = item.update_time ? escapeHtml(item.update_time.replace('T', ' ').slice(0, 19)) : '-';
-                    const score = item.match_score !== null && item.match_score !== undefined ? item.match_score : null;
-                    const level = escapeHtml(item.match_level || '');
-                    const color = getScoreColor(score);
-                    const scoreHtml = score !== null
-                        ? `<span class="match-score-dot" style="background:${color};"></span><span>${score}${level ? ' 分（' + level + '）' : ''}</span>`
-                        : '<span>-</span>';
-                    const hasRegistrationForm = item.registration_form_fill_date ? '已填写' : '未填写';
-                    const registrationFormStatus = item.registration_form_fill_date 
-                        ? `<span style="color: #28a745;">已填写</span>` 
-                        : `<span style="color: #999;">未填写</span>`;
-                    return `
-                        <tr>
-                            <td><input type="checkbox" value="${item.id}" ${isSelected ? 'checked' : ''} onchange="toggleInterview(${item.id}, this)"></td>
-                            <td>${identityCode}</td>
-                            <td>${name}</td>
-                            <td>${position}</td>
-                            <td>${scoreHtml}</td>
-                            <td>${status}</td>
-                            <td>${time}</td>
-                            <td>${escapeHtml(item.created_by || '-')}</td>
-                            <td><button class="btn btn-small btn-primary" onclick="openRegistrationFormModal(${item.id})">${hasRegistrationForm}</button></td>
-                            <td><button class="btn btn-small btn-primary" onclick="openInterviewModal(${item.id})">填写/查看</button></td>
-                        </tr>
-                    `;
-                }).join('');
+                interviewCursor = result.next_cursor || null;
+                const rowsHtml = list.map(renderInterviewRow).join('');
+                const loadMoreHtml = result.has_more
+                    ? `<tr id="interviewLoadMoreRow"><td colspan="10" class="loading"><button class="btn btn-small btn-secondary" onclick="loadInterviews(true)">加载更多（共 ${result.total} 条）</button></td></tr>`
+                    : '';
+                if (append) {
+                    const row = document.getElementById('interviewLoadMoreRow');
+                    if (row) row.remove();
+                    tbody.insertAdjacentHTML('beforeend', rowsHtml + loadMoreHtml);
+                } else {
+                    tbody.innerHTML = rowsHtml + loadMoreHtml;
+                }
+            } else if (append) {
+                const row = document.getElementById('interviewLoadMoreRow');
+                if (row) row.innerHTML = `<td colspan="10" class="loading">加载失败：${escapeHtml(result.message || '未知错误')}</td>`;
             } else {
                 tbody.innerHTML = `<tr><td colspan="10" class="loading">加载失败：${escapeHtml(result.message || '未知错误')}</td></tr>`;
             }
         })
         .catch(error => {
             console.error('加载面试流程失败:', error);
-            tbody.innerHTML = '<tr><td colspan="10" class="loading">加载失败，请稍后重试</td></tr>';
+            const row = append ? document.getElementById('interviewLoadMoreRow') : null;
+            if (row) {
+                row.innerHTML = '<td colspan="10" class="loading">加载失败，请稍后重试</td>';
+            } else {
+                tbody.innerHTML = '<tr><td colspan="10" class="loading">加载失败，请稍后重试</td></tr>';
+            }
         });
 }
 
+// 生成面试流程列表的一行
+function renderInterviewRow(item) {
+    const isSelected = selectedInterviews.has(item.id);
+    const identityCode = escapeHtml(item.identity_code || '-');
+    const name = escapeHtml(item.name || '-');
+    const position = escapeHtml(item.applied_position || '-');
+    const status = escapeHtml(item.status || '待面试');
+    const time = item.update_time ? escapeHtml(item.update_time.replace('T', ' ').slice(0, 19)) : '-';
+    const score = item.match_score !== null && item.match_score !== undefined ? item.match_score : null;
+    const level = escapeHtml(item.match_level || '');
+    const color = getScoreColor(score);
+    const scoreHtml = score !== null
+        ? `<span class="match-score-dot" style="background:${color};"></span><span>${score}${level ? ' 分（' + level + '）' : ''}</span>`
+        : '<span>-</span>';
+    const hasRegistrationForm = item.registration_form_fill_date ? '已填写' : '未填写';
+    return `
+        <tr>
+            <td><input type="checkbox" value="${item.id}" ${isSelected ? 'checked' : ''} onchange="toggleInterview(${item.id}, this)"></td>
+            <td>${identityCode}</td>
+            <td>${name}</td>
+            <td>${position}</td>
+            <td>${scoreHtml}</td>
+            <td>${status}</td>
+            <td>${time}</td>
+            <td>${escapeHtml(item.created_by || '-')}</td>
+            <td><button class="btn btn-small btn-primary" onclick="openRegistrationFormModal(${item.id})">${hasRegistrationForm}</button></td>
+            <td><button class="btn btn-small btn-primary" onclick="openInterviewModal(${item.id})">填写/查看</button></td>
+        </tr>
+    `;
+}
+
 // 面试流程选择/导出相关
 function toggleInterview(id, checkbox) {
     if (checkbox.checked) {
@@ -3566,8 +3746,11 @@ function switchModule(moduleName) {
     }
 }
 
-// 加载简历列表用于分析模块
-function loadResumesForAnalysis(searchTerm = '') {
+// 加载简历列表用于分析模块（append为true时在列表末尾追加下一页）
+let analysisResumeCursor = null;
+let analysisResumes = [];
+
+function loadResumesForAnalysis(searchTerm = '', append = false) {
     const listElement = document.getElementById('resumeSelectorList');
     if (!listElement) {
         console.warn('resumeSelectorList element not found');
@@ -3575,21 +3758,33 @@ function loadResumesForAnalysis(searchTerm = '') {
     }
     
     const params = new URLSearchParams({
-        page: 1,
-        per_page: 1000,
+        per_page: 50,
         sort_by: 'upload_time',
-        sort_order: 'desc'
+        sort_order: 'desc',
+        fields: 'id,name,phone,school,major,applied_position,parse_status'
     });
     
     if (searchTerm) {
         params.append('search', searchTerm);
     }
+    if (append === true && analysisResumeCursor) {
+        params.append('cursor', analysisResumeCursor);
+    } else {
+        append = false;
+    }
     
     fetch(`/api/resumes?${params}`)
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                displayResumeSelector(data.data);
+                analysisResumes = append ? analysisResumes.concat(data.data) : data.data;
+                analysisResumeCursor = data.next_cursor || null;
+                displayResumeSelector(analysisResumes);
+                if (analysisResumeCursor && analysisResumes.length > 0) {
+                    const term = JSON.stringify(searchTerm).replace(/"/g, '&quot;');
+                    listElement.insertAdjacentHTML('beforeend',
+                        `<div class="loading"><button class="btn btn-link btn-small" onclick="loadResumesForAnalysis(${term}, true)">加载更多（共 ${data.total} 份）</button></div>`);
+                }
             }
         })
         .catch(error => {
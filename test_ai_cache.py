@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试AI响应缓存：命中/未命中统计、过期、按总大小LRU淘汰、重启后保留，
+以及 AIExtractor 在缓存命中时不再请求接口、use_cache=False 时绕过缓存、只缓存调用方认可的回复
+使用临时缓存文件和本地桩服务器，不访问外部服务
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+from utils import ai_cache, ai_loop
+from utils.ai_cache import AIResponseCache, request_key
+from utils.ai_extractor import AIExtractor
+from utils.http_pool import close_sessions
+
+
+def test_hit_miss_and_persistence(tmp_path):
+    """命中率统计；关闭后重新打开仍能读到缓存"""
+    path = str(tmp_path / 'ai.db')
+    cache = AIResponseCache(path, ttl_seconds=3600, max_bytes=1024 * 1024)
+    key = request_key('https://api.example.com/v1/', 'deepseek-chat', 0.1, [{'role': 'user', 'content': '你好'}])
+    assert cache.get(key) is None
+    cache.put(key, '{"name": "张三"}')
+    assert cache.get(key) == '{"name": "张三"}'
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries'], stats['hit_rate']) == (1, 1, 1, 0.5)
+    cache.close()
+
+    reopened = AIResponseCache(path, ttl_seconds=3600, max_bytes=1024 * 1024)
+    assert reopened.get(key) == '{"name": "张三"}'
+    assert reopened.get_stats()['total_bytes'] == stats['total_bytes']
+    reopened.close()
+
+
+def test_key_depends_on_model_temperature_and_messages():
+    """模型、temperature、消息内容不同则缓存键不同；api_base 末尾的斜杠不影响"""
+    messages = [{'role': 'user', 'content': '简历'}]
+    key = request_key('https://api.example.com/v1', 'deepseek-chat', 0.1, messages)
+    assert key == request_key('https://api.example.com/v1/', 'deepseek-chat', 0.1, messages)
+    assert key != request_key('https://api.example.com/v1', 'qwen-plus', 0.1, messages)
+    assert key != request_key('https://api.example.com/v1', 'deepseek-chat', 0.7, messages)
+    assert key != request_key('https://api.example.com/v1', 'deepseek-chat', 0.1, [{'role': 'user', 'content': '简历2'}])
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    """超过过期时间的条目视为未命中并被删除"""
+    now = [1000.0]
+    monkeypatch.setattr(ai_cache.time, 'time', lambda: now[0])
+    cache = AIResponseCache(str(tmp_path / 'ai.db'), ttl_seconds=60, max_bytes=1024 * 1024)
+    cache.put('k', 'v')
+    now[0] += 59
+    assert cache.get('k') == 'v'
+    now[0] += 2
+    assert cache.get('k') is None
+    assert cache.get_stats()['entries'] == 0
+    cache.close()
+
+
+def test_lru_eviction_by_size(tmp_path, monkeypatch):
+    """超出总大小上限时淘汰最久未访问的条目"""
+    now = [1000.0]
+    monkeypatch.setattr(ai_cache.time, 'time', lambda: now[0])
+    cache = AIResponseCache(str(tmp_path / 'ai.db'), ttl_seconds=0, max_bytes=250)
+    for key in ('a', 'b'):
+        now[0] += 1
+        cache.put(key, key * 100)
+    now[0] += 1
+    assert cache.get('a') == 'a' * 100  # a 变为最近访问
+    now[0] += 1
+    cache.put('c', 'c' * 100)
+    assert cache.get('b') is None
+    assert cache.get('a') == 'a' * 100 and cache.get('c') == 'c' * 100
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1 and stats['total_bytes'] == 200
+    cache.close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests += 1
+        content = self.server.reply or f'回复{self.server.requests}'
+        body = json.dumps({'choices': [{'message': {'content': content}}]}, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _always(response):
+    return True
+
+
+def test_extractor_uses_cache(tmp_path, monkeypatch):
+    """相同提示词只请求一次接口；use_cache=False 时重新请求并更新缓存；协程版本共用缓存"""
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', True)
+    monkeypatch.setattr(ai_cache, '_cache', AIResponseCache(str(tmp_path / 'ai.db'), 3600, 1024 * 1024))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.requests = 0
+    server.reply = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        api_base = f'http://127.0.0.1:{server.server_address[1]}/v1'
+        extractor = AIExtractor(api_key='test-key', api_base=api_base, model='deepseek-chat')
+        assert extractor._call_ai_api('分析', accept=_always) == '回复1'
+        assert extractor._call_ai_api('分析', accept=_always) == '回复1'
+        assert ai_loop.run(extractor._call_ai_api_async('分析', accept=_always)) == '回复1'
+        assert server.requests == 1
+
+        assert extractor._call_ai_api('分析', use_cache=False, accept=_always) == '回复2'
+        assert extractor._call_ai_api('分析') == '回复2'
+        assert extractor._call_ai_api('另一个问题', accept=_always) == '回复3'
+        assert server.requests == 3
+        assert ai_cache.get_ai_cache().get_stats()['hits'] == 3
+
+        # 重新解析用的提取器不读缓存
+        refresh = AIExtractor(api_key='test-key', api_base=api_base, model='deepseek-chat', use_cache=False)
+        assert refresh._call_ai_api('分析', accept=_always) == '回复4'
+        assert server.requests == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+        close_sessions()
+        ai_cache._cache.close()
+
+
+def test_only_accepted_replies_are_cached(tmp_path, monkeypatch):
+    """拒答、无法解析的回复不写入缓存，下次重新请求；未提供 accept 的调用不写入缓存"""
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', True)
+    monkeypatch.setattr(ai_cache, '_cache', AIResponseCache(str(tmp_path / 'ai.db'), 3600, 1024 * 1024))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.requests = 0
+    server.reply = '抱歉，我无法处理这份简历'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        extractor = AIExtractor(api_key='test-key', api_base=f'http://127.0.0.1:{server.server_address[1]}/v1',
+                                model='deepseek-chat')
+        assert extractor.extract_with_ai('简历正文') is None
+        assert extractor.optimize_text_extraction('简历正文' * 20) == '抱歉，我无法处理这份简历'
+        extractor._call_ai_api('匹配分析')
+        assert ai_cache.get_ai_cache().get_stats()['entries'] == 0
+
+        server.reply = '{"name": "张三"}'
+        assert extractor.extract_with_ai('简历正文') == {'name': '张三'}
+        assert extractor.extract_with_ai('简历正文') == {'name': '张三'}
+        assert extractor._call_ai_api('匹配分析', accept=AIExtractor.has_json_object) == '{"name": "张三"}'
+        assert extractor._call_ai_api('匹配分析', accept=AIExtractor.has_json_object) == '{"name": "张三"}'
+        assert server.requests == 5
+        assert ai_cache.get_ai_cache().get_stats()['entries'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        close_sessions()
+        ai_cache._cache.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试单次调用的AI解析模式：一次请求同时返回修正片段和提取字段，修正在本地应用到原文；
+响应无法解析或文本过长时返回None，由调用方退回两次调用
+使用本地桩服务器，不访问外部服务
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import Config
+from utils import ai_loop
+from utils.ai_extractor import AIExtractor
+from utils.http_pool import close_sessions
+
+RAW_TEXT = '姓名：张三\n手机：13800000000\n邮箱：zhangsan@4q.com\n2019\n-\n2020 北京\n公司 销售主管'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        data = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        self.server.prompts.append(data['messages'][-1]['content'])
+        self.server.max_tokens.append(data.get('max_tokens'))
+        payload = json.dumps({'choices': [{'message': {'content': self.server.reply}}]}, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_extractor(monkeypatch):
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', False)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.prompts = []
+    server.max_tokens = []
+    server.reply = ''
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, AIExtractor(api_key='test-key', api_base=f'http://127.0.0.1:{server.server_address[1]}/v1',
+                              model='deepseek-chat')
+    server.shutdown()
+    server.server_close()
+    close_sessions()
+
+
+def test_apply_corrections():
+    """修正片段按原文匹配替换，原文中不存在的片段和格式不对的条目被忽略"""
+    corrections = [
+        {'original': '@4q.com', 'corrected': '@qq.com'},
+        {'original': '2019\n-\n2020', 'corrected': '2019-2020'},
+        {'original': '北京\n公司', 'corrected': '北京公司'},
+        {'original': '不存在的内容', 'corrected': '新增内容'},
+        {'original': '', 'corrected': 'x'},
+        '格式不对',
+    ]
+    assert AIExtractor._apply_corrections(RAW_TEXT, corrections) == \
+        '姓名：张三\n手机：13800000000\n邮箱：zhangsan@qq.com\n2019-2020 北京公司 销售主管'
+    assert AIExtractor._apply_corrections(RAW_TEXT, None) == RAW_TEXT
+
+
+def test_corrections_apply_once_against_original():
+    """出现多次的短片段不修正；片段按原文定位，不会匹配前面修正产生的文字；重叠的片段只采用靠前的"""
+    text = 'GPA 3.8 2O19-2O21 OCR工程师 0ffice'
+    corrections = [
+        {'original': 'O', 'corrected': '0'},  # 出现多次，忽略
+        {'original': '2O19-2O21', 'corrected': '2019-2021'},
+        {'original': '2019-2021 OCR', 'corrected': 'x'},  # 只在修正后的文字中出现，忽略
+        {'original': '0ffice', 'corrected': 'Office'},
+        {'original': 'ffice', 'corrected': 'FFICE'},  # 与上一处重叠，忽略
+    ]
+    assert AIExtractor._apply_corrections(text, corrections) == 'GPA 3.8 2019-2021 OCR工程师 Office'
+
+
+def test_fused_single_request(stub_extractor):
+    """一次请求返回修正后的文本和提取字段（同步和协程版本）"""
+    server, extractor = stub_extractor
+    server.reply = '```json\n' + json.dumps({
+        'name': '张三',
+        'phone': '13800000000',
+        'email': 'zhangsan@qq.com',
+        'work_experience': [{'company': '北京公司', 'position': '销售主管', 'start_year': 2019, 'end_year': 2020}],
+        'corrections': [{'original': '@4q.com', 'corrected': '@qq.com'}],
+    }, ensure_ascii=False) + '\n```'
+
+    text, info = extractor.optimize_and_extract(RAW_TEXT)
+    assert text == RAW_TEXT.replace('@4q.com', '@qq.com')
+    assert info['name'] == '张三' and info['email'] == 'zhangsan@qq.com'
+    assert 'corrections' not in info
+    assert len(server.prompts) == 1
+    assert '"corrections"' in server.prompts[0] and RAW_TEXT in server.prompts[0]
+    assert server.max_tokens[0] == AIExtractor.FUSED_MAX_TOKENS
+
+    text, info = ai_loop.run(extractor.optimize_and_extract_async(RAW_TEXT, is_word_file=True))
+    assert info['phone'] == '13800000000'
+    assert len(server.prompts) == 2
+
+
+def test_fused_falls_back(stub_extractor, monkeypatch):
+    """响应不是JSON时返回None；文本超过单次处理长度时不发请求直接返回None"""
+    server, extractor = stub_extractor
+    server.reply = '抱歉，我无法处理'
+    assert extractor.optimize_and_extract(RAW_TEXT) is None
+    assert len(server.prompts) == 1
+
+    monkeypatch.setattr(AIExtractor, 'OPTIMIZE_CHUNK_SIZE', 20)
+    assert extractor.optimize_and_extract(RAW_TEXT) is None
+    assert ai_loop.run(extractor.optimize_and_extract_async(RAW_TEXT)) is None
+    assert len(server.prompts) == 1
+
+
+def test_truncated_reply_not_cached(stub_extractor, tmp_path, monkeypatch):
+    """被截断（无法解析）的回复不写入缓存，下次重新请求；完整的回复写入缓存"""
+    from utils import ai_cache
+    from utils.ai_cache import AIResponseCache
+
+    server, extractor = stub_extractor
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', True)
+    monkeypatch.setattr(ai_cache, '_cache', AIResponseCache(str(tmp_path / 'ai.db'), 3600, 1024 * 1024))
+    try:
+        server.reply = '{"name": "张三", "corrections": [{"original": "@4q'
+        assert extractor.optimize_and_extract(RAW_TEXT) is None
+        server.reply = '{"name": "张三", "corrections": []}'
+        assert extractor.optimize_and_extract(RAW_TEXT) == (RAW_TEXT, {'name': '张三'})
+        assert extractor.optimize_and_extract(RAW_TEXT) == (RAW_TEXT, {'name': '张三'})
+        assert len(server.prompts) == 2
+    finally:
+        ai_cache._cache.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试AI接口HTTP连接池：同一 api_base 复用连接，429/5xx 退避重试，退避时间的上下限
+使用本地桩服务器，不访问外部服务
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import Config
+from utils.http_pool import post_json, get_session, close_sessions, backoff_delay
+from utils.ai_extractor import AIExtractor
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持 keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests += 1
+        if self.server.failures:
+            status = self.server.failures.pop(0)
+            body = b'{"error": "busy"}'
+        else:
+            status = 200
+            body = json.dumps({'choices': [{'message': {'content': '优化后的文本'}}]}, ensure_ascii=False).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', False)  # 每次调用都要到达服务器
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.connections = 0
+    server.requests = 0
+    server.failures = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+    server.shutdown()
+    server.server_close()
+    close_sessions()
+
+
+def test_connections_are_reused(stub_server):
+    """同一 api_base 的多次调用共用一个会话和一条连接"""
+    server, api_base = stub_server
+    extractor = AIExtractor(api_key='test-key', api_base=api_base, model='deepseek-chat')
+    for _ in range(5):
+        assert extractor._call_ai_api('你好') == '优化后的文本'
+    assert server.requests == 5
+    assert server.connections == 1
+    assert get_session(api_base) is get_session(api_base + '/')
+
+
+def test_retries_on_429_and_5xx(stub_server):
+    """429/5xx 时退避重试，重试用尽后返回最后一次响应"""
+    server, api_base = stub_server
+    delays = []
+    server.failures = [429, 503]
+    response = post_json(api_base, f'{api_base}/chat/completions', {}, {'a': 1}, max_retries=2, sleep=delays.append)
+    assert response.status_code == 200
+    assert server.requests == 3
+    assert len(delays) == 2
+
+    server.failures = [500, 500, 500]
+    response = post_json(api_base, f'{api_base}/chat/completions', {}, {'a': 1}, max_retries=1, sleep=delays.append)
+    assert response.status_code == 500
+    assert server.requests == 5
+
+    server.failures = [400]
+    response = post_json(api_base, f'{api_base}/chat/completions', {}, {'a': 1}, max_retries=3, sleep=delays.append)
+    assert response.status_code == 400
+    assert server.requests == 6
+
+
+def test_backoff_delay_bounds():
+    """退避时间在 [0, min(上限, 基数*2^n)] 内随机，Retry-After 作为下限"""
+    for attempt in range(6):
+        delay = backoff_delay(attempt, 1.0, 8.0)
+        assert 0 <= delay <= min(8.0, 2 ** attempt)
+    assert backoff_delay(0, 1.0, 8.0, retry_after=5) >= 5
+    assert backoff_delay(0, 1.0, 8.0, retry_after=60) <= 8.0
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试AI请求限流与协程版本的AI调用：并发上限（线程与协程共用）、令牌桶速率、取消等待后名额归还，
+以及大量简历的AI请求经事件循环发送时，服务端看到的并发数不超过上限
+使用本地桩服务器，不访问外部服务
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import Config
+from utils import ai_loop
+from utils.ai_extractor import AIExtractor
+from utils.ai_limiter import ProviderLimiter
+from utils.http_pool import close_sessions
+
+
+class _Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+def test_concurrency_shared_by_threads_and_coroutines():
+    """线程和协程共用并发名额，同时进行的请求数不超过上限"""
+    limiter = ProviderLimiter(max_concurrency=2)
+    tracker = _Tracker()
+
+    def sync_call():
+        with limiter.slot(), tracker:
+            time.sleep(0.02)
+
+    async def async_call():
+        async with limiter.slot_async():
+            with tracker:
+                await asyncio.sleep(0.02)
+
+    async def run_coroutines():
+        await asyncio.gather(*[async_call() for _ in range(15)])
+
+    threads = [threading.Thread(target=sync_call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(run_coroutines())
+    for thread in threads:
+        thread.join()
+    assert tracker.peak == 2
+    assert limiter.in_flight == 0 and limiter.waiting == 0
+    assert limiter.total == 20
+
+
+def test_token_bucket_rate():
+    """令牌桶：突发用完后按速率放行"""
+    limiter = ProviderLimiter(max_concurrency=10, rate=20, burst=2)
+    started = time.monotonic()
+    for _ in range(8):
+        with limiter.slot():
+            pass
+    # 前2个立即放行，其余6个间隔 1/20 秒
+    assert time.monotonic() - started >= 0.25
+
+
+def test_cancelled_waiter_returns_slot():
+    """等待名额时被取消的协程不占用名额"""
+    limiter = ProviderLimiter(max_concurrency=1)
+
+    async def scenario():
+        await limiter.acquire_async()
+        waiter = asyncio.create_task(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        async with limiter.slot_async():
+            assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 0 and limiter.waiting == 0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.tracker:
+            time.sleep(0.05)
+        body = json.dumps({'choices': [{'message': {'content': '{"name": "张三", "phone": "13800000000"}'}}]},
+                          ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_async_extraction_respects_provider_limit(monkeypatch):
+    """40份简历的AI提取在事件循环中并发执行，服务端同时处理的请求数不超过服务商并发上限"""
+    monkeypatch.setattr(Config, 'AI_PROVIDER_MAX_CONCURRENCY', 3)
+    monkeypatch.setattr(Config, 'AI_PROVIDER_RATE', 0)
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', False)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.tracker = _Tracker()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        extractor = AIExtractor(api_key='test-key', api_base=f'http://127.0.0.1:{server.server_address[1]}/v1',
+                                model='deepseek-chat')
+
+        async def extract_all():
+            return await asyncio.gather(*[extractor.extract_with_ai_async(f'简历{i}') for i in range(40)])
+
+        started = time.monotonic()
+        results = ai_loop.run(extract_all(), timeout=60)
+        elapsed = time.monotonic() - started
+        assert all(result and result.get('name') == '张三' for result in results)
+        assert server.tracker.peak == 3
+        # 3个并发、每个请求50ms：约0.7秒，串行需要2秒
+        assert elapsed < 1.8
+        assert ai_loop.run(extractor.optimize_text_extraction_async('简历正文')) is not None
+    finally:
+        server.shutdown()
+        server.server_close()
+        close_sessions()
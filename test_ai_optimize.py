@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试长文本AI优化的分段：断在段落/行边界、相邻段上下文、按原顺序拼接，
+以及各段并行优化（同步和协程版本）时同时进行的请求数不超过并行段数
+使用本地桩服务器，不访问外部服务
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import Config
+from utils import ai_loop
+from utils.ai_extractor import AIExtractor
+from utils.http_pool import close_sessions
+
+LINES = [f'第{i}行：2019-2020 北京某某公司 销售主管。' for i in range(60)]
+TEXT = '\n'.join(LINES[:30]) + '\n\n' + '\n'.join(LINES[30:])
+
+
+def test_split_on_line_boundaries(monkeypatch):
+    """各段不超过长度上限、断在行末，拼接后与原文完全相同"""
+    monkeypatch.setattr(AIExtractor, 'OPTIMIZE_CHUNK_SIZE', 300)
+    extractor = AIExtractor(api_key='test-key', model='deepseek-chat')
+    parts = extractor._split_for_optimize(TEXT)
+    assert len(parts) > 3
+    assert ''.join(parts) == TEXT
+    assert all(len(part) <= 300 for part in parts)
+    assert all(part.endswith('\n') for part in parts[:-1])
+
+    # 没有换行的长文本断在句末
+    sentences = '这是一句话。' * 100
+    parts = extractor._split_for_optimize(sentences)
+    assert ''.join(parts) == sentences
+    assert all(part.endswith('。') for part in parts)
+
+
+def test_chunks_carry_neighbour_context(monkeypatch):
+    """每段附带前后相邻段的完整行作为上下文，首段没有上文、末段没有下文"""
+    monkeypatch.setattr(AIExtractor, 'OPTIMIZE_CHUNK_SIZE', 300)
+    monkeypatch.setattr(AIExtractor, 'OPTIMIZE_CHUNK_OVERLAP', 60)
+    extractor = AIExtractor(api_key='test-key', model='deepseek-chat')
+    parts = extractor._split_for_optimize(TEXT)
+    chunks = extractor._optimize_chunks(parts)
+    assert chunks[0][1] == '' and chunks[-1][2] == ''
+    for i in range(1, len(chunks)):
+        assert chunks[i][1] and parts[i - 1].endswith(chunks[i][1])
+        assert chunks[i - 1][2] and parts[i].startswith(chunks[i - 1][2])
+    assert '上文（不要输出）' in extractor._build_optimize_prompt(*chunks[1])
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """返回提示词中"原始文本"部分加标记，记录同时处理的请求数"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        data = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        prompt = data['messages'][-1]['content']
+        body = prompt.split('原始文本：\n', 1)[1].rsplit('\n\n请只返回优化后的文本', 1)[0]
+        with self.server.lock:
+            self.server.current += 1
+            self.server.peak = max(self.server.peak, self.server.current)
+        time.sleep(0.1)
+        with self.server.lock:
+            self.server.current -= 1
+        content = '\n'.join(f'[{line}]' for line in body.strip().split('\n'))
+        payload = json.dumps({'choices': [{'message': {'content': content}}]}, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_extractor(monkeypatch):
+    monkeypatch.setattr(Config, 'AI_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'AI_PROVIDER_MAX_CONCURRENCY', 10)
+    monkeypatch.setattr(Config, 'AI_PROVIDER_RATE', 0)
+    monkeypatch.setattr(Config, 'AI_OPTIMIZE_PARALLEL_CHUNKS', 3)
+    monkeypatch.setattr(AIExtractor, 'OPTIMIZE_CHUNK_SIZE', 300)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.current = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # 每个测试使用新的端口，限流器按新的配置创建
+    yield server, AIExtractor(api_key='test-key', api_base=f'http://127.0.0.1:{server.server_address[1]}/v1',
+                              model='deepseek-chat')
+    server.shutdown()
+    server.server_close()
+    close_sessions()
+
+
+def _expected():
+    return '\n'.join(f'[{line}]' if line else '' for line in TEXT.split('\n'))
+
+
+def test_parallel_optimize_keeps_order(stub_extractor):
+    """同步版本：各段并行优化，结果按原顺序拼接，保留段落空行"""
+    server, extractor = stub_extractor
+    chunk_count = len(extractor._split_for_optimize(TEXT))
+    started = time.monotonic()
+    assert extractor.optimize_text_extraction(TEXT) == _expected()
+    elapsed = time.monotonic() - started
+    assert server.peak == 3
+    # 每段100ms：并行3段约 ceil(n/3)*0.1 秒，串行需要 n*0.1 秒
+    assert elapsed < chunk_count * 0.1 * 0.7
+
+
+def test_parallel_optimize_async(stub_extractor):
+    """协程版本：同样按原顺序拼接，同时进行的请求数不超过并行段数"""
+    server, extractor = stub_extractor
+    assert ai_loop.run(extractor.optimize_text_extraction_async(TEXT), timeout=30) == _expected()
+    assert server.peak == 3
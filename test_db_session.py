@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试请求作用域的数据库会话与连接池统计
+"""
+import threading
+
+from flask import Flask
+
+from metrics import db_pool_metrics
+from models import get_db_session, remove_request_session, User
+
+
+def _make_app():
+    app = Flask(__name__)
+    app.teardown_appcontext(remove_request_session)
+    return app
+
+
+def test_request_shares_one_session_and_releases_connection():
+    """同一请求内共用一个会话，嵌套的 close() 不关闭会话，请求结束后连接归还连接池"""
+    app = _make_app()
+    checked_out_before = db_pool_metrics.snapshot()['checked_out']
+    with app.test_request_context('/'):
+        db = get_db_session()
+        user = db.query(User).first()
+        inner = get_db_session()
+        assert inner is db
+        inner.close()
+        if user is not None:
+            assert user in db  # 外层加载的对象仍然属于该会话
+        assert db.users == 1
+    assert db.users == 0
+    assert db_pool_metrics.snapshot()['checked_out'] == checked_out_before
+
+
+def test_background_threads_get_independent_sessions():
+    """没有应用上下文的线程每次获取新的会话"""
+    sessions = []
+
+    def worker():
+        db = get_db_session()
+        sessions.append(db)
+        db.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sessions[0] is not sessions[1]
+
+
+def test_pool_metrics_prometheus_output():
+    """连接池指标包含借出次数和持有时长直方图"""
+    db = get_db_session()
+    db.query(User).count()
+    db.close()
+    text = '\n'.join(db_pool_metrics.render_prometheus())
+    assert 'db_pool_checkouts_total' in text
+    assert 'db_pool_hold_seconds_bucket{le="+Inf"}' in text
+    assert db_pool_metrics.snapshot()['checkouts'] > 0
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历查重（身份键归一化、按索引查找候选简历）
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import Config
+from models import Base, Resume
+from utils.duplicate_checker import identity_keys, load_duplicate_candidates, check_duplicate
+
+
+def _make_session():
+    db_path = os.path.join(tempfile.mkdtemp(), 'duplicate_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _add(db, **fields):
+    fields.setdefault('parse_status', 'success')
+    resume = Resume(file_name='r.pdf', file_path='/tmp/r.pdf', **fields)
+    db.add(resume)
+    db.commit()
+    return resume
+
+
+def test_identity_keys_normalization():
+    """手机号只保留数字，邮箱小写，姓名去除空白"""
+    keys = identity_keys(' 张 三 ', '+86 138-0013-8000', 'ZhangSan@QQ.com ')
+    assert keys == {
+        'phone_key': '8613800138000',
+        'phone_tail': '0138000',
+        'email_key': 'zhangsan@qq.com',
+        'email_local': 'zhangsan',
+        'name_key': '张三',
+    }
+    assert identity_keys(None, None, None) == dict.fromkeys(keys)
+
+
+def test_candidates_share_an_identity_key(monkeypatch):
+    """只返回共享身份键的已解析简历，查重结果与全表扫描一致"""
+    db = _make_session()
+    same_phone = _add(db, name='张三', phone='13800138000', email='zs@qq.com')
+    same_email_local = _add(db, name='张小三', email='ZS@163.com')
+    _add(db, name='李四', phone='13900139000', email='lisi@qq.com')
+    _add(db, name='张三', phone='13800138000', parse_status='pending')
+
+    new_resume = _add(db, name='张三', phone='+86 138 0013 8000', email='zs@qq.com', parse_status='processing')
+    candidates = load_duplicate_candidates(db, new_resume)
+    assert {r.id for r in candidates} == {same_phone.id, same_email_local.id}
+
+    indexed_result = check_duplicate(new_resume, candidates)
+    monkeypatch.setattr(Config, 'DUPLICATE_FULL_SCAN', True)
+    full_scan = load_duplicate_candidates(db, new_resume)
+    assert len(full_scan) == 3
+    assert check_duplicate(new_resume, full_scan) == indexed_result
+    assert indexed_result[0] == same_phone.id
+
+
+def test_strong_keys_not_cut_by_candidate_limit(monkeypatch):
+    """常见姓名的候选超过上限时，手机号相同的简历仍在候选中"""
+    monkeypatch.setattr(Config, 'DUPLICATE_MAX_CANDIDATES', 3)
+    db = _make_session()
+    same_phone = _add(db, name='张伟', phone='13800138000')
+    namesakes = [_add(db, name='张伟', phone=f'1390013{i:04d}') for i in range(6)]
+
+    new_resume = _add(db, name='张伟', phone='13800138000', parse_status='processing')
+    candidates = load_duplicate_candidates(db, new_resume)
+    assert candidates[0].id == same_phone.id
+    # 同名简历按上限取最近上传的
+    assert [r.id for r in candidates[1:]] == [r.id for r in namesakes[::-1][:3]]
+
+
+def test_keys_follow_updates():
+    """修改手机号后身份键同步更新"""
+    db = _make_session()
+    resume = _add(db, name='王五', phone='13700137000')
+    resume.phone = '13600136000'
+    db.commit()
+    assert db.query(Resume).filter(Resume.phone_tail == '0136000').one().id == resume.id
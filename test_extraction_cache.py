@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历提取结果缓存（命中统计、LRU淘汰）
+"""
+import os
+import tempfile
+
+from utils.extraction_cache import ExtractionCache, extract_with_cache
+
+
+def test_hit_miss_and_lru_eviction():
+    """超过容量时淘汰最久未使用的条目"""
+    directory = tempfile.mkdtemp()
+    cache = ExtractionCache(directory, max_bytes=300)
+
+    cache.put('a', 'A' * 80)
+    cache.put('b', 'B' * 80)
+    assert cache.get('a')['text'] == 'A' * 80  # a 变为最近使用
+    cache.put('c', 'C' * 80)                   # 超出容量，淘汰 b
+
+    assert cache.get('b') is None
+    assert cache.get('c')['info'] is None
+    stats = cache.get_stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 2 and stats['misses'] == 1
+
+    # 重启后按文件修改时间恢复索引
+    assert ExtractionCache(directory, max_bytes=300).get_stats()['entries'] == 2
+
+
+def test_extract_with_cache_skips_extraction_on_hit():
+    """相同文件第二次解析直接使用缓存"""
+    path = os.path.join(tempfile.mkdtemp(), 'resume.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('张三 13800138000')
+    cache = ExtractionCache(tempfile.mkdtemp(), max_bytes=1024 * 1024)
+    calls = []
+
+    def extract_text(file_path):
+        calls.append('text')
+        return '张三 13800138000'
+
+    def extract_info(text):
+        calls.append('info')
+        return {'name': '张三'}
+
+    first = extract_with_cache(path, 'test', extract_text, extract_info, cache=cache)
+    second = extract_with_cache(path, 'test', extract_text, extract_info, cache=cache)
+    assert first == second == ('张三 13800138000', {'name': '张三'})
+    assert calls == ['text', 'info']
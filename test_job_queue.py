@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历解析任务队列（FIFO、背压、重启恢复）
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, ParseJob
+from job_queue import ParseJobQueue, QueueFullError
+
+
+def _make_session_factory():
+    db_path = os.path.join(tempfile.mkdtemp(), 'queue_test.db')
+    engine = create_engine(f'sqlite:///{db_path}', connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _create_resumes(session_factory, count):
+    db = session_factory()
+    try:
+        resumes = [Resume(file_name=f'queue_test_{i}.pdf', file_path=f'/tmp/queue_test_{i}.pdf',
+                          parse_status='pending') for i in range(count)]
+        db.add_all(resumes)
+        db.commit()
+        return [r.id for r in resumes]
+    finally:
+        db.close()
+
+
+def test_fifo_and_backpressure():
+    """单工作线程按提交顺序处理，排队满时拒绝提交"""
+    session_factory = _make_session_factory()
+    resume_ids = _create_resumes(session_factory, 3)
+    handled = []
+    done = threading.Event()
+
+    def handler(resume_id, file_path):
+        handled.append(resume_id)
+        if len(handled) == 2:
+            done.set()
+
+    queue = ParseJobQueue(handler, max_workers=1, max_pending=2, poll_interval=0.1,
+                          session_factory=session_factory)
+    queue.submit(resume_ids[0], '/tmp/a.pdf')
+    queue.submit(resume_ids[1], '/tmp/b.pdf')
+    try:
+        queue.submit(resume_ids[2], '/tmp/c.pdf')
+        assert False, '排队已满时应拒绝提交'
+    except QueueFullError:
+        pass
+
+    queue.start()
+    assert done.wait(timeout=10)
+    assert handled == resume_ids[:2]
+
+    time.sleep(0.3)
+    stats = queue.get_stats()
+    assert stats['jobs']['success'] == 2
+    assert stats['jobs']['pending'] == 0
+
+
+def test_suspended_jobs_release_workers():
+    """处理函数返回 Future 时工作线程不等待：单个工作线程可同时挂起多个任务（不超过 max_in_flight），
+    Future 完成后由工作线程继续执行后续步骤并记录结果"""
+    session_factory = _make_session_factory()
+    resume_ids = _create_resumes(session_factory, 5)
+    futures = {}
+    finished = []
+    suspended = threading.Event()
+    done = threading.Event()
+
+    def handler(resume_id, file_path):
+        future = Future()
+        futures[resume_id] = future
+        if len(futures) == 3:
+            suspended.set()
+        return future
+
+    def finish(resume_id):
+        finished.append((resume_id, threading.current_thread().name))
+        if resume_id == resume_ids[1]:
+            raise ValueError('写库失败')
+        if len(finished) == 5:
+            done.set()
+
+    queue = ParseJobQueue(handler, max_workers=1, max_in_flight=3, poll_interval=0.1,
+                          session_factory=session_factory)
+    for resume_id in resume_ids:
+        queue.submit(resume_id, '/tmp/a.pdf')
+    queue.start()
+
+    assert suspended.wait(timeout=10)
+    time.sleep(0.3)
+    assert len(futures) == 3 and queue.get_stats()['in_flight'] == 3
+
+    # 完成挂起的任务后释放名额，剩下的任务被领取
+    for resume_id in resume_ids:
+        deadline = time.time() + 10
+        while resume_id not in futures and time.time() < deadline:
+            time.sleep(0.05)
+        futures[resume_id].set_result(lambda resume_id=resume_id: finish(resume_id))
+    assert done.wait(timeout=10)
+    assert all(name == 'parse-worker-1' for _, name in finished)
+
+    # 最后一个任务的结果在 finish 返回后才写入
+    deadline = time.time() + 10
+    while queue.get_stats()['in_flight'] and time.time() < deadline:
+        time.sleep(0.05)
+    stats = queue.get_stats()
+    assert stats['jobs']['success'] == 4 and stats['jobs']['failed'] == 1
+    assert stats['in_flight'] == 0
+
+
+def test_recover_interrupted_jobs():
+    """重启时 processing 任务重置为 pending，超过重试次数的标记失败"""
+    session_factory = _make_session_factory()
+    resume_ids = _create_resumes(session_factory, 2)
+    db = session_factory()
+    try:
+        db.add(ParseJob(resume_id=resume_ids[0], file_path='/tmp/a.pdf', status='processing', attempts=1))
+        db.add(ParseJob(resume_id=resume_ids[1], file_path='/tmp/b.pdf', status='processing',
+                        attempts=ParseJobQueue.MAX_ATTEMPTS))
+        db.commit()
+    finally:
+        db.close()
+
+    queue = ParseJobQueue(lambda resume_id, file_path: None, session_factory=session_factory)
+    assert queue.recover() == 1
+
+    db = session_factory()
+    try:
+        jobs = {job.resume_id: job for job in db.query(ParseJob).all()}
+        resumes = {r.id: r for r in db.query(Resume).all()}
+        assert jobs[resume_ids[0]].status == 'pending'
+        assert jobs[resume_ids[1]].status == 'failed'
+        assert resumes[resume_ids[0]].parse_status == 'pending'
+        assert resumes[resume_ids[1]].parse_status == 'failed'
+    finally:
+        db.close()
+
+
+def test_claim_is_exclusive_across_queues():
+    """两个队列（相当于两个进程，各自的进程内锁互不约束）同时领取，每个任务只被领取一次"""
+    session_factory = _make_session_factory()
+    resume_ids = _create_resumes(session_factory, 30)
+    queues = [ParseJobQueue(lambda resume_id, file_path: None, session_factory=session_factory)
+              for _ in range(2)]
+    for resume_id in resume_ids:
+        queues[0].submit(resume_id, '/tmp/a.pdf')
+
+    claimed = []
+
+    def claim_all(queue):
+        while True:
+            job = queue._claim_next()
+            if job is None:
+                return
+            claimed.append(job[0])
+
+    threads = [threading.Thread(target=claim_all, args=(queue,)) for queue in queues * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert len(claimed) == 30 and len(set(claimed)) == 30
+    db = session_factory()
+    try:
+        assert all(job.status == 'processing' and job.attempts == 1 for job in db.query(ParseJob).all())
+    finally:
+        db.close()
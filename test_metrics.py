@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历解析阶段耗时统计（直方图、分位数、失败计数、Prometheus输出）
+"""
+import pytest
+
+from metrics import StageMetrics, StageTimer
+
+
+def test_stage_timer_records_timings_and_failures():
+    """每个阶段的耗时写入本次记录和全局直方图，异常计为失败"""
+    metrics = StageMetrics('test_stage', '测试')
+    timer = StageTimer(metrics)
+    with timer.stage('extract_text'):
+        pass
+    with pytest.raises(ValueError):
+        with timer.stage('ai_extract'):
+            raise ValueError('boom')
+    timings = timer.finish(failed=True)
+
+    assert set(timings) == {'extract_text', 'ai_extract', 'total'}
+    summary = metrics.get_summary()
+    assert summary['ai_extract']['failures'] == 1
+    assert summary['extract_text']['failures'] == 0
+    assert summary['total']['count'] == 1
+
+
+def test_total_observed_once():
+    """先计算耗时随结果提交、提交失败后再记为失败时，total 只计数一次"""
+    metrics = StageMetrics('test_stage', '测试')
+    timer = StageTimer(metrics)
+    assert 'total' in timer.finish(observe=False)
+    assert 'total' not in metrics.get_summary()
+    timer.finish(failed=True)
+    timer.finish()
+    summary = metrics.get_summary()['total']
+    assert summary['count'] == 1 and summary['failures'] == 1
+
+
+def test_quantiles_and_prometheus_format():
+    """分位数基于最近样本，Prometheus直方图分桶为累计计数"""
+    metrics = StageMetrics('test_stage', '测试')
+    for i in range(1, 101):
+        metrics.observe('rule_extract', i / 100)
+
+    summary = metrics.get_summary()['rule_extract']
+    assert summary['p50'] == pytest.approx(0.51)
+    assert summary['p99'] == pytest.approx(1.0)
+
+    lines = metrics.render_prometheus()
+    assert '# TYPE test_stage_seconds histogram' in lines
+    assert 'test_stage_seconds_bucket{stage="rule_extract",le="0.5"} 50' in lines
+    assert 'test_stage_seconds_bucket{stage="rule_extract",le="+Inf"} 100' in lines
+    assert 'test_stage_seconds_count{stage="rule_extract"} 100' in lines
+    assert 'test_stage_failures_total{stage="rule_extract"} 0' in lines
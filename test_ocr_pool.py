@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试OCR工作池（按页顺序返回、自适应DPI、单文档时限）
+"""
+import time
+
+import fitz
+
+from config import Config
+from utils import ocr_pool
+
+
+def _make_doc(page_count, width=595, height=842):
+    doc = fitz.open()
+    for _ in range(page_count):
+        doc.new_page(width=width, height=height)
+    return doc
+
+
+def test_results_keep_page_order(monkeypatch):
+    """后面的页面先识别完成，结果仍按页码顺序返回"""
+    def fake_ocr(img, deadline):
+        time.sleep(0.05 * (4 - img.info['page']))
+        return f"第{img.info['page']}页内容"
+
+    page_counter = iter(range(1, 100))
+    render = ocr_pool.render_page_image
+
+    def tagged_render(page):
+        img = render(page)
+        img.info['page'] = next(page_counter)
+        return img
+
+    monkeypatch.setattr(ocr_pool, 'OCR_AVAILABLE', True)
+    monkeypatch.setattr(ocr_pool, '_ocr_image', fake_ocr)
+    monkeypatch.setattr(ocr_pool, 'render_page_image', tagged_render)
+    pages = ocr_pool.ocr_document(_make_doc(3), time_budget=10)
+    assert [p['text'] for p in pages] == ['第1页内容', '第2页内容', '第3页内容']
+
+
+def test_time_budget_returns_partial_result(monkeypatch):
+    """超出单文档时限的页面返回空文本，不阻塞调用方"""
+    def slow_ocr(img, deadline):
+        time.sleep(1)
+        return '内容'
+
+    monkeypatch.setattr(ocr_pool, 'OCR_AVAILABLE', True)
+    monkeypatch.setattr(ocr_pool, '_ocr_image', slow_ocr)
+    started = time.monotonic()
+    pages = ocr_pool.ocr_document(_make_doc(2), time_budget=0.2)
+    assert time.monotonic() - started < 0.9
+    assert [p['page'] for p in pages] == [1, 2]
+    assert all(p['text'] == '' for p in pages)
+
+
+def test_zoom_adapts_to_page_size():
+    """普通页面按目标DPI渲染，超大页面降低放大倍数控制像素数"""
+    assert ocr_pool.page_zoom(595, 842) == Config.OCR_TARGET_DPI / 72.0
+    zoom = ocr_pool.page_zoom(595 * 4, 842 * 4)
+    assert (595 * 4 * zoom) * (842 * 4 * zoom) <= Config.OCR_MAX_PIXELS * 1.001
+
+
+def test_tessdata_path(monkeypatch, tmp_path):
+    """优先使用配置的语言数据目录，否则选用系统语言包目录中版本最高的一个"""
+    monkeypatch.setattr(Config, 'OCR_TESSDATA_PATH', '/opt/tessdata')
+    assert ocr_pool.tessdata_path() == '/opt/tessdata'
+
+    for version in ('4.00', '5'):
+        (tmp_path / version / 'tessdata').mkdir(parents=True)
+    monkeypatch.setattr(Config, 'OCR_TESSDATA_PATH', '')
+    monkeypatch.setattr(ocr_pool, '_SYSTEM_TESSDATA_PATTERNS', (str(tmp_path / '*' / 'tessdata'),))
+    assert ocr_pool.tessdata_path() == str(tmp_path / '5' / 'tessdata')
+    monkeypatch.setattr(ocr_pool, '_SYSTEM_TESSDATA_PATTERNS', ())
+    assert ocr_pool.tessdata_path() is None
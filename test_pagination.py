@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试列表游标分页（逐页读取不重复、不遗漏，排序列含NULL，游标校验）、总数缓存和列表精简字段
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, load_only
+
+from models import Base, Resume, RESUME_LIST_FIELDS, RESUME_SORT_FIELDS, EARLIEST_WORK_YEAR_BACKFILL, \
+    resume_list_columns
+from utils.pagination import keyset_page, encode_cursor, decode_cursor, clamp_page_size, CountCache, CursorError
+
+
+def _make_session():
+    db_path = os.path.join(tempfile.mkdtemp(), 'pagination_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _seed(db):
+    base = datetime(2024, 1, 1)
+    for i in range(23):
+        # 上传时间有重复值，年龄部分为空
+        db.add(Resume(file_name=f'r{i}.pdf', file_path='/tmp/r.pdf', name=f'候选人{i}',
+                      upload_time=base + timedelta(days=i // 3), age=None if i % 4 == 0 else 20 + i % 7))
+    db.commit()
+
+
+def _read_all(db, column, descending, per_page=5):
+    ids, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(db.query(Resume), column, Resume.id, descending, cursor, per_page,
+                                   f'{column.key}:{descending}')
+        ids.extend(r.id for r in rows)
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize('attr', ['upload_time', 'age'])
+@pytest.mark.parametrize('descending', [True, False])
+def test_keyset_pages_match_full_ordering(attr, descending):
+    """逐页读取的结果与一次性排序完全一致（排序值重复、含NULL）"""
+    db = _make_session()
+    _seed(db)
+    column = getattr(Resume, attr)
+    order = (column.desc(), Resume.id.desc()) if descending else (column.asc(), Resume.id.asc())
+    expected = [r.id for r in db.query(Resume).order_by(*order).all()]
+    assert _read_all(db, column, descending) == expected
+
+
+def test_offset_jump_then_cursor():
+    """没有游标时按偏移跳页，返回的游标可继续向后翻页"""
+    db = _make_session()
+    _seed(db)
+    expected = [r.id for r in db.query(Resume).order_by(Resume.upload_time.desc(), Resume.id.desc()).all()]
+    rows, cursor = keyset_page(db.query(Resume), Resume.upload_time, Resume.id, True, None, 5, 'u', offset=10)
+    assert [r.id for r in rows] == expected[10:15]
+    rows, _ = keyset_page(db.query(Resume), Resume.upload_time, Resume.id, True, cursor, 5, 'u')
+    assert [r.id for r in rows] == expected[15:20]
+
+
+def test_cursor_validation():
+    """被篡改或与当前排序不一致的游标报错"""
+    db = _make_session()
+    _seed(db)
+    with pytest.raises(CursorError):
+        decode_cursor('not-a-cursor!')
+    cursor = encode_cursor({'s': 'upload_time:desc', 'k': ['2024-01-02T00:00:00', 5]})
+    with pytest.raises(CursorError):
+        keyset_page(db.query(Resume), Resume.age, Resume.id, True, cursor, 5, 'age:desc')
+    assert clamp_page_size(None, 10, 200) == 10
+    assert clamp_page_size(5000, 10, 200) == 200
+
+
+def test_count_cache():
+    """有效期内复用总数，clear() 后重新计数"""
+    calls = []
+    cache = CountCache(ttl=60)
+    count = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_count('a', count) == 1
+    assert cache.get_or_count('a', count) == 1
+    assert cache.get_or_count('b', count) == 2
+    cache.clear()
+    assert cache.get_or_count('a', count) == 3
+    assert CountCache(ttl=0).get_or_count('a', lambda: 7) == 7
+
+
+def test_summary_projection_skips_raw_text():
+    """列表只读取精简字段，不加载简历正文和工作经历；最早工作年份在保存时从工作经历算出"""
+    db = _make_session()
+    db.add(Resume(file_name='r.pdf', file_path='/tmp/r.pdf', name='张三', raw_text='正文' * 1000,
+                  work_experience=[{'company': 'A', 'start_year': 2015}, {'company': 'B', 'start_year': 2012}]))
+    db.commit()
+    db.expunge_all()
+
+    resume = db.query(Resume).options(load_only(*resume_list_columns())).one()
+    data = resume.to_summary_dict()
+    assert tuple(data) == RESUME_LIST_FIELDS
+    assert data['earliest_work_year'] == 2012
+    assert 'raw_text' not in resume.__dict__ and 'work_experience' not in resume.__dict__
+    assert resume.to_summary_dict(['id', 'name']) == {'id': resume.id, 'name': '张三'}
+
+
+def test_earliest_work_year_backfill():
+    """迁移为最早工作年份为空的已有简历从工作经历补算，忽略非整数年份和格式不对的工作经历"""
+    db = _make_session()
+    db.add_all([
+        Resume(file_name='a.pdf', file_path='/tmp/a.pdf',
+               work_experience=[{'start_year': 2016}, {'start_year': '2010'}, {'start_year': 2013}, {}]),
+        Resume(file_name='b.pdf', file_path='/tmp/b.pdf', work_experience=[{'start_year': 2019}]),
+        Resume(file_name='c.pdf', file_path='/tmp/c.pdf', work_experience={'start_year': 2001}),
+        Resume(file_name='d.pdf', file_path='/tmp/d.pdf'),
+    ])
+    db.commit()
+    # 模拟升级前的数据：最早工作年份未保存，第二份是用户手动设置的值
+    db.execute(text("UPDATE resumes SET earliest_work_year = NULL"))
+    db.execute(text("UPDATE resumes SET earliest_work_year = 2020 WHERE file_name = 'b.pdf'"))
+    db.execute(text(EARLIEST_WORK_YEAR_BACKFILL))
+    rows = db.execute(text("SELECT file_name, earliest_work_year FROM resumes ORDER BY file_name")).fetchall()
+    assert [tuple(row) for row in rows] == [('a.pdf', 2013), ('b.pdf', 2020), ('c.pdf', None), ('d.pdf', None)]
+
+
+def test_sort_fields_are_mapped_columns():
+    """可排序字段都是映射的列（可用于 load_only 和游标分页）；旧正文列和JSON列不在其中"""
+    db = _make_session()
+    _seed(db)
+    assert 'raw_text' not in RESUME_SORT_FIELDS and 'work_experience' not in RESUME_SORT_FIELDS
+    for name in sorted(RESUME_SORT_FIELDS):
+        column = getattr(Resume, name)
+        query = db.query(Resume).options(load_only(*resume_list_columns(), column))
+        rows, cursor = keyset_page(query, column, Resume.id, True, None, 10, f'{name}:desc')
+        assert len(rows) == 10 and cursor
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试解析进度事件（按上传者过滤、断线重连补发）
+"""
+from parse_events import ParseEventBroker
+
+
+def test_subscriber_only_receives_own_uploads():
+    """订阅者只收到自己上传的简历的事件"""
+    broker = ParseEventBroker()
+    alice = broker.subscribe('alice')
+    broker.publish(1, 'queued', created_by='bob')
+    broker.publish(2, 'stage', created_by='alice', stage='extract_text')
+
+    event = alice.get(timeout=1)
+    assert (event['resume_id'], event['status'], event['stage']) == (2, 'stage', 'extract_text')
+    assert alice.get(timeout=0.01) is None
+
+    alice.close()
+    assert broker.subscriber_count == 0
+
+
+def test_reconnect_replays_missed_events():
+    """携带 Last-Event-ID 重连时补发之后的事件"""
+    broker = ParseEventBroker()
+    first = broker.publish(1, 'processing', created_by='alice')
+    broker.publish(1, 'success', created_by='alice')
+
+    subscription = broker.subscribe('alice', last_event_id=first['id'])
+    assert subscription.get(timeout=1)['status'] == 'success'
+    assert subscription.get(timeout=0.01) is None
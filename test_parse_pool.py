@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试解析进程池：子进程异常退出后改为在调用线程中解析，不再重新fork
+"""
+import os
+
+import pytest
+
+from config import Config
+from utils import parse_pool
+
+_PARENT_PID = os.getpid()
+
+
+def _crash_in_child(value):
+    """在子进程中直接退出（模拟解析库崩溃），在主进程中正常返回"""
+    if os.getpid() != _PARENT_PID:
+        os._exit(1)
+    return value * 2
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='需要fork')
+def test_broken_pool_falls_back_in_process(monkeypatch):
+    """进程池损坏后本次调用和之后的调用都在当前进程中执行，不重建进程池"""
+    monkeypatch.setattr(Config, 'PARSE_PROCESS_POOL', True)
+    monkeypatch.setattr(Config, 'PARSE_PROCESS_WORKERS', 1)
+    try:
+        assert parse_pool._run(_crash_in_child, 21) == 42
+        assert parse_pool._get_executor() is None
+        assert parse_pool._run(_crash_in_child, 1) == 2
+    finally:
+        parse_pool.shutdown()
+    assert not parse_pool._pool_broken
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试PDF分级提取（质量达标时提前结束，不达标时回退到全量比较）
+"""
+import os
+import tempfile
+
+import fitz
+
+from utils.pdf_extractor import extract_pdf_intelligent, assess_text_quality
+
+LINES = [
+    '姓名：张三    性别：男    年龄：28岁    手机：13800138000',
+    '最高学历：本科    毕业院校：西安交通大学    专业：计算机科学与技术',
+    '2019.07-2022.06  北京某某科技有限公司  后端开发工程师',
+    '负责订单系统的设计与开发，参与微服务拆分，优化数据库查询性能。',
+    '2022.07-至今  上海某某网络技术有限公司  高级开发工程师',
+    '主导支付网关重构，搭建监控告警体系，带领三人小组完成核心模块交付。',
+]
+
+
+def _make_pdf(lines):
+    path = os.path.join(tempfile.mkdtemp(), 'resume.pdf')
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 60
+    for line in lines:
+        page.insert_text((50, y), line, fontname='china-s', fontsize=10)
+        y += 16
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_text_pdf_exits_after_pymupdf():
+    """正常文本PDF由PyMuPDF直接命中"""
+    details = {}
+    text = extract_pdf_intelligent(_make_pdf(LINES * 2), details=details)
+    assert '西安交通大学' in text
+    assert details['tier'] == 'pymupdf'
+
+
+def test_low_quality_text_falls_back():
+    """文本过少时回退到全量比较"""
+    details = {}
+    extract_pdf_intelligent(_make_pdf(['张三']), details=details)
+    assert details['tier'] == 'full'
+
+
+def test_fragmented_lines_lower_line_score():
+    """逐字断行的文本行结构评分较低"""
+    assert assess_text_quality('\n'.join('张三李四王五')).get('line_score') == 0
+    assert assess_text_quality('\n'.join(LINES))['line_score'] == 1
+
+
+def test_single_document_feeds_all_passes():
+    """同一份文档的纯文本、块布局、pdfplumber、pdfminer结果按页返回且内容一致"""
+    from utils.pdf_engine import PDFDocument
+
+    with PDFDocument(_make_pdf(LINES)) as doc:
+        assert doc.page_count == 1
+        for pages in (doc.page_texts(), doc.page_block_texts(), doc.plumber_page_texts()):
+            assert pages[0]['page'] == 1
+            assert '西安交通大学' in pages[0]['text']
+        assert '西安交通大学' in doc.pdfminer_text()
+        assert doc.render_page(0, zoom=1.0).width > 0
+
+
+def test_blocks_tier_only_in_tiered_mode(monkeypatch):
+    """块布局只在分级模式下作为提前返回的一级；不分级时全量比较的候选与之前相同"""
+    from config import Config
+    from utils import pdf_extractor
+
+    calls = []
+    monkeypatch.setattr(pdf_extractor, 'extract_with_pymupdf_blocks', lambda doc: calls.append(doc) or '块布局文本')
+    monkeypatch.setattr(Config, 'PDF_TIERED_EXTRACTION', False)
+    details = {}
+    text = extract_pdf_intelligent(_make_pdf(LINES * 2), details=details)
+    assert details['tier'] == 'full' and '西安交通大学' in text
+    assert calls == []
+
+    # 分级模式下块布局不达标时也不参与最终择优
+    monkeypatch.setattr(Config, 'PDF_TIERED_EXTRACTION', True)
+    text = extract_pdf_intelligent(_make_pdf(['张三']), details=details)
+    assert len(calls) == 1 and details['tier'] == 'full' and '块布局' not in text
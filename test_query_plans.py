@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试热点查询的执行计划（EXPLAIN QUERY PLAN）均使用索引
+使用临时 SQLite 数据库执行索引迁移，不影响业务数据
+"""
+import os
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, Interview, Position, apply_index_migrations
+
+
+def _make_session():
+    db_path = os.path.join(tempfile.mkdtemp(), 'plan_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        apply_index_migrations(conn)
+    return sessionmaker(bind=engine)()
+
+
+def _plan(session, query):
+    """返回查询计划的明细行"""
+    compiled = query.statement.compile(dialect=session.bind.dialect, compile_kwargs={'render_postcompile': True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with session.bind.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _assert_uses_index(session, query):
+    plan = _plan(session, query)
+    scans = [line for line in plan if line.startswith('SCAN') and 'INDEX' not in line]
+    assert not scans, plan
+    assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, plan
+    assert any('INDEX' in line for line in plan), plan
+
+
+def test_resume_list_queries_use_index():
+    """简历列表：默认排序及按状态/性别/学历筛选"""
+    session = _make_session()
+    base = session.query(Resume)
+    _assert_uses_index(session, base.order_by(Resume.upload_time.desc()).limit(10))
+    _assert_uses_index(session, base.filter(Resume.parse_status == 'success').order_by(Resume.upload_time.desc()).limit(10))
+    _assert_uses_index(session, base.filter(Resume.gender == '男').order_by(Resume.upload_time.desc()).limit(10))
+    _assert_uses_index(session, base.filter(Resume.highest_education == '本科').order_by(Resume.upload_time.desc()).limit(10))
+
+
+def test_statistics_queries_use_index():
+    """统计：按岗位、上传时间、一面时间、状态、offer/入职日期过滤"""
+    session = _make_session()
+    start, end = datetime(2024, 1, 1), datetime(2024, 12, 31)
+    _assert_uses_index(session, session.query(Resume).filter(
+        Resume.upload_time >= start, Resume.upload_time <= end))
+    _assert_uses_index(session, session.query(Resume).filter(
+        Resume.applied_position == '后端开发', Resume.upload_time >= start))
+    _assert_uses_index(session, session.query(Interview).filter(
+        Interview.round1_time.isnot(None), Interview.round1_time >= '2024-01-01', Interview.round1_time <= '2024-12-31'))
+    _assert_uses_index(session, session.query(Interview).filter(
+        Interview.applied_position == '后端开发', Interview.round1_time >= '2024-01-01'))
+    _assert_uses_index(session, session.query(Interview).filter(
+        Interview.status.in_(['面试通过', '已发offer', '已入职']), Interview.create_time >= start))
+    _assert_uses_index(session, session.query(Interview).filter(
+        Interview.offer_issued == 1, Interview.offer_date.isnot(None), Interview.offer_date != '',
+        Interview.offer_date >= '2024-01-01'))
+    _assert_uses_index(session, session.query(Interview).filter(
+        Interview.onboard == 1, Interview.onboard_date.isnot(None), Interview.onboard_date != '',
+        Interview.onboard_date >= '2024-01-01'))
+
+
+def test_sync_and_lookup_queries_use_index():
+    """实时同步检查，以及面试记录按简历/身份验证码/token查找"""
+    session = _make_session()
+    since = datetime(2024, 1, 1)
+    for model in (Resume, Interview, Position):
+        _assert_uses_index(session, session.query(model).filter(model.updated_at > since))
+    for column in (Interview.resume_id, Interview.identity_code, Interview.round1_comment_token,
+                   Interview.round2_comment_token, Interview.round3_comment_token,
+                   Interview.registration_form_token):
+        _assert_uses_index(session, session.query(Interview).filter(column == 'x'))
+    _assert_uses_index(session, session.query(Interview).order_by(Interview.update_time.desc()))
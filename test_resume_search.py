@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历全文检索（二字词分词、触发器同步、按相关度排序）
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, apply_index_migrations
+from utils.resume_search import tokenize_text, build_match_query, rank_sql
+
+
+def _make_session():
+    db_path = os.path.join(tempfile.mkdtemp(), 'search_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        apply_index_migrations(conn)
+    return sessionmaker(bind=engine)()
+
+
+def _add(db, **fields):
+    resume = Resume(file_name='r.pdf', file_path='/tmp/r.pdf', parse_status='success', **fields)
+    db.add(resume)
+    db.commit()
+    return resume
+
+
+def _search(db, term):
+    rows = db.execute(text(rank_sql() + " ORDER BY rank"), {'match': build_match_query(term)}).fetchall()
+    return [row.resume_id for row in rows]
+
+
+def test_tokenize_and_match_query():
+    """汉字切成二字词并保留段尾单字，英文转小写"""
+    assert tokenize_text('张三丰 Java') == '张三 三丰 丰 java'
+    assert build_match_query('交通大学 py') == '"交通 通大 大学" "py"*'
+    assert build_match_query('张') == '"张"*'
+    assert build_match_query('！？') is None
+    assert build_match_query('张三', columns=('name',)) == '{name} : ("张三")'
+
+
+def test_search_partial_words_and_work_experience():
+    """按姓名、学校的部分汉字以及工作经历中的公司检索"""
+    db = _make_session()
+    first = _add(db, name='欧阳小明', school='西安交通大学', major='计算机科学与技术',
+                 work_experience=[{'company': '北京字节跳动科技有限公司', 'position': '后端开发工程师'}])
+    second = _add(db, name='李四', school='北京大学', major='法学', raw_text='曾在字节跳动实习')
+
+    assert _search(db, '小明') == [first.id]
+    assert _search(db, '明') == [first.id]
+    assert _search(db, '交通') == [first.id]
+    assert set(_search(db, '北京')) == {first.id, second.id}
+    assert _search(db, '后端 工程师') == [first.id]
+    # 公司列权重高于正文
+    assert _search(db, '字节跳动') == [first.id, second.id]
+
+
+def test_triggers_keep_index_in_sync():
+    """更新和删除简历后索引同步变化"""
+    db = _make_session()
+    resume = _add(db, name='王五', school='浙江大学')
+    assert _search(db, '浙江') == [resume.id]
+
+    resume.school = '复旦大学'
+    db.commit()
+    assert _search(db, '浙江') == []
+    assert _search(db, '复旦') == [resume.id]
+
+    db.delete(resume)
+    db.commit()
+    assert _search(db, '复旦') == []
+    assert _search(db, '王五') == []
+
+
+def test_relevance_pages(monkeypatch):
+    """相关度分页：匹配数在上限内按bm25翻页，超过上限按简历ID倒序翻页，两种方式都不重复、不遗漏"""
+    from config import Config
+    from utils.resume_search import relevance_page
+
+    db = _make_session()
+    ids = {_add(db, name=f'张{i}', school='浙江大学').id for i in range(7)}
+    match = build_match_query('浙江')
+
+    for limit in (500, 3):
+        monkeypatch.setattr(Config, 'SEARCH_RANK_LIMIT', limit)
+        seen, cursor = [], None
+        while True:
+            rows, cursor = relevance_page(db, db.query(Resume), match, cursor, 3)
+            seen.extend(r.id for r in rows)
+            if not cursor:
+                break
+        assert len(seen) == len(ids) and set(seen) == ids
+        if limit == 3:
+            assert seen == sorted(ids, reverse=True)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试简历正文压缩存储（resume_texts 表）：读写、全文索引同步、旧数据迁移
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, ResumeText, INDEX_MIGRATIONS, apply_index_migrations
+from utils.resume_search import build_match_query, rank_sql
+
+
+def _make_engine():
+    db_path = os.path.join(tempfile.mkdtemp(), 'resume_text_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _search(db, term):
+    rows = db.execute(text(rank_sql() + " ORDER BY rank"), {'match': build_match_query(term)}).fetchall()
+    return [row.resume_id for row in rows]
+
+
+def test_raw_text_is_compressed_and_indexed():
+    """正文压缩存放在 resume_texts，修改、清空和删除简历时全文索引同步变化"""
+    engine = _make_engine()
+    with engine.connect() as conn:
+        apply_index_migrations(conn)
+    db = sessionmaker(bind=engine)()
+
+    body = '负责订单系统的设计与开发，参与微服务拆分。' * 50
+    resume = Resume(file_name='r.pdf', file_path='/tmp/r.pdf', name='张三', raw_text=body)
+    db.add(resume)
+    db.commit()
+    record = db.query(ResumeText).filter_by(resume_id=resume.id).one()
+    assert record.original_size == len(body.encode('utf-8'))
+    assert len(record.content) < record.original_size / 5
+    assert db.execute(text("SELECT raw_text FROM resumes")).scalar() is None
+    assert _search(db, '微服务') == [resume.id]
+
+    db.expire_all()
+    assert db.get(Resume, resume.id).raw_text == body
+
+    resume.raw_text = '熟悉Kafka消息队列'
+    db.commit()
+    assert _search(db, '微服务') == []
+    assert _search(db, 'kafka') == [resume.id]
+
+    resume.name = '李四'
+    db.commit()
+    assert _search(db, 'kafka') == [resume.id]
+    assert _search(db, '李四') == [resume.id]
+
+    resume.raw_text = None
+    db.commit()
+    assert db.query(ResumeText).count() == 0
+    assert _search(db, 'kafka') == []
+    assert _search(db, '李四') == [resume.id]
+
+    resume.raw_text = '熟悉Redis'
+    db.commit()
+    db.delete(resume)
+    db.commit()
+    assert db.query(ResumeText).count() == 0
+    assert _search(db, 'redis') == []
+    # 直接删除简历行时由触发器删除正文
+    other = Resume(file_name='o.pdf', file_path='/tmp/o.pdf', name='王五', raw_text='会计')
+    db.add(other)
+    db.commit()
+    db.execute(text("DELETE FROM resumes WHERE id = :id"), {'id': other.id})
+    db.commit()
+    assert db.query(ResumeText).count() == 0
+    assert _search(db, '会计') == []
+    db.execute(text("INSERT INTO resumes_fts(resumes_fts) VALUES ('integrity-check')"))
+
+
+def test_migration_moves_existing_text():
+    """旧版本数据库（正文在 resumes.raw_text）升级后正文移到 resume_texts，检索结果不变"""
+    engine = _make_engine()
+    with engine.connect() as conn:
+        # 模拟升级前：只执行到版本2，正文写在旧列中
+        for version, statements in INDEX_MIGRATIONS:
+            if version <= 2:
+                for statement in statements:
+                    conn.execute(text(statement))
+        conn.execute(text("PRAGMA user_version = 2"))
+        conn.execute(text("INSERT INTO resumes (file_name, file_path, name, raw_text) "
+                          "VALUES ('a.pdf', '/tmp/a.pdf', '张三', '精通数据分析与可视化')"))
+        conn.execute(text("INSERT INTO resumes (file_name, file_path, name, raw_text) "
+                          "VALUES ('b.pdf', '/tmp/b.pdf', '李四', NULL)"))
+        conn.commit()
+        apply_index_migrations(conn)
+
+    db = sessionmaker(bind=engine)()
+    first, second = db.query(Resume).order_by(Resume.id).all()
+    assert first.raw_text == '精通数据分析与可视化'
+    assert second.raw_text is None
+    assert db.execute(text("SELECT count(*) FROM resumes WHERE raw_text IS NOT NULL")).scalar() == 0
+    assert _search(db, '数据分析') == [first.id]
+
+    first.raw_text = '擅长财务报表'
+    db.commit()
+    assert _search(db, '数据分析') == []
+    assert _search(db, '财务') == [first.id]
+    db.execute(text("INSERT INTO resumes_fts(resumes_fts) VALUES ('integrity-check')"))
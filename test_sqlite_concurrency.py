@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试SQLite并发配置（WAL、忙等待超时、后台写入串行化）
+多个写线程与读线程同时访问临时数据库，不应出现 database is locked
+"""
+import os
+import tempfile
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, configure_sqlite_engine, commit_serialized
+
+
+def _make_engine():
+    db_path = os.path.join(tempfile.mkdtemp(), 'concurrency_test.db')
+    engine = configure_sqlite_engine(create_engine(f'sqlite:///{db_path}'))
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_pragmas_applied():
+    """每个新连接都启用WAL和忙等待超时"""
+    engine = _make_engine()
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar().lower() == 'wal'
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() > 0
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+
+
+def test_concurrent_writers_and_readers():
+    """后台写线程（串行提交）、普通写线程和读线程并发运行，全部成功"""
+    engine = _make_engine()
+    Session = sessionmaker(bind=engine, autoflush=False)
+    writes_per_thread = 30
+    errors = []
+    stop = threading.Event()
+
+    def background_writer(n):
+        db = Session()
+        try:
+            for i in range(writes_per_thread):
+                resume = Resume(file_name=f'bg{n}_{i}.pdf', file_path='/tmp/x.pdf', parse_status='pending')
+                db.add(resume)
+                commit_serialized(db)
+                resume.parse_status = 'success'
+                commit_serialized(db)
+        except OperationalError as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    def ui_writer(n):
+        db = Session()
+        try:
+            for i in range(writes_per_thread):
+                db.add(Resume(file_name=f'ui{n}_{i}.pdf', file_path='/tmp/x.pdf', parse_status='pending'))
+                db.commit()
+        except OperationalError as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    def reader():
+        db = Session()
+        try:
+            while not stop.is_set():
+                db.query(Resume).filter(Resume.parse_status == 'success').count()
+                db.rollback()
+        except OperationalError as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    writers = [threading.Thread(target=background_writer, args=(n,)) for n in range(4)]
+    writers += [threading.Thread(target=ui_writer, args=(n,)) for n in range(2)]
+    readers = [threading.Thread(target=reader) for _ in range(3)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert not errors, errors
+    db = Session()
+    try:
+        assert db.query(Resume).count() == 6 * writes_per_thread
+        assert db.query(Resume).filter(Resume.parse_status == 'success').count() == 4 * writes_per_thread
+    finally:
+        db.close()
@@ -110,6 +110,8 @@ else:
     print("按 Ctrl+C 停止服务器")
     print()
     try:
+        from app import start_parse_workers
+        start_parse_workers()
         app.run(debug=True, host='127.0.0.1', port=5000, use_reloader=False)
     except KeyboardInterrupt:
         print("\n服务器已停止")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试招聘漏斗统计：分组聚合的结果与逐岗位 count() 的原实现一致，按日汇总表与原始记录聚合一致
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, Interview, FunnelDaily, apply_index_migrations
+from utils.funnel_stats import (funnel_counts_by_position, funnel_counts_from_rollup, funnel_totals, funnel_rows,
+                                rebuild_funnel_daily, PASS_STATUSES)
+
+POSITIONS = ['后端开发', '前端开发', '测试工程师', '产品经理', '会计', None, '']
+ALL = object()  # _legacy_counts 不按岗位过滤的标记
+STATUSES = ['待面试', '面试中', '面试通过', '已发offer', '已入职', '未通过']
+
+
+def _make_session(migrate=False):
+    db_path = os.path.join(tempfile.mkdtemp(), 'statistics_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    if migrate:
+        with engine.connect() as conn:
+            apply_index_migrations(conn)
+    return sessionmaker(bind=engine)()
+
+
+def _random_date(rng, empty=(None, '')):
+    if rng.random() < 0.2:
+        return rng.choice(empty)
+    return (datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 120))).strftime('%Y-%m-%d')
+
+
+def _seed(db, seed=7):
+    rng = random.Random(seed)
+    for i in range(300):
+        db.add(Resume(file_name=f'{i}.pdf', file_path='/tmp/r.pdf', applied_position=rng.choice(POSITIONS),
+                      created_by=rng.choice(['admin', 'hr1', None]),
+                      upload_time=datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 24 * 120))))
+    for i in range(200):
+        db.add(Interview(resume_id=i + 1, name=f'候选人{i}', applied_position=rng.choice(POSITIONS),
+                         created_by=rng.choice(['admin', 'hr1', None]),
+                         status=rng.choice(STATUSES), round1_time=_random_date(rng, empty=(None,)),
+                         offer_issued=rng.choice([0, 1]), offer_date=_random_date(rng),
+                         onboard=rng.choice([0, 1]), onboard_date=_random_date(rng),
+                         create_time=datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 24 * 120))))
+    db.commit()
+
+
+def _legacy_counts(db, pos_name, start_dt, end_dt, start_date, end_date):
+    """原实现：每个岗位逐项 count()；pos_name 为 ALL 时不按岗位过滤（原实现的合计）"""
+    def by_position(model):
+        return [] if pos_name is ALL else [model.applied_position == pos_name]
+
+    q = db.query(Resume).filter(*by_position(Resume))
+    if start_dt is not None:
+        q = q.filter(Resume.upload_time >= start_dt)
+    if end_dt is not None:
+        q = q.filter(Resume.upload_time <= end_dt)
+    resume_count = q.count()
+
+    q = db.query(Interview).filter(*by_position(Interview))
+    if start_date:
+        q = q.filter(Interview.round1_time.isnot(None), Interview.round1_time >= start_date)
+    if end_date:
+        q = q.filter(Interview.round1_time <= end_date)
+    interview_count = q.count()
+
+    q = db.query(Interview).filter(*by_position(Interview), Interview.status.in_(PASS_STATUSES))
+    if start_dt is not None:
+        q = q.filter(Interview.create_time >= start_dt)
+    if end_dt is not None:
+        q = q.filter(Interview.create_time <= end_dt)
+    pass_count = q.count()
+
+    q = db.query(Interview).filter(*by_position(Interview), Interview.offer_issued == 1,
+                                   Interview.offer_date.isnot(None), Interview.offer_date != '')
+    if start_date:
+        q = q.filter(Interview.offer_date >= start_date)
+    if end_date:
+        q = q.filter(Interview.offer_date <= end_date)
+    offer_count = q.count()
+
+    q = db.query(Interview).filter(*by_position(Interview), Interview.onboard == 1,
+                                   Interview.onboard_date.isnot(None), Interview.onboard_date != '')
+    if start_date:
+        q = q.filter(Interview.onboard_date >= start_date)
+    if end_date:
+        q = q.filter(Interview.onboard_date <= end_date)
+    onboard_count = q.count()
+
+    return {'position': pos_name, 'resume_count': resume_count, 'interview_count': interview_count,
+            'pass_count': pass_count, 'offer_count': offer_count, 'onboard_count': onboard_count}
+
+
+def _legacy_positions(db, start_dt, end_dt, start_date, end_date):
+    """原实现：时间范围内有简历或到面记录的岗位"""
+    positions = set()
+    q = db.query(Resume.applied_position).filter(Resume.applied_position.isnot(None), Resume.applied_position != '')
+    if start_dt is not None:
+        q = q.filter(Resume.upload_time >= start_dt)
+    if end_dt is not None:
+        q = q.filter(Resume.upload_time <= end_dt)
+    positions.update(row[0] for row in q.distinct())
+    q = db.query(Interview.applied_position).filter(Interview.applied_position.isnot(None),
+                                                    Interview.applied_position != '')
+    if start_date:
+        q = q.filter(Interview.round1_time.isnot(None), Interview.round1_time >= start_date)
+    if end_date:
+        q = q.filter(Interview.round1_time <= end_date)
+    positions.update(row[0] for row in q.distinct())
+    return sorted(positions)
+
+
+@pytest.mark.parametrize('start_date,end_date', [
+    ('', ''), ('2024-02-01', ''), ('', '2024-03-15'), ('2024-02-01', '2024-03-15'), ('2025-01-01', ''),
+])
+def test_grouped_counts_match_per_position_counts(start_date, end_date):
+    """按岗位的各项数量、岗位列表和合计与原实现一致"""
+    db = _make_session()
+    _seed(db)
+    start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+    end_dt = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59) if end_date else None
+
+    counts = funnel_counts_by_position(db, start_dt, end_dt, start_date, end_date)
+    expected_rows = [_legacy_counts(db, pos, start_dt, end_dt, start_date, end_date)
+                     for pos in _legacy_positions(db, start_dt, end_dt, start_date, end_date)]
+    assert funnel_rows(counts) == expected_rows
+
+    # 合计：原实现不按岗位过滤，包含未填岗位的记录
+    expected_totals = _legacy_counts(db, ALL, start_dt, end_dt, start_date, end_date)
+    assert {'position': ALL, **funnel_totals(counts)} == expected_totals
+
+    # 指定岗位
+    single = funnel_counts_by_position(db, start_dt, end_dt, start_date, end_date, position='后端开发')
+    expected = _legacy_counts(db, '后端开发', start_dt, end_dt, start_date, end_date)
+    assert {'position': '后端开发', **funnel_totals(single)} == expected
+
+
+def _by_position(counts):
+    """未填岗位（None 和 ''）合并为 ''，便于与汇总表结果比较"""
+    merged = {}
+    for pos, entry in counts.items():
+        target = merged.setdefault(pos or '', dict.fromkeys(entry, 0))
+        for metric, value in entry.items():
+            target[metric] += value
+    return merged
+
+
+def _assert_rollup_matches(db):
+    for start_date, end_date in [('', ''), ('2024-02-01', ''), ('', '2024-03-15'), ('2024-02-01', '2024-03-15')]:
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59) if end_date else None
+        raw = _by_position(funnel_counts_by_position(db, start_dt, end_dt, start_date, end_date))
+        rollup = funnel_counts_from_rollup(db, start_date, end_date)
+        assert {pos: entry for pos, entry in rollup.items() if any(entry.values())} == \
+            {pos: entry for pos, entry in raw.items() if any(entry.values())}
+        assert funnel_rows(rollup) == funnel_rows(raw)
+
+
+def test_rollup_maintained_incrementally():
+    """新增、修改、删除简历和面试记录后，按日汇总与原始记录聚合一致，整表重建结果不变"""
+    db = _make_session(migrate=True)
+    _seed(db)
+    _assert_rollup_matches(db)
+
+    rng = random.Random(11)
+    interviews = db.query(Interview).all()
+    for interview in rng.sample(interviews, 60):
+        interview.status = rng.choice(STATUSES)
+        interview.offer_issued = 1
+        interview.offer_date = _random_date(rng)
+        interview.applied_position = rng.choice(POSITIONS)
+        interview.round1_time = _random_date(rng, empty=(None,))
+    for interview in rng.sample(interviews, 20):
+        db.delete(interview)
+    resumes = db.query(Resume).all()
+    for resume in rng.sample(resumes, 40):
+        resume.applied_position = rng.choice(POSITIONS)
+    for resume in rng.sample(resumes, 30):
+        db.delete(resume)
+    db.commit()
+    _assert_rollup_matches(db)
+
+    before = sorted(tuple(row) for row in db.execute(text(
+        "SELECT * FROM funnel_daily WHERE resume_count + interview_count + pass_count + offer_count + onboard_count > 0")))
+    rebuild_funnel_daily(db.connection())
+    after = sorted(tuple(row) for row in db.execute(text("SELECT * FROM funnel_daily")))
+    assert before == after
+    assert db.query(FunnelDaily).filter(FunnelDaily.created_by == 'hr1').count() > 0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试实时同步的数据变更版本：触发器在新增、修改、删除时递增版本号，按版本取出变化的记录ID，
+旧变更清理后版本号不回退，进程内缓存在提交后失效，推送连接的等待与连接数上限
+使用临时 SQLite 数据库，不影响业务数据
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Resume, Interview, Position, ChangeLog, apply_index_migrations
+from utils.change_feed import ChangeFeed, read_versions, changes_since, CHANGE_LOG_RETENTION
+
+
+def _make_session():
+    db_path = os.path.join(tempfile.mkdtemp(), 'sync_versions_test.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        apply_index_migrations(conn)
+    return sessionmaker(bind=engine)()
+
+
+def test_versions_follow_writes():
+    """每张表的版本号只在该表写入时增加，变化的记录ID按最后一次操作归类"""
+    db = _make_session()
+    assert read_versions(db) == {'resumes': 0, 'interviews': 0, 'positions': 0}
+
+    first = Resume(file_name='a.pdf', file_path='/tmp/a.pdf', name='张三')
+    second = Resume(file_name='b.pdf', file_path='/tmp/b.pdf', name='李四')
+    db.add_all([first, second, Position(position_name='后端开发')])
+    db.commit()
+    base = read_versions(db)
+    assert base['resumes'] > 0 and base['positions'] > 0 and base['interviews'] == 0
+
+    first.name = '张三丰'
+    db.add(Interview(resume_id=second.id, name='李四'))
+    db.commit()
+    db.delete(second)
+    db.commit()
+    # 直接执行的SQL同样会记录
+    db.execute(text("UPDATE positions SET position_name = '前端开发'"))
+    db.commit()
+
+    versions = read_versions(db)
+    assert all(versions[table] > base[table] for table in versions)
+    assert changes_since(db, 'resumes', base['resumes'], 100) == \
+        {'ids': [first.id], 'deleted': [second.id], 'truncated': False}
+    assert changes_since(db, 'resumes', versions['resumes'], 100) == {'ids': [], 'deleted': [], 'truncated': False}
+    assert changes_since(db, 'resumes', 0, 1)['truncated']
+
+
+def test_versions_survive_pruning():
+    """change_log 只保留最近的变更：客户端版本过旧时要求整表刷新，版本号不回退"""
+    db = _make_session()
+    position = Position(position_name='会计')
+    db.add(position)
+    db.commit()
+    position_version = read_versions(db)['positions']
+
+    db.execute(text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count) "
+                    "INSERT INTO resumes (file_name, file_path) SELECT 'r.pdf', '/tmp/r.pdf' FROM n"),
+               {'count': CHANGE_LOG_RETENTION + 50})
+    db.commit()
+    assert db.query(ChangeLog).count() == CHANGE_LOG_RETENTION
+    versions = read_versions(db)
+    assert versions['positions'] == position_version
+    assert versions['resumes'] == position_version + CHANGE_LOG_RETENTION + 50
+    assert changes_since(db, 'positions', 0, 100)['truncated']
+    assert changes_since(db, 'positions', position_version, 100) == {'ids': [], 'deleted': [], 'truncated': False}
+
+    # 旧记录全部清理后，新的序号仍接着递增
+    db.execute(text("DELETE FROM change_log"))
+    db.commit()
+    position.position_name = '出纳'
+    db.commit()
+    assert read_versions(db)['positions'] > versions['resumes']
+
+
+def test_change_feed_cache_invalidated_on_commit():
+    """有效期内返回缓存的版本号，本进程提交修改后立即读到新版本"""
+    db = _make_session()
+    feed = ChangeFeed(ttl=3600)
+    feed.invalidate_on_commit(Position)
+    before = feed.versions(db)
+
+    db.execute(text("INSERT INTO positions (position_name) VALUES ('测试')"))
+    db.commit()
+    assert feed.versions(db) == before
+
+    db.add(Position(position_name='产品经理'))
+    db.commit()
+    assert feed.versions(db)['positions'] == read_versions(db)['positions'] > before['positions']
+
+
+def test_wait_for_change_wakes_on_commit():
+    """等待中的推送连接在本进程提交修改后立即返回新版本号，无变化时等到超时返回None"""
+    db = _make_session()
+    feed = ChangeFeed(ttl=3600, max_subscribers=1)
+    feed.invalidate_on_commit(Position)
+    since = feed.versions(db)
+    session_factory = sessionmaker(bind=db.get_bind())
+
+    assert feed.wait_for_change(since, 0.2, session_factory) is None
+
+    def write():
+        time.sleep(0.2)
+        writer = session_factory()
+        writer.add(Position(position_name='运维'))
+        writer.commit()
+        writer.close()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    started = time.monotonic()
+    versions = feed.wait_for_change(since, 30, session_factory)
+    thread.join()
+    assert versions['positions'] > since['positions']
+    assert time.monotonic() - started < 5
+
+    assert feed.subscribe()
+    assert not feed.subscribe()
+    feed.unsubscribe()
+    assert feed.subscribe()
@@ -0,0 +1,155 @@
+"""
+AI响应缓存（按请求内容寻址）
+以 服务商(api_base) + 模型 + temperature + 消息内容的SHA-256 为键，缓存模型返回的文本，
+重新解析同一份简历、对同一简历和岗位重复做匹配分析、导出分析PDF时不再重复请求AI接口。
+缓存保存在独立的SQLite文件中（不占用业务库的写锁），过期时间见 Config.AI_CACHE_TTL_SECONDS，
+超出总大小上限时按最近访问时间LRU淘汰。
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+
+def request_key(provider: str, model: str, temperature: Optional[float], messages: Any) -> str:
+    """
+    生成缓存键
+
+    Args:
+        provider: 服务商（api_base）
+        model: 模型名称
+        temperature: 采样温度（未设置时为None）
+        messages: 请求的消息列表（按规范化JSON计算SHA-256）
+    """
+    messages_hash = hashlib.sha256(
+        json.dumps(messages, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+    raw = json.dumps([provider.rstrip('/'), model, temperature, messages_hash], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class AIResponseCache:
+    """SQLite缓存（线程安全，TTL过期 + 按总大小LRU淘汰）"""
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ai_responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_ai_responses_accessed ON ai_responses (accessed_at)')
+        self._total_bytes = self._conn.execute('SELECT coalesce(sum(size), 0) FROM ai_responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存的响应文本，未命中或已过期返回None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT response, size, created_at FROM ai_responses WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, size, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM ai_responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE ai_responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str, provider: str = '', model: str = '') -> None:
+        """写入缓存（已存在则覆盖），超出容量时淘汰最久未访问的条目"""
+        if not response:
+            return
+        size = len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                old = self._conn.execute('SELECT size FROM ai_responses WHERE key = ?', (key,)).fetchone()
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO ai_responses (key, provider, model, response, size, created_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (key, provider, model, response, size, now, now))
+            except sqlite3.Error as e:
+                print(f"写入AI响应缓存失败: {e}")
+                return
+            self._total_bytes += size - (old[0] if old else 0)
+            while self._total_bytes > self.max_bytes:
+                oldest = self._conn.execute(
+                    'SELECT key, size FROM ai_responses ORDER BY accessed_at LIMIT 1').fetchone()
+                if oldest is None:
+                    break
+                self._conn.execute('DELETE FROM ai_responses WHERE key = ?', (oldest[0],))
+                self._total_bytes -= oldest[1]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute('DELETE FROM ai_responses')
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            entries = self._conn.execute('SELECT count(*) FROM ai_responses').fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_ai_cache() -> Optional[AIResponseCache]:
+    """获取全局AI响应缓存实例（未启用时返回None）"""
+    global _cache
+    from config import Config
+
+    if not Config.AI_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = AIResponseCache(Config.AI_CACHE_PATH, Config.AI_CACHE_TTL_SECONDS,
+                                     Config.AI_CACHE_MAX_MB * 1024 * 1024)
+        return _cache
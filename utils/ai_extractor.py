@@ -3,11 +3,19 @@ AI辅助简历信息提取模块
 使用大语言模型提升解析准确性
 """
 
+import asyncio
 import json
 import os
-from typing import Dict, Optional, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 import requests
 
+from utils import ai_loop
+from utils.ai_cache import get_ai_cache, request_key
+from utils.ai_limiter import get_limiter
+from utils.http_pool import post_json
+
 
 class AIExtractor:
     """AI辅助信息提取器"""
@@ -51,7 +59,8 @@ class AIExtractor:
         },
     }
     
-    def __init__(self, api_key: Optional[str] = None, api_base: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[str] = None, api_base: Optional[str] = None, model: str = "gpt-3.5-turbo",
+                 use_cache: bool = True):
         """
         初始化AI提取器
         
@@ -59,7 +68,9 @@ class AIExtractor:
             api_key: AI API密钥，如果为None则从环境变量获取
             api_base: API基础URL，如果为None则根据模型自动选择
             model: 使用的模型名称（支持：gpt-3.5-turbo, gpt-4, deepseek-chat, deepseek-coder等）
+            use_cache: 是否读取AI响应缓存（重新解析时传False，总是请求接口；可用的结果仍写入缓存）
         """
+        self.use_cache = use_cache
         self.api_key = api_key or os.environ.get('OPENAI_API_KEY') or os.environ.get('AI_API_KEY') or os.environ.get('DEEPSEEK_API_KEY')
         self.model = model
         
@@ -80,6 +91,16 @@ class AIExtractor:
         
         self.enabled = bool(self.api_key)
         
+    # 单次优化的最大文本长度，超出时在段落/行边界处分段，各段并行优化（并行段数见 Config.AI_OPTIMIZE_PARALLEL_CHUNKS）
+    OPTIMIZE_CHUNK_SIZE = 12000  # 保留一些余量
+    # 分段时附带的相邻段上下文长度（只作参考，不在该段的结果中输出），避免边界处被截断的句子被改错
+    OPTIMIZE_CHUNK_OVERLAP = 400
+    # 单次调用模式：回复包含提取结果和修正片段，输出上限比单独提取（2000）更高；修正片段数量有上限
+    FUSED_MAX_TOKENS = 4096
+    FUSED_MAX_CORRECTIONS = 40
+    # 分段的断句位置：优先空行，其次换行，再次句末标点
+    _BREAK_MARKS = (('\n\n',), ('\n',), ('。', '！', '？', '；', '. ', '! ', '? '))
+
     def optimize_text_extraction(self, text: str) -> Optional[str]:
         """
         使用AI优化文本提取结果
@@ -95,28 +116,124 @@ class AIExtractor:
             return None
             
         try:
-            # 如果文本太长，分段处理
-            max_length = 12000  # 保留一些余量
-            if len(text) <= max_length:
+            # 如果文本太长，分段并行处理
+            parts = self._split_for_optimize(text)
+            if len(parts) == 1:
                 return self._optimize_text_with_ai(text)
-            else:
-                # 分段处理
-                parts = []
-                for i in range(0, len(text), max_length):
-                    part = text[i:i+max_length]
-                    optimized = self._optimize_text_with_ai(part)
-                    if optimized:
-                        parts.append(optimized)
-                    else:
-                        parts.append(part)  # 如果优化失败，使用原文本
-                return '\n'.join(parts) if parts else text
+            chunks = self._optimize_chunks(parts)
+            workers = min(len(chunks), self._optimize_fan_out())
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-optimize') as executor:
+                optimized = list(executor.map(lambda chunk: self._optimize_text_with_ai(*chunk), chunks))
+            return self._join_optimized(parts, optimized)
         except Exception as e:
             print(f"AI文本优化失败: {e}")
             return None
+
+    async def optimize_text_extraction_async(self, text: str) -> Optional[str]:
+        """optimize_text_extraction 的协程版本（在 utils.ai_loop 的事件循环中执行）"""
+        if not self.enabled:
+            return None
+
+        try:
+            parts = self._split_for_optimize(text)
+            if len(parts) == 1:
+                return await self._optimize_text_with_ai_async(text)
+            semaphore = asyncio.Semaphore(self._optimize_fan_out())
+
+            async def optimize(chunk):
+                async with semaphore:
+                    return await self._optimize_text_with_ai_async(*chunk)
+
+            optimized = await asyncio.gather(*[optimize(chunk) for chunk in self._optimize_chunks(parts)])
+            return self._join_optimized(parts, optimized)
+        except Exception as e:
+            print(f"AI文本优化失败: {e}")
+            return None
+
+    @staticmethod
+    def _optimize_fan_out() -> int:
+        """单份文本同时优化的段数（各段请求仍受服务商限流器约束）"""
+        from config import Config
+        return max(1, Config.AI_OPTIMIZE_PARALLEL_CHUNKS)
+
+    def _split_for_optimize(self, text: str) -> List[str]:
+        """
+        按 OPTIMIZE_CHUNK_SIZE 切分待优化的文本，断在段落/行边界（找不到时断在句末，再不行才按长度硬切）
+
+        Returns:
+            各段文本，依次拼接后与原文完全相同
+        """
+        max_length = self.OPTIMIZE_CHUNK_SIZE
+        parts = []
+        start = 0
+        while len(text) - start > max_length:
+            end = start + max_length
+            # 断点不早于半段，避免切出过短的段
+            low = start + max_length // 2
+            for marks in self._BREAK_MARKS:
+                found = [text.rfind(mark, low, end) + len(mark) for mark in marks if text.rfind(mark, low, end) >= 0]
+                if found:
+                    end = max(found)
+                    break
+            parts.append(text[start:end])
+            start = end
+        parts.append(text[start:])
+        return parts
+
+    def _optimize_chunks(self, parts: List[str]) -> List[tuple]:
+        """为每段附上前后相邻段的上下文：[(段文本, 上文, 下文), ...]"""
+        overlap = self.OPTIMIZE_CHUNK_OVERLAP
+        chunks = []
+        for i, part in enumerate(parts):
+            before = parts[i - 1][-overlap:] if i > 0 and overlap else ''
+            after = parts[i + 1][:overlap] if i + 1 < len(parts) and overlap else ''
+            # 上下文从完整的行开始/结束
+            if '\n' in before:
+                before = before[before.index('\n') + 1:]
+            if '\n' in after:
+                after = after[:after.rindex('\n')]
+            chunks.append((part, before, after))
+        return chunks
+
+    @staticmethod
+    def _join_optimized(parts: List[str], optimized: List[Optional[str]]) -> str:
+        """按原顺序拼接各段优化结果（保留原文在分段处的换行），优化失败的段使用原文本"""
+        joined = []
+        for part, result in zip(parts, optimized):
+            body = part.rstrip()
+            joined.append((result.strip() if result else body) + part[len(body):])
+        return ''.join(joined).rstrip()
     
-    def _optimize_text_with_ai(self, text: str) -> Optional[str]:
-        """使用AI优化单段文本"""
-        prompt = f"""请优化以下从简历文件中提取的文本，修复OCR识别错误、合并被换行分割的文本、保持正确的阅读顺序（从左到右、从上到下）。
+    def _optimize_text_with_ai(self, text: str, context_before: str = '', context_after: str = '') -> Optional[str]:
+        """使用AI优化单段文本（context_before/context_after 为相邻段的上下文，仅供参考）"""
+        try:
+            prompt = self._build_optimize_prompt(text, context_before, context_after)
+            return self._clean_optimized_text(self._call_ai_api(prompt, accept=self._optimized_acceptor(text)))
+        except Exception as e:
+            print(f"AI文本优化调用失败: {e}")
+            return None
+
+    async def _optimize_text_with_ai_async(self, text: str, context_before: str = '',
+                                           context_after: str = '') -> Optional[str]:
+        """使用AI优化单段文本（协程版本）"""
+        try:
+            prompt = self._build_optimize_prompt(text, context_before, context_after)
+            return self._clean_optimized_text(
+                await self._call_ai_api_async(prompt, accept=self._optimized_acceptor(text)))
+        except Exception as e:
+            print(f"AI文本优化调用失败: {e}")
+            return None
+
+    @staticmethod
+    def _build_optimize_prompt(text: str, context_before: str = '', context_after: str = '') -> str:
+        context = ''
+        if context_before or context_after:
+            context = "\n**分段说明：**\n原始文本是一份较长简历中的一段。下面给出相邻段落的上下文，仅用于理解被分段截断的句子，不要修改或输出上下文。\n"
+            if context_before:
+                context += f"\n上文（不要输出）：\n{context_before}\n"
+            if context_after:
+                context += f"\n下文（不要输出）：\n{context_after}\n"
+        return f"""请优化以下从简历文件中提取的文本，修复OCR识别错误、合并被换行分割的文本、保持正确的阅读顺序（从左到右、从上到下）。
 
 **优化要求：**
 1. 修复OCR常见错误（如"2O25" -> "2025"，"@4q.com" -> "@qq.com"）
@@ -128,30 +245,34 @@ class AIExtractor:
 3. 保持文本的原始结构和上下文位置
 4. 不要添加或删除内容，只进行修复和优化
 5. 保持页面分隔标记（如果有）
-
+{context}
 原始文本：
 {text}
 
 请只返回优化后的文本，不要添加任何说明或注释。"""
-        
-        try:
-            response = self._call_ai_api(prompt)
-            if response:
-                # 清理可能的markdown标记
-                optimized = response.strip()
-                if optimized.startswith('```'):
-                    # 移除markdown代码块标记
-                    lines = optimized.split('\n')
-                    if lines[0].startswith('```'):
-                        lines = lines[1:]
-                    if lines[-1].strip() == '```':
-                        lines = lines[:-1]
-                    optimized = '\n'.join(lines).strip()
-                return optimized
-            return None
-        except Exception as e:
-            print(f"AI文本优化调用失败: {e}")
+
+    def _optimized_acceptor(self, text: str):
+        """优化结果的缓存判断：去掉代码块标记后不少于原文的一半（拒答、截断的回复不缓存）"""
+        def accept(response: str) -> bool:
+            optimized = self._clean_optimized_text(response)
+            return bool(optimized) and len(optimized) >= len(text) * 0.5
+        return accept
+
+    @staticmethod
+    def _clean_optimized_text(response: Optional[str]) -> Optional[str]:
+        """清理AI返回的优化文本（去掉可能的markdown代码块标记）"""
+        if not response:
             return None
+        optimized = response.strip()
+        if optimized.startswith('```'):
+            # 移除markdown代码块标记
+            lines = optimized.split('\n')
+            if lines[0].startswith('```'):
+                lines = lines[1:]
+            if lines[-1].strip() == '```':
+                lines = lines[:-1]
+            optimized = '\n'.join(lines).strip()
+        return optimized
     
     def extract_with_ai(self, text: str, is_word_file: bool = False) -> Optional[Dict[str, Any]]:
         """
@@ -168,27 +289,127 @@ class AIExtractor:
             return None
             
         try:
-            # 目标：**尽量让AI看到完整的JSON结构，不再按字符数截断**
-            # 如果文本本身就是合法JSON（以 "{" 开头），只做“压缩格式”，不丢任何字段
-            text_stripped = text.lstrip()
-            if text_stripped.startswith('{'):
-                try:
-                    data = json.loads(text_stripped)
-                    # 使用紧凑格式，减少无意义空白，但保留全部内容
-                    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
-                except Exception:
-                    # 解析失败则按原样使用完整文本，不再做截断
-                    text = text
-
-            prompt = self._build_prompt(text, is_word_file=is_word_file)
-            response = self._call_ai_api(prompt)
-            
+            response = self._call_ai_api(self._build_extract_prompt(text, is_word_file), accept=self._is_valid_extraction)
             if response:
                 return self._parse_ai_response(response)
             return None
         except Exception as e:
             print(f"AI提取失败: {e}")
             return None
+
+    async def extract_with_ai_async(self, text: str, is_word_file: bool = False) -> Optional[Dict[str, Any]]:
+        """extract_with_ai 的协程版本（在 utils.ai_loop 的事件循环中执行）"""
+        if not self.enabled:
+            return None
+
+        try:
+            response = await self._call_ai_api_async(self._build_extract_prompt(text, is_word_file),
+                                                     accept=self._is_valid_extraction)
+            if response:
+                return self._parse_ai_response(response)
+            return None
+        except Exception as e:
+            print(f"AI提取失败: {e}")
+            return None
+
+    def optimize_and_extract(self, text: str, is_word_file: bool = False):
+        """
+        单次调用模式：一次请求同时完成文本修正和信息提取（代替 optimize_text_extraction + extract_with_ai 两次调用）
+        模型只返回需要修正的片段（不重复输出全文），修正在本地应用到原文上。
+
+        Args:
+            text: 原始提取的文本内容
+            is_word_file: 是否为Word文件
+
+        Returns:
+            (修正后的文本, 提取结果)；文本超过单次处理长度或调用/解析失败时返回None（调用方应退回两次调用）
+        """
+        if not self.enabled or len(text) > self.OPTIMIZE_CHUNK_SIZE:
+            return None
+        try:
+            response = self._call_ai_api(self._build_fused_prompt(text, is_word_file), accept=self._is_json_reply,
+                                         max_tokens=self.FUSED_MAX_TOKENS)
+            return self._parse_fused_response(text, response)
+        except Exception as e:
+            print(f"AI单次解析失败: {e}")
+            return None
+
+    async def optimize_and_extract_async(self, text: str, is_word_file: bool = False):
+        """optimize_and_extract 的协程版本（在 utils.ai_loop 的事件循环中执行）"""
+        if not self.enabled or len(text) > self.OPTIMIZE_CHUNK_SIZE:
+            return None
+        try:
+            response = await self._call_ai_api_async(self._build_fused_prompt(text, is_word_file),
+                                                     accept=self._is_json_reply, max_tokens=self.FUSED_MAX_TOKENS)
+            return self._parse_fused_response(text, response)
+        except Exception as e:
+            print(f"AI单次解析失败: {e}")
+            return None
+
+    def _build_fused_prompt(self, text: str, is_word_file: bool) -> str:
+        return self._build_extract_prompt(text, is_word_file) + """
+**文本修正（与信息提取在同一次回复中完成）：**
+原始文本可能含有OCR识别错误（如"2O25"应为"2025"，"@4q.com"应为"@qq.com"），或被换行分割的信息（如"北京\n公司"应为"北京公司"，"2019\n-\n2020"应为"2019-2020"）。
+请在返回的JSON中增加 "corrections" 字段，列出需要修正的片段，格式为：
+"corrections": [{"original": "原文中的片段", "corrected": "修正后的片段"}]
+- original 必须与原始文本中的内容完全一致（包括换行），并且在原始文本中只出现一次：
+  不要只写单个字符（如"O"），要带上足够的前后文字（如"2O25年"），出现多次的片段不会被修正
+- 各片段互不重叠，最多列出""" + str(self.FUSED_MAX_CORRECTIONS) + """处，优先列出影响姓名、联系方式、学校、公司、岗位、时间的修正
+- 不要添加或删除内容，只修复识别错误和被分割的信息；没有需要修正的内容时返回空数组
+- 提取上面的各项信息时，按修正后的内容提取
+"""
+
+    def _parse_fused_response(self, text: str, response: Optional[str]):
+        """解析单次调用的响应：返回 (修正后的文本, 提取结果)，失败返回None"""
+        if not response:
+            return None
+        data = self._load_ai_json(response)
+        if not isinstance(data, dict):
+            return None
+        corrected = self._apply_corrections(text, data.pop('corrections', None))
+        return corrected, self._normalize_ai_result(data)
+
+    @classmethod
+    def _apply_corrections(cls, text: str, corrections: Any) -> str:
+        """
+        把模型返回的修正片段应用到原文上
+        每个片段只在原文中恰好出现一次时修正（"O"→"0" 这类短片段出现多次时忽略，避免改坏全文）；
+        所有片段都按原文定位，后面的片段不会匹配到前面修正产生的文字，与已采用的片段重叠时忽略
+        """
+        if not isinstance(corrections, list):
+            return text
+        edits = []
+        for item in corrections[:cls.FUSED_MAX_CORRECTIONS]:
+            if not isinstance(item, dict):
+                continue
+            original, corrected = item.get('original'), item.get('corrected')
+            if isinstance(original, str) and isinstance(corrected, str) and original and text.count(original) == 1:
+                start = text.index(original)
+                edits.append((start, start + len(original), corrected))
+        parts = []
+        position = 0
+        for start, end, corrected in sorted(edits):
+            if start < position:
+                continue
+            parts.append(text[position:start])
+            parts.append(corrected)
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def _build_extract_prompt(self, text: str, is_word_file: bool) -> str:
+        # 目标：**尽量让AI看到完整的JSON结构，不再按字符数截断**
+        # 如果文本本身就是合法JSON（以 "{" 开头），只做“压缩格式”，不丢任何字段
+        text_stripped = text.lstrip()
+        if text_stripped.startswith('{'):
+            try:
+                data = json.loads(text_stripped)
+                # 使用紧凑格式，减少无意义空白，但保留全部内容
+                text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+            except Exception:
+                # 解析失败则按原样使用完整文本，不再做截断
+                pass
+        return self._build_prompt(text, is_word_file=is_word_file)
     
     def _smart_truncate_json(self, text: str, max_length: int) -> str:
         """
@@ -1180,54 +1401,117 @@ class AIExtractor:
 }}
 """
     
-    def _call_ai_api(self, prompt: str) -> Optional[str]:
-        """调用AI API（支持多种模型）"""
+    def _call_ai_api(self, prompt: str, use_cache: Optional[bool] = None,
+                     accept: Optional[Callable[[str], bool]] = None, max_tokens: int = 2000) -> Optional[str]:
+        """
+        调用AI API（支持多种模型；与其他线程和协程共用该服务商的限流器）
+
+        Args:
+            prompt: 提示词
+            use_cache: 是否读取AI响应缓存（默认取 self.use_cache；为False时总是请求接口）
+            accept: 判断回复是否可用的函数，只有可用的回复才写入缓存（未提供时不写入），
+                    避免拒答、JSON不完整等回复在缓存有效期内被反复使用
+            max_tokens: 回复的最大token数
+        """
+        try:
+            api_url, headers, data = self._build_request(prompt, max_tokens)
+            cache, key = self._cache_lookup_key(data)
+            if cache and (self.use_cache if use_cache is None else use_cache):
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+            with get_limiter(self.api_base).slot():
+                response = self._send_request(api_url, headers, data)
+            self._cache_store(cache, key, response, accept)
+            return response
+        except Exception as e:
+            print(f"AI API调用异常（模型: {self.model}）: {e}")
+            return None
+
+    async def _call_ai_api_async(self, prompt: str, use_cache: Optional[bool] = None,
+                                 accept: Optional[Callable[[str], bool]] = None,
+                                 max_tokens: int = 2000) -> Optional[str]:
+        """调用AI API（协程版本）：等待限流名额时不占用线程，请求在AI I/O线程池中发送"""
+        try:
+            api_url, headers, data = self._build_request(prompt, max_tokens)
+            cache, key = self._cache_lookup_key(data)
+            if cache and (self.use_cache if use_cache is None else use_cache):
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+            async with get_limiter(self.api_base).slot_async():
+                response = await ai_loop.run_in_io(self._send_request, api_url, headers, data)
+            self._cache_store(cache, key, response, accept)
+            return response
+        except Exception as e:
+            print(f"AI API调用异常（模型: {self.model}）: {e}")
+            return None
+
+    def _cache_store(self, cache, key: str, response: Optional[str], accept: Optional[Callable[[str], bool]]) -> None:
+        """调用方认可的回复写入缓存"""
+        if not cache or not response or accept is None:
+            return
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.api_key}'
+            accepted = accept(response)
+        except Exception:
+            accepted = False
+        if accepted:
+            cache.put(key, response, self.api_base, self.model)
+
+    def _cache_lookup_key(self, data: Dict[str, Any]):
+        """返回 (AI响应缓存, 缓存键)，缓存未启用时为 (None, None)"""
+        cache = get_ai_cache()
+        if cache is None:
+            return None, None
+        return cache, request_key(self.api_base, self.model, data.get('temperature'), data.get('messages'))
+
+    def _build_request(self, prompt: str, max_tokens: int = 2000):
+        """构建请求：返回 (API URL, 请求头, 请求数据)"""
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.api_key}'
+        }
+
+        # 根据模型类型构建请求数据
+        if 'claude' in self.model.lower():
+            # Claude模型使用不同的格式
+            data = {
+                'model': self.model,
+                'max_tokens': max_tokens,
+                'messages': [
+                    {
+                        'role': 'user',
+                        'content': f'你是一个专业的简历信息提取助手。请准确提取简历中的关键信息，并以JSON格式返回。\n\n{prompt}'
+                    }
+                ]
             }
-            
-            # 根据模型类型构建请求数据
-            if 'claude' in self.model.lower():
-                # Claude模型使用不同的格式
-                data = {
-                    'model': self.model,
-                    'max_tokens': 2000,
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': f'你是一个专业的简历信息提取助手。请准确提取简历中的关键信息，并以JSON格式返回。\n\n{prompt}'
-                        }
-                    ]
-                }
-            else:
-                # OpenAI兼容格式（包括DeepSeek、Qwen等）
-                data = {
-                    'model': self.model,
-                    'messages': [
-                        {
-                            'role': 'system',
-                            'content': '你是一个专业的简历信息提取助手。请准确提取简历中的关键信息，并以JSON格式返回。'
-                        },
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ],
-                    'temperature': 0.1,  # 降低随机性，提高准确性
-                    'max_tokens': 2000
-                }
-            
-            # 构建完整的API URL
-            api_url = f'{self.api_base}{self.api_endpoint}'
-            
-            response = requests.post(
-                api_url,
-                headers=headers,
-                json=data,
-                timeout=60  # 增加超时时间，某些模型可能需要更长时间
-            )
+        else:
+            # OpenAI兼容格式（包括DeepSeek、Qwen等）
+            data = {
+                'model': self.model,
+                'messages': [
+                    {
+                        'role': 'system',
+                        'content': '你是一个专业的简历信息提取助手。请准确提取简历中的关键信息，并以JSON格式返回。'
+                    },
+                    {
+                        'role': 'user',
+                        'content': prompt
+                    }
+                ],
+                'temperature': 0.1,  # 降低随机性，提高准确性
+                'max_tokens': max_tokens
+            }
+
+        # 构建完整的API URL
+        api_url = f'{self.api_base}{self.api_endpoint}'
+        return api_url, headers, data
+
+    def _send_request(self, api_url: str, headers: Dict[str, str], data: Dict[str, Any]) -> Optional[str]:
+        """发送请求并取出模型返回的文本"""
+        try:
+            # 复用该服务商的连接池（keep-alive），429/5xx/连接失败时退避重试；超时见 Config.AI_HTTP_*
+            response = post_json(self.api_base, api_url, headers, data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -1263,30 +1547,58 @@ class AIExtractor:
     def _parse_ai_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """解析AI返回的JSON响应"""
         try:
-            # 尝试提取JSON部分（可能包含markdown代码块）
-            text = response_text.strip()
-            
-            # 移除可能的markdown代码块标记
-            if text.startswith('```json'):
-                text = text[7:]
-            elif text.startswith('```'):
-                text = text[3:]
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
-            
-            # 解析JSON
-            data = json.loads(text)
+            data = self._load_ai_json(response_text)
+            if data is None:
+                return None
             
             # 验证和规范化数据
             return self._normalize_ai_result(data)
             
-        except json.JSONDecodeError as e:
-            print(f"AI响应JSON解析失败: {e}, 响应内容: {response_text[:200]}")
-            return None
         except Exception as e:
             print(f"解析AI响应异常: {e}")
             return None
+
+    def _is_valid_extraction(self, response: str) -> bool:
+        """信息提取的回复能否解析出结果（用于决定是否写入缓存）"""
+        return self._parse_ai_response(response) is not None
+
+    @classmethod
+    def _is_json_reply(cls, response: str) -> bool:
+        """回复是否为完整的JSON对象（单次调用模式的缓存判断；被截断的回复不缓存）"""
+        return isinstance(cls._load_ai_json(response), dict)
+
+    @staticmethod
+    def has_json_object(response: str) -> bool:
+        """
+        回复中是否包含可解析的JSON对象（与匹配分析、面试分析解析回复的方式一致：取第一个"{"到最后一个"}"）
+        供这些调用方作为 _call_ai_api 的 accept 参数
+        """
+        match = re.search(r'\{.*\}', response, re.DOTALL)
+        try:
+            return isinstance(json.loads(match.group() if match else response), dict)
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _load_ai_json(response_text: str) -> Optional[Any]:
+        """解析AI返回的JSON（可能包含markdown代码块），解析失败返回None"""
+        # 尝试提取JSON部分（可能包含markdown代码块）
+        text = response_text.strip()
+        
+        # 移除可能的markdown代码块标记
+        if text.startswith('```json'):
+            text = text[7:]
+        elif text.startswith('```'):
+            text = text[3:]
+        if text.endswith('```'):
+            text = text[:-3]
+        text = text.strip()
+        
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"AI响应JSON解析失败: {e}, 响应内容: {response_text[:200]}")
+            return None
     
     def _normalize_ai_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """规范化AI返回的结果"""
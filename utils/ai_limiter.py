@@ -0,0 +1,175 @@
+"""
+AI服务商请求限流
+每个服务商（按 api_base 区分）一个限流器：并发请求数上限（Config.AI_PROVIDER_MAX_CONCURRENCY）
++ 令牌桶（每秒 Config.AI_PROVIDER_RATE 个请求，允许 Config.AI_PROVIDER_BURST 个突发）。
+同步调用（请求线程中的匹配分析等）和事件循环中的协程（解析任务的AI阶段）共用同一个限流器，
+请求名额按先来先得的顺序交给等待者，协程等待时不占用线程。
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, List
+
+
+class ProviderLimiter:
+    """单个服务商的并发上限 + 令牌桶（线程安全，可在多个事件循环中使用）"""
+
+    def __init__(self, max_concurrency: int, rate: float = 0, burst: int = 1):
+        """
+        Args:
+            max_concurrency: 同时进行的请求数上限
+            rate: 每秒请求数（0为不限速）
+            burst: 令牌桶容量（空闲后允许连续发出的请求数）
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.total = 0  # 已放行的请求数
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters = deque()  # threading.Event 或 (事件循环, Future)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    # ---- 并发名额 ----
+
+    def _take_nowait(self) -> bool:
+        """有空闲名额且无人排队时直接占用（调用方持有锁）"""
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """归还名额：有等待者时直接转交给最早的等待者"""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(self._hand_over, future)
+                    return
+                except RuntimeError:
+                    # 等待者所在的事件循环已关闭
+                    continue
+            self._in_flight -= 1
+
+    @staticmethod
+    def _hand_over(future) -> None:
+        # 已取消的等待者在取消处理中归还名额（见 acquire_async）
+        if not future.done():
+            future.set_result(None)
+
+    # ---- 令牌桶 ----
+
+    def _reserve_token(self) -> float:
+        """预约一个令牌，返回需要等待的秒数（令牌可以透支，按预约顺序依次放行）"""
+        with self._lock:
+            self.total += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    # ---- 同步接口 ----
+
+    def acquire(self) -> None:
+        with self._lock:
+            event = None if self._take_nowait() else threading.Event()
+            if event is not None:
+                self._waiters.append(event)
+        if event is not None:
+            event.wait()
+        delay = self._reserve_token()
+        if delay:
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    # ---- 协程接口 ----
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = None if self._take_nowait() else loop.create_future()
+            if future is not None:
+                self._waiters.append((loop, future))
+        if future is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._waiters.remove((loop, future))
+                        handed_over = False
+                    except ValueError:
+                        handed_over = True
+                if handed_over:
+                    self.release()
+                raise
+        try:
+            delay = self._reserve_token()
+            if delay:
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    @asynccontextmanager
+    async def slot_async(self):
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(api_base: str) -> ProviderLimiter:
+    """获取 api_base 对应服务商的限流器（首次使用时按 Config.AI_PROVIDER_* 创建）"""
+    from config import Config
+
+    key = api_base.rstrip('/')
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderLimiter(Config.AI_PROVIDER_MAX_CONCURRENCY, Config.AI_PROVIDER_RATE,
+                                      Config.AI_PROVIDER_BURST)
+            _limiters[key] = limiter
+    return limiter
+
+
+def limiter_stats() -> List[Dict]:
+    """各服务商当前的请求数、排队数和累计放行数（供 /metrics 使用）"""
+    with _limiters_lock:
+        items = list(_limiters.items())
+    return [{'provider': key, 'in_flight': limiter.in_flight, 'waiting': limiter.waiting, 'total': limiter.total}
+            for key, limiter in items]
@@ -0,0 +1,72 @@
+"""
+AI调用事件循环
+解析工作线程把AI阶段（文本优化、信息提取）作为协程提交到常驻的事件循环中执行（submit），
+提交后不等待结果，工作线程继续处理其他任务；
+多个简历的AI请求在同一个循环里排队，由 utils.ai_limiter 按服务商限制并发数和请求速率。
+发送请求本身使用 requests 连接池（utils.http_pool），在固定大小的I/O线程池中执行（Config.AI_IO_THREADS），
+因此无论排队多少简历，AI阶段占用的线程数都是固定的。
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    from config import Config
+
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=max(1, Config.AI_IO_THREADS), thread_name_prefix='ai-io')
+        return _io_executor
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """获取常驻事件循环（首次使用时在后台线程中启动）"""
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            _loop_thread = threading.Thread(target=run, name='ai-event-loop', daemon=True)
+            _loop_thread.start()
+            ready.wait()
+            _loop = loop
+        return _loop
+
+
+def submit(coro: Coroutine) -> Future:
+    """把协程提交到常驻事件循环执行，立即返回 concurrent.futures.Future（不等待结果）"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    在常驻事件循环中执行协程并等待结果（供同步代码调用）
+
+    Raises:
+        RuntimeError: 在事件循环线程内调用（会死锁）
+    """
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError('不能在AI事件循环线程中同步等待协程')
+    return submit(coro).result(timeout)
+
+
+async def run_in_io(func: Callable, *args, **kwargs) -> Any:
+    """在AI I/O线程池中执行阻塞调用（如发送HTTP请求）"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_executor(), functools.partial(func, *args, **kwargs))
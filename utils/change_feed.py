@@ -0,0 +1,209 @@
+"""
+数据变更版本（/api/sync/check）
+resumes/interviews/positions 上的触发器在每次新增、修改、删除时向 change_log 追加一行（自增序号 seq），
+并把 change_versions 中该表的版本号更新为这个序号：版本号只增不减，重启后不丢失，任何写入路径都会经过。
+
+前端带上次拿到的各表版本号来检查，服务端只需比较版本号（读取三行的 change_versions，且在进程内缓存），
+不再对各表执行 COUNT；需要时再按 seq 从 change_log 取出客户端版本之后变化的记录ID。
+change_log 只保留最近 CHANGE_LOG_RETENTION 条，客户端版本早于保留范围时返回 truncated，由前端整表刷新。
+
+/api/sync/events 的推送连接通过 ChangeFeed.wait_for_change() 等待：本进程提交修改时立即唤醒，
+其他进程的写入在缓存有效期后被发现；同时在线的推送连接数有上限（见 ChangeFeed.subscribe）。
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+CHANGE_LOG_TABLE = 'change_log'
+CHANGE_VERSIONS_TABLE = 'change_versions'
+
+# 参与实时同步的表
+SYNC_TABLES = ('resumes', 'interviews', 'positions')
+
+# change_log 保留的最近变更条数（由触发器在写入时清理更早的记录）
+CHANGE_LOG_RETENTION = 10000
+
+
+def _change_triggers() -> List[str]:
+    statements = []
+    for table in SYNC_TABLES:
+        for op, row in (('insert', 'new'), ('update', 'new'), ('delete', 'old')):
+            name = f"{table}_change_{op}"
+            statements += [
+                f"DROP TRIGGER IF EXISTS {name}",
+                (f"CREATE TRIGGER {name} AFTER {op.upper()} ON {table} BEGIN "
+                 f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id, op) VALUES ('{table}', {row}.id, '{op}'); "
+                 f"INSERT INTO {CHANGE_VERSIONS_TABLE} (table_name, version) "
+                 f"SELECT '{table}', max(seq) FROM {CHANGE_LOG_TABLE} WHERE true "
+                 f"ON CONFLICT (table_name) DO UPDATE SET version = excluded.version; "
+                 f"END"),
+            ]
+    statements += [
+        "DROP TRIGGER IF EXISTS change_log_prune",
+        (f"CREATE TRIGGER change_log_prune AFTER INSERT ON {CHANGE_LOG_TABLE} BEGIN "
+         f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq <= new.seq - {int(CHANGE_LOG_RETENTION)}; "
+         f"END"),
+    ]
+    return statements
+
+
+# 按表查找变更的索引和维护触发器（在 models.INDEX_MIGRATIONS 中执行）
+CHANGE_FEED_MIGRATION = [
+    f"CREATE INDEX IF NOT EXISTS ix_change_log_table_seq ON {CHANGE_LOG_TABLE} (table_name, seq)",
+] + _change_triggers()
+
+
+def read_versions(db) -> Dict[str, int]:
+    """从 change_versions 读取各表当前版本号（没有变更过的表为0）"""
+    from models import ChangeVersion
+
+    versions = dict.fromkeys(SYNC_TABLES, 0)
+    for table_name, version in db.query(ChangeVersion.table_name, ChangeVersion.version):
+        if table_name in versions:
+            versions[table_name] = int(version or 0)
+    return versions
+
+
+def changes_since(db, table: str, since: int, limit: int) -> Dict:
+    """
+    某张表在版本 since 之后变化的记录
+
+    Args:
+        db: 数据库会话
+        table: SYNC_TABLES 之一
+        since: 客户端持有的版本号
+        limit: 最多返回的记录ID数
+
+    Returns:
+        {'ids': 新增或修改的ID, 'deleted': 已删除的ID, 'truncated': 变更超出保留范围或数量上限时为True（需整表刷新）}
+    """
+    from sqlalchemy import func
+    from models import ChangeLog
+
+    if since >= read_versions(db)[table]:
+        return {'ids': [], 'deleted': [], 'truncated': False}
+    oldest = db.query(func.min(ChangeLog.seq)).scalar()
+    if oldest is None or since < oldest - 1:
+        return {'ids': [], 'deleted': [], 'truncated': True}
+
+    # 同一记录多次变化时以最后一次为准
+    latest = {}
+    rows = (db.query(ChangeLog.row_id, ChangeLog.op)
+            .filter(ChangeLog.table_name == table, ChangeLog.seq > since)
+            .order_by(ChangeLog.seq))
+    for row_id, op in rows:
+        latest.pop(row_id, None)
+        latest[row_id] = op
+        if len(latest) > limit:
+            return {'ids': [], 'deleted': [], 'truncated': True}
+    return {
+        'ids': [row_id for row_id, op in latest.items() if op != 'delete'],
+        'deleted': [row_id for row_id, op in latest.items() if op == 'delete'],
+        'truncated': False,
+    }
+
+
+class ChangeFeed:
+    """
+    各表版本号的进程内缓存：有效期内直接返回缓存的版本号；
+    本进程提交了对同步表的修改后立即失效（其他进程或原生SQL的写入在有效期后可见）
+    """
+
+    def __init__(self, ttl: float, max_subscribers: int = 0):
+        self.ttl = ttl
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._versions: Optional[Dict[str, int]] = None
+        self._loaded_at = 0.0
+        self._generation = 0  # 每次失效加1，读取期间发生失效时不缓存读到的旧版本号
+        self._subscribers = 0
+
+    def versions(self, db) -> Dict[str, int]:
+        with self._lock:
+            if self._versions is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return dict(self._versions)
+            generation = self._generation
+        versions = read_versions(db)
+        with self._lock:
+            if generation == self._generation:
+                self._versions = versions
+                self._loaded_at = time.monotonic()
+        return dict(versions)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._versions = None
+            self._generation += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, since: Dict[str, int], timeout: float, session_factory) -> Optional[Dict[str, int]]:
+        """
+        等待任一表的版本号超过 since
+
+        Args:
+            since: 客户端持有的各表版本号
+            timeout: 最长等待秒数
+            session_factory: 读取版本号时创建数据库会话（每次读取后关闭，等待期间不占用连接）
+
+        Returns:
+            有变化时返回当前各表版本号，超时返回None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                generation = self._generation
+            db = session_factory()
+            try:
+                versions = self.versions(db)
+            finally:
+                db.close()
+            if any(versions[table] > since.get(table, 0) for table in SYNC_TABLES):
+                return versions
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            with self._lock:
+                # 缓存过期后重新读取，以发现其他进程的写入
+                if generation == self._generation:
+                    self._changed.wait(min(remaining, max(self.ttl, 0.1)))
+
+    def subscribe(self) -> bool:
+        """登记一个推送连接，已达上限（max_subscribers，0为不限）时返回False"""
+        with self._lock:
+            if self.max_subscribers and self._subscribers >= self.max_subscribers:
+                return False
+            self._subscribers += 1
+            return True
+
+    def unsubscribe(self) -> None:
+        with self._lock:
+            self._subscribers = max(self._subscribers - 1, 0)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return self._subscribers
+
+    def invalidate_on_commit(self, *models) -> None:
+        """任一会话提交了这些模型的新增、修改或删除后清空缓存（flush 时记录，commit 后清空，避免读到未提交的版本）"""
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        key = ('change_feed_dirty', id(self))
+
+        @event.listens_for(Session, 'after_flush')
+        def _mark_changed(session, flush_context):
+            for obj in (*session.new, *session.dirty, *session.deleted):
+                if isinstance(obj, models):
+                    session.info[key] = True
+                    return
+
+        @event.listens_for(Session, 'after_commit')
+        def _clear_versions(session):
+            if session.info.pop(key, False):
+                self.invalidate()
+
+        @event.listens_for(Session, 'after_rollback')
+        def _discard_mark(session):
+            session.info.pop(key, None)
@@ -2,7 +2,35 @@
 简历查重工具
 计算两个简历的相似度，判断是否为重复简历
 """
-from typing import Optional, Tuple
+import re
+from typing import Optional, Tuple, Dict, List
+
+
+# 强身份键：完整手机号/邮箱相同基本可以确定是同一人，候选数量不设上限
+STRONG_IDENTITY_KEYS = ('phone_key', 'email_key')
+
+
+def identity_keys(name: Optional[str], phone: Optional[str], email: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    生成查重用的归一化身份键（存入 resumes 表的索引列，用于快速查找候选简历）
+
+    Returns:
+        phone_key: 手机号数字
+        phone_tail: 手机号后7位
+        email_key: 小写邮箱
+        email_local: 邮箱用户名部分
+        name_key: 去除空白并小写的姓名
+    """
+    phone_key = ''.join(filter(str.isdigit, phone)) if phone else ''
+    email_key = email.strip().lower() if email else ''
+    name_key = re.sub(r'\s+', '', name).lower() if name else ''
+    return {
+        'phone_key': phone_key or None,
+        'phone_tail': phone_key[-7:] if len(phone_key) >= 7 else None,
+        'email_key': email_key or None,
+        'email_local': (email_key.split('@')[0] or None) if '@' in email_key else None,
+        'name_key': name_key or None,
+    }
 
 
 def calculate_similarity(resume1, resume2) -> float:
@@ -189,3 +217,40 @@ def check_duplicate(new_resume, existing_resumes) -> Tuple[Optional[int], float]
             duplicate_id = existing.id
     
     return (duplicate_id, max_similarity)
+
+
+def load_duplicate_candidates(db, new_resume) -> List:
+    """
+    查找可能与新简历重复的已解析简历
+
+    只取与新简历共享任一身份键（手机号、手机号后7位、邮箱、邮箱用户名、姓名）的简历，
+    通过索引查询，不再加载全部简历；正文存放在 resume_texts 表，这里不会读取。
+    完整手机号/邮箱相同的简历全部返回；只共享手机号后7位、邮箱用户名或姓名的简历
+    （常见姓名可能很多）按上传先后取最近的 Config.DUPLICATE_MAX_CANDIDATES 份。
+    新简历没有任何身份键，或启用了 Config.DUPLICATE_FULL_SCAN 时，退回全表扫描。
+    """
+    from sqlalchemy import or_
+    from config import Config
+    from models import Resume
+
+    query = db.query(Resume).filter(
+        Resume.parse_status == 'success',
+        Resume.id != new_resume.id
+    )
+    if Config.DUPLICATE_FULL_SCAN:
+        return query.all()
+
+    keys = identity_keys(new_resume.name, new_resume.phone, new_resume.email)
+    strong = [getattr(Resume, column) == keys[column] for column in STRONG_IDENTITY_KEYS if keys[column]]
+    weak = [getattr(Resume, column) == value for column, value in keys.items()
+            if value and column not in STRONG_IDENTITY_KEYS]
+    if not strong and not weak:
+        return query.all()
+
+    candidates = query.filter(or_(*strong)).all() if strong else []
+    if weak:
+        weak_query = query.filter(or_(*weak))
+        if candidates:
+            weak_query = weak_query.filter(Resume.id.notin_([r.id for r in candidates]))
+        candidates += weak_query.order_by(Resume.id.desc()).limit(Config.DUPLICATE_MAX_CANDIDATES).all()
+    return candidates
@@ -0,0 +1,207 @@
+"""
+简历提取结果缓存（内容寻址）
+以文件内容的SHA-256 + 提取器版本为键，缓存提取的文本和规则提取结果，
+相同文件重复上传或重新解析时跳过PDF解析与规则提取。
+缓存以JSON文件形式保存在磁盘上，按总大小限制进行LRU淘汰。
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Tuple
+
+# 提取器版本：修改文本提取或规则提取逻辑后需递增，使旧缓存失效
+EXTRACTOR_VERSION = 3
+
+
+def file_sha256(file_path: str) -> str:
+    """计算文件内容的SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file_hash: str, extractor: str = 'resume') -> str:
+    """
+    生成缓存键
+
+    Args:
+        file_hash: 文件内容的SHA-256
+        extractor: 提取流程名称（不同提取流程的结果互不复用）
+    """
+    from config import Config
+    mode = 'tiered' if Config.PDF_TIERED_EXTRACTION else 'full'
+    return f"{file_hash}-{extractor}-v{EXTRACTOR_VERSION}-{mode}"
+
+
+class ExtractionCache:
+    """磁盘缓存（线程安全，按总大小LRU淘汰）"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # key -> 文件大小，按最近使用时间排序（最旧的在前）
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> None:
+        """启动时按文件修改时间重建LRU索引"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存
+
+        Returns:
+            {'text': 提取的文本, 'info': 规则提取结果或None}，未命中返回None
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, text: str, info: Optional[Dict[str, Any]] = None) -> None:
+        """写入缓存（已存在则覆盖），超出容量时淘汰最久未使用的条目"""
+        data = json.dumps({'text': text, 'info': info}, ensure_ascii=False).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入提取缓存失败: {e}")
+            return
+
+        with self._lock:
+            self._drop(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes and self._index:
+                oldest = next(iter(self._index))
+                self._drop(oldest)
+                self.evictions += 1
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def _drop(self, key: str) -> None:
+        """从索引中移除（调用方需持有锁）"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._index),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """获取全局提取缓存实例（未启用时返回None）"""
+    global _cache
+    from config import Config
+
+    if not Config.EXTRACTION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache(Config.EXTRACTION_CACHE_FOLDER, Config.EXTRACTION_CACHE_MAX_MB * 1024 * 1024)
+        return _cache
+
+
+def extract_with_cache(file_path: str, extractor: str,
+                       extract_text_func: Callable[[str], str],
+                       extract_info_func: Callable[[str], Dict[str, Any]],
+                       cache: Optional[ExtractionCache] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    带缓存的文本提取 + 规则提取（供重新解析脚本使用）
+
+    Args:
+        file_path: 简历文件路径
+        extractor: 提取流程名称（参与缓存键）
+        extract_text_func: 文本提取函数 f(file_path) -> text
+        extract_info_func: 规则提取函数 f(text) -> info
+        cache: 使用的缓存实例，默认使用全局缓存
+
+    Returns:
+        (text, info)，文本提取失败时 text 为空、info 为 None
+    """
+    cache = cache or get_extraction_cache()
+    key = cache_key(file_sha256(file_path), extractor) if cache else None
+
+    entry = cache.get(key) if cache else None
+    if entry and entry.get('info') is not None:
+        return entry['text'], entry['info']
+
+    text = entry['text'] if entry else extract_text_func(file_path)
+    if not text:
+        return text, None
+    info = extract_info_func(text)
+    if cache:
+        cache.put(key, text, info)
+    return text, info
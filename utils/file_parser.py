@@ -6,27 +6,11 @@
 import os
 import re
 
-# 可选导入 PyMuPDF (fitz)
-try:
-    import fitz  # PyMuPDF
-    FITZ_AVAILABLE = True
-except ImportError:
-    FITZ_AVAILABLE = False
-
-# 可选导入 pdfplumber
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
-# 可选导入 OCR (Tesseract)
-try:
-    import pytesseract
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+# PDF解析库的可选导入统一在 utils.pdf_engine 中处理
+from utils.pdf_engine import (
+    PDFDocument, join_pages, is_valid_text_pdf,
+    FITZ_AVAILABLE, PDFPLUMBER_AVAILABLE, OCR_AVAILABLE
+)
 
 # 可选导入 python-docx
 try:
@@ -120,118 +104,49 @@ def extract_text_from_pdf(file_path, use_ai=True, use_ocr=True):
         'error': None
     }
     
-    # ========================================================================
-    # 策略1: PyMuPDF 提取（最快，适合文本PDF）
-    # ========================================================================
-    if FITZ_AVAILABLE:
-        try:
-            pdf_doc = fitz.open(file_path)
-            total_pages = len(pdf_doc)
-            page_texts = []
-            
-            for page_num in range(total_pages):
-                page = pdf_doc[page_num]
-                page_text = page.get_text()
-                
-                if page_text and isinstance(page_text, str):
-                    page_text_cleaned = page_text.strip()
-                    if page_text_cleaned:
-                        if total_pages > 1:
-                            page_texts.append(f"--- 第{page_num + 1}页 ---\n{page_text_cleaned}")
-                        else:
-                            page_texts.append(page_text_cleaned)
-            
-            pdf_doc.close()
-            text = "\n\n".join(page_texts)
-            text_stripped = text.strip()
-            
-            # 判断是否为有效文本PDF
-            if text_stripped:
-                total_chars = len(text_stripped)
-                chinese_chars = len(re.findall(r'[\u4e00-\u9fa5]', text_stripped))
-                unique_chars = len(set(text_stripped))
-                chinese_ratio = chinese_chars / total_chars if total_chars > 0 else 0
+    # 整个解析过程只打开一次PDF，三种策略共用同一份文档
+    try:
+        doc = PDFDocument(file_path)
+    except Exception as e:
+        print(f"打开PDF失败: {e}")
+        return ""
+    
+    with doc:
+        # ====================================================================
+        # 策略1: PyMuPDF 提取（最快，适合文本PDF）
+        # 策略2: pdfplumber 提取（备用，适合复杂布局）
+        # ====================================================================
+        for method, get_pages in (('PyMuPDF', doc.page_texts), ('pdfplumber', doc.plumber_page_texts)):
+            try:
+                text_stripped = join_pages(get_pages(), page_markers=True).strip()
                 
-                # 有效文本PDF判断标准
-                if total_chars >= 200 and chinese_chars >= 50 and chinese_ratio >= 0.1 and unique_chars >= 50:
-                    results['method'] = 'PyMuPDF'
+                # 判断是否为有效文本PDF
+                if text_stripped and is_valid_text_pdf(text_stripped):
+                    results['method'] = method
                     results['text'] = clean_text(text_stripped)
                     results['success'] = True
                     return results['text']
-        except Exception as e:
-            print(f"PyMuPDF解析失败: {e}")
-    
-    # ========================================================================
-    # 策略2: pdfplumber 提取（备用，适合复杂布局）
-    # ========================================================================
-    if PDFPLUMBER_AVAILABLE:
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                page_texts = []
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text and page_text.strip():
-                        if len(pdf.pages) > 1:
-                            page_texts.append(f"--- 第{page_num + 1}页 ---\n{page_text.strip()}")
-                        else:
-                            page_texts.append(page_text.strip())
-                
-                text = "\n\n".join(page_texts)
-                text_stripped = text.strip()
-                
-                if text_stripped:
-                    total_chars = len(text_stripped)
-                    chinese_chars = len(re.findall(r'[\u4e00-\u9fa5]', text_stripped))
-                    unique_chars = len(set(text_stripped))
-                    chinese_ratio = chinese_chars / total_chars if total_chars > 0 else 0
-                    
-                    if total_chars >= 200 and chinese_chars >= 50 and chinese_ratio >= 0.1 and unique_chars >= 50:
-                        results['method'] = 'pdfplumber'
-                        results['text'] = clean_text(text_stripped)
-                        results['success'] = True
-                        return results['text']
-        except Exception as e:
-            print(f"pdfplumber解析失败: {e}")
-    
-    # ========================================================================
-    # 策略3: OCR 提取（最后手段，适合扫描件）
-    # ========================================================================
-    if use_ocr and OCR_AVAILABLE:
-        try:
-            # 将PDF转换为图片，然后OCR
-            if FITZ_AVAILABLE:
-                pdf_doc = fitz.open(file_path)
-                ocr_texts = []
-                
-                for page_num in range(len(pdf_doc)):
-                    page = pdf_doc[page_num]
-                    # 将页面渲染为图片
-                    mat = fitz.Matrix(2.0, 2.0)  # 放大2倍提高OCR准确度
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("png")
-                    
-                    # 使用PIL打开图片
-                    from io import BytesIO
-                    img = Image.open(BytesIO(img_data))
-                    
-                    # OCR识别（支持中英文）
-                    ocr_text = pytesseract.image_to_string(img, lang='chi_sim+eng')
-                    if ocr_text and ocr_text.strip():
-                        ocr_texts.append(f"--- 第{page_num + 1}页 ---\n{ocr_text.strip()}")
-                
-                pdf_doc.close()
+            except Exception as e:
+                print(f"{method}解析失败: {e}")
+        
+        # ====================================================================
+        # 策略3: OCR 提取（最后手段，适合扫描件）
+        # ====================================================================
+        if use_ocr and OCR_AVAILABLE:
+            try:
+                # 将PDF页面渲染为位图，由OCR工作池按页并行识别（结果按页码顺序返回）
+                ocr_texts = [f"--- 第{p['page']}页 ---\n{p['text']}" for p in doc.ocr_page_texts() if p['text']]
                 
                 if ocr_texts:
-                    text = "\n\n".join(ocr_texts)
-                    text_stripped = text.strip()
+                    text_stripped = "\n\n".join(ocr_texts).strip()
                     
                     if text_stripped and len(text_stripped) >= 100:
                         results['method'] = 'OCR'
                         results['text'] = clean_text(text_stripped)
                         results['success'] = True
                         return results['text']
-        except Exception as e:
-            print(f"OCR解析失败: {e}")
+            except Exception as e:
+                print(f"OCR解析失败: {e}")
     
     # ========================================================================
     # 所有方法都失败，返回空字符串（将由AI API处理）
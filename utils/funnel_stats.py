@@ -0,0 +1,242 @@
+"""
+招聘漏斗统计（/api/statistics）
+按岗位分组聚合：简历表一条 GROUP BY 查询，面试表一条 GROUP BY 查询（到面/通过/offer/入职用条件求和），
+查询次数不随岗位数量增长；合计由各分组（含未填岗位的记录）相加得到。
+
+按日汇总表 funnel_daily：每行是 (日期, 岗位, 创建者) 当天各指标的数量，由 resumes/interviews 上的触发器
+在写入时增量维护（任何写入路径都会经过），统计任意日期范围只需对汇总行求和，不再扫描原始记录、比较字符串日期。
+创建者对应 users.username，部门/小组统计可按创建者关联用户表得到。汇总表可随时用 rebuild_funnel_daily() 整表重建。
+
+各指标的口径：
+- resume_count: 简历数（按简历上传时间）
+- interview_count: 到面数（按一面时间，指定日期范围时只统计有一面时间的记录）
+- pass_count: 通过数（状态为 PASS_STATUSES 之一，按面试记录创建时间）
+- offer_count: offer数（已发offer且有offer日期，按offer日期）
+- onboard_count: 入职数（已入职且有入职日期，按入职日期）
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+FUNNEL_DAILY_TABLE = 'funnel_daily'
+
+PASS_STATUSES = ('面试通过', '已发offer', '已入职')
+
+FUNNEL_METRICS = ('resume_count', 'interview_count', 'pass_count', 'offer_count', 'onboard_count')
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {metric: 0 for metric in FUNNEL_METRICS}
+
+
+def _count_where(conditions):
+    """满足全部条件的行数（条件为空时即分组行数）"""
+    from sqlalchemy import func, case, and_
+
+    if not conditions:
+        return func.count()
+    return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+
+def funnel_counts_by_position(db, start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None,
+                              start_date: str = '', end_date: str = '',
+                              position: Optional[str] = None) -> Dict[Optional[str], Dict[str, int]]:
+    """
+    按岗位统计漏斗各指标
+
+    Args:
+        db: 数据库会话
+        start_dt / end_dt: 时间范围（简历上传时间、面试记录创建时间使用）
+        start_date / end_date: 日期字符串 YYYY-MM-DD（一面时间、offer日期、入职日期为字符串列，按字符串比较）
+        position: 只统计该岗位
+
+    Returns:
+        {岗位: {指标: 数量}}，未填岗位的记录归在 None 或 '' 下
+    """
+    from sqlalchemy import func
+    from models import Resume, Interview
+
+    counts = {}
+
+    resume_query = db.query(Resume.applied_position, func.count())
+    if start_dt is not None:
+        resume_query = resume_query.filter(Resume.upload_time >= start_dt)
+    if end_dt is not None:
+        resume_query = resume_query.filter(Resume.upload_time <= end_dt)
+    if position:
+        resume_query = resume_query.filter(Resume.applied_position == position)
+    for pos, count in resume_query.group_by(Resume.applied_position):
+        counts.setdefault(pos, _empty_counts())['resume_count'] = count
+
+    interview_conditions = []
+    if start_date:
+        interview_conditions += [Interview.round1_time.isnot(None), Interview.round1_time >= start_date]
+    if end_date:
+        interview_conditions.append(Interview.round1_time <= end_date)
+
+    pass_conditions = [Interview.status.in_(PASS_STATUSES)]
+    if start_dt is not None:
+        pass_conditions.append(Interview.create_time >= start_dt)
+    if end_dt is not None:
+        pass_conditions.append(Interview.create_time <= end_dt)
+
+    offer_conditions = [Interview.offer_issued == 1, Interview.offer_date.isnot(None), Interview.offer_date != '']
+    if start_date:
+        offer_conditions.append(Interview.offer_date >= start_date)
+    if end_date:
+        offer_conditions.append(Interview.offer_date <= end_date)
+
+    onboard_conditions = [Interview.onboard == 1, Interview.onboard_date.isnot(None), Interview.onboard_date != '']
+    if start_date:
+        onboard_conditions.append(Interview.onboard_date >= start_date)
+    if end_date:
+        onboard_conditions.append(Interview.onboard_date <= end_date)
+
+    interview_query = db.query(
+        Interview.applied_position,
+        _count_where(interview_conditions),
+        _count_where(pass_conditions),
+        _count_where(offer_conditions),
+        _count_where(onboard_conditions),
+    )
+    if position:
+        interview_query = interview_query.filter(Interview.applied_position == position)
+    for pos, interview_count, pass_count, offer_count, onboard_count in interview_query.group_by(Interview.applied_position):
+        entry = counts.setdefault(pos, _empty_counts())
+        entry.update(interview_count=interview_count, pass_count=pass_count,
+                     offer_count=offer_count, onboard_count=onboard_count)
+    return counts
+
+
+def funnel_totals(counts: Dict[Optional[str], Dict[str, int]]) -> Dict[str, int]:
+    """各岗位（含未填岗位）合计"""
+    totals = _empty_counts()
+    for entry in counts.values():
+        for metric in FUNNEL_METRICS:
+            totals[metric] += entry[metric]
+    return totals
+
+
+def funnel_rows(counts: Dict[Optional[str], Dict[str, int]]) -> List[Dict]:
+    """
+    按岗位名排序的统计行：只列出时间范围内有简历或到面记录的岗位（不含未填岗位）
+    """
+    rows = []
+    for pos in sorted(pos for pos in counts if pos):
+        entry = counts[pos]
+        if entry['resume_count'] or entry['interview_count']:
+            rows.append({'position': pos, **entry})
+    return rows
+
+
+# 各指标在汇总表中的 (列名, 来源表, 日期表达式, 计入条件)；{p} 为行别名，日期为空的记录归入 day=''
+_ROLLUP_METRICS = (
+    ('resume_count', 'resumes', "coalesce(date({p}.upload_time), '')", None),
+    ('interview_count', 'interviews', "coalesce(substr({p}.round1_time, 1, 10), '')", None),
+    ('pass_count', 'interviews', "coalesce(date({p}.create_time), '')",
+     "{p}.status IN (" + ', '.join(f"'{status}'" for status in PASS_STATUSES) + ")"),
+    ('offer_count', 'interviews', "substr({p}.offer_date, 1, 10)",
+     "{p}.offer_issued = 1 AND coalesce({p}.offer_date, '') <> ''"),
+    ('onboard_count', 'interviews', "substr({p}.onboard_date, 1, 10)",
+     "{p}.onboard = 1 AND coalesce({p}.onboard_date, '') <> ''"),
+)
+
+# 影响汇总结果的列（其他列变化时不触发汇总更新）
+_ROLLUP_SOURCE_COLUMNS = {
+    'resumes': 'upload_time, applied_position, created_by',
+    'interviews': ('applied_position, created_by, round1_time, status, create_time, '
+                   'offer_issued, offer_date, onboard, onboard_date'),
+}
+
+
+def _rollup_delta(metric: str, day: str, condition: Optional[str], row: str, delta: int) -> str:
+    """把一行记录对某个指标的贡献（+1/-1）累加到汇总表"""
+    day, condition = day.format(p=row), (condition or '1').format(p=row)
+    return (f"INSERT INTO {FUNNEL_DAILY_TABLE} (day, position, created_by, {metric}) "
+            f"SELECT {day}, coalesce({row}.applied_position, ''), coalesce({row}.created_by, ''), {delta} "
+            f"WHERE {condition} "
+            f"ON CONFLICT (day, position, created_by) DO UPDATE SET {metric} = {metric} + excluded.{metric};")
+
+
+def _rollup_triggers() -> List[str]:
+    statements = []
+    for table in ('resumes', 'interviews'):
+        metrics = [m for m in _ROLLUP_METRICS if m[1] == table]
+        added = ' '.join(_rollup_delta(metric, day, cond, 'new', 1) for metric, _, day, cond in metrics)
+        removed = ' '.join(_rollup_delta(metric, day, cond, 'old', -1) for metric, _, day, cond in metrics)
+        statements += [
+            f"DROP TRIGGER IF EXISTS {table}_funnel_insert",
+            f"DROP TRIGGER IF EXISTS {table}_funnel_delete",
+            f"DROP TRIGGER IF EXISTS {table}_funnel_update",
+            f"CREATE TRIGGER {table}_funnel_insert AFTER INSERT ON {table} BEGIN {added} END",
+            f"CREATE TRIGGER {table}_funnel_delete AFTER DELETE ON {table} BEGIN {removed} END",
+            (f"CREATE TRIGGER {table}_funnel_update AFTER UPDATE OF {_ROLLUP_SOURCE_COLUMNS[table]} ON {table} "
+             f"BEGIN {removed} {added} END"),
+        ]
+    return statements
+
+
+def _rebuild_statements() -> List[str]:
+    columns = [metric for metric, _, _, _ in _ROLLUP_METRICS]
+    selects = []
+    for metric, table, day, condition in _ROLLUP_METRICS:
+        values = ', '.join(f"{1 if column == metric else 0} AS {column}" for column in columns)
+        select = (f"SELECT {day.format(p=table)} AS day, coalesce({table}.applied_position, '') AS position, "
+                  f"coalesce({table}.created_by, '') AS created_by, {values} FROM {table}")
+        if condition:
+            select += f" WHERE {condition.format(p=table)}"
+        selects.append(select)
+    sums = ', '.join(f"sum({column})" for column in columns)
+    return [
+        f"DELETE FROM {FUNNEL_DAILY_TABLE}",
+        (f"INSERT INTO {FUNNEL_DAILY_TABLE} (day, position, created_by, {', '.join(columns)}) "
+         f"SELECT day, position, created_by, {sums} FROM ({' UNION ALL '.join(selects)}) "
+         f"GROUP BY day, position, created_by"),
+    ]
+
+
+# 建立触发器并按已有记录生成汇总（在 models.INDEX_MIGRATIONS 中执行）
+FUNNEL_DAILY_MIGRATION = _rollup_triggers() + _rebuild_statements()
+
+
+def rebuild_funnel_daily(conn) -> int:
+    """
+    按原始记录整表重建按日汇总（在同一事务中完成，重建期间的读取仍看到旧汇总）
+
+    Returns:
+        汇总行数
+    """
+    from sqlalchemy import text
+
+    for statement in _rebuild_statements():
+        conn.execute(text(statement))
+    conn.commit()
+    return conn.execute(text(f"SELECT count(*) FROM {FUNNEL_DAILY_TABLE}")).scalar()
+
+
+def funnel_counts_from_rollup(db, start_date: str = '', end_date: str = '',
+                              position: Optional[str] = None) -> Dict[Optional[str], Dict[str, int]]:
+    """
+    从按日汇总表统计各岗位漏斗指标（返回格式同 funnel_counts_by_position，未填岗位归在 '' 下）
+
+    Args:
+        db: 数据库会话
+        start_date / end_date: 日期 YYYY-MM-DD（含当天）；指定任一端时不计入日期为空的记录
+        position: 只统计该岗位
+    """
+    from sqlalchemy import func
+    from models import FunnelDaily
+
+    query = db.query(FunnelDaily.position, *[func.sum(getattr(FunnelDaily, metric)) for metric in FUNNEL_METRICS])
+    if start_date:
+        query = query.filter(FunnelDaily.day >= start_date)
+    if end_date:
+        query = query.filter(FunnelDaily.day <= end_date)
+    if start_date or end_date:
+        query = query.filter(FunnelDaily.day != '')
+    if position:
+        query = query.filter(FunnelDaily.position == position)
+
+    counts = {}
+    for pos, *values in query.group_by(FunnelDaily.position):
+        counts[pos] = {metric: int(value or 0) for metric, value in zip(FUNNEL_METRICS, values)}
+    return counts
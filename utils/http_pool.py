@@ -0,0 +1,120 @@
+"""
+AI接口HTTP连接池
+按 api_base 复用 requests.Session：连接池 + keep-alive，同一服务商的多次调用复用已建立的TCP/TLS连接，
+不再每次重新握手；每个服务商的连接数有上限（Config.AI_HTTP_POOL_SIZE），超出时等待空闲连接。
+429、5xx 以及连接失败时按带随机抖动的指数退避重试（服务端给出 Retry-After 时不早于该时间），
+连接超时与读取超时分开设置。读取超时不重试：请求可能已被处理，重发会重复计费且等待时间翻倍。
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 需要重试的HTTP状态码
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(api_base: str) -> requests.Session:
+    """获取 api_base 对应的共享会话（首次使用时创建，此后常驻）"""
+    from config import Config
+
+    key = api_base.rstrip('/')
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            # 重试由 post_json 处理；pool_block=True 时连接数达到上限的线程等待空闲连接，而不是另建临时连接
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.AI_HTTP_POOL_SIZE,
+                                  pool_block=True, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[key] = session
+    return session
+
+
+def close_sessions() -> None:
+    """关闭所有共享会话（测试和进程退出时使用）"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    第 attempt 次重试（从0开始）前的等待秒数
+
+    在 [0, min(cap, base * 2^attempt)] 内随机取值（full jitter），避免多个线程同时重试；
+    服务端给出 Retry-After 时不早于该时间（同样不超过 cap）
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def post_json(api_base: str, url: str, headers: Dict[str, str], payload: Any,
+              max_retries: Optional[int] = None, connect_timeout: Optional[float] = None,
+              read_timeout: Optional[float] = None, sleep=time.sleep) -> requests.Response:
+    """
+    通过 api_base 的共享会话 POST JSON，429/5xx/连接失败时退避重试
+
+    Args:
+        api_base: 服务商API基础URL（决定使用哪个连接池）
+        url: 完整请求URL
+        headers: 请求头
+        payload: JSON请求体
+        max_retries / connect_timeout / read_timeout: 默认使用 Config.AI_HTTP_*
+        sleep: 退避等待函数（测试时可替换）
+
+    Returns:
+        最后一次响应（重试用尽时可能仍是429/5xx，由调用方处理）
+
+    Raises:
+        requests.exceptions.ConnectionError: 重试用尽后仍无法连接
+        requests.exceptions.ReadTimeout: 读取超时（不重试）
+    """
+    from config import Config
+
+    if max_retries is None:
+        max_retries = Config.AI_HTTP_MAX_RETRIES
+    timeout = (connect_timeout if connect_timeout is not None else Config.AI_HTTP_CONNECT_TIMEOUT,
+               read_timeout if read_timeout is not None else Config.AI_HTTP_READ_TIMEOUT)
+    session = get_session(api_base)
+
+    attempt = 0
+    while True:
+        try:
+            response = session.post(url, headers=headers, json=payload, timeout=timeout)
+        except requests.exceptions.ConnectionError as e:
+            # 包括连接超时和复用的空闲连接已被服务端关闭
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, Config.AI_HTTP_BACKOFF_SECONDS, Config.AI_HTTP_BACKOFF_MAX_SECONDS)
+            print(f"AI API连接失败（{e.__class__.__name__}），{delay:.1f}秒后重试（第{attempt + 1}次）")
+        else:
+            if response.status_code not in RETRY_STATUS or attempt >= max_retries:
+                return response
+            delay = backoff_delay(attempt, Config.AI_HTTP_BACKOFF_SECONDS, Config.AI_HTTP_BACKOFF_MAX_SECONDS,
+                                  _retry_after_seconds(response))
+            print(f"AI API返回 {response.status_code}，{delay:.1f}秒后重试（第{attempt + 1}次）")
+            response.close()
+        attempt += 1
+        sleep(delay)
@@ -0,0 +1,182 @@
+"""
+扫描件OCR工作池
+PDF页面在调用线程中渲染为灰度位图（直接使用像素数据，不做PNG编码），
+然后分发给常驻的OCR工作线程并行识别，结果按页码顺序返回。
+安装了 tesserocr 时每个工作线程复用一个常驻的Tesseract实例（requirements.txt 已包含；
+没有预编译包的平台从源码编译，依赖 aptfile 中的 libtesseract-dev/libleptonica-dev）；
+tesserocr 未安装或初始化失败时退回 pytesseract（每页启动一次tesseract进程），启动时打印提示。
+"""
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional
+
+from config import Config
+
+# 可选导入 tesserocr（常驻Tesseract实例）
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# 可选导入 pytesseract
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+try:
+    import fitz  # PyMuPDF
+    from PIL import Image
+    RENDER_AVAILABLE = True
+except ImportError:
+    RENDER_AVAILABLE = False
+
+OCR_AVAILABLE = RENDER_AVAILABLE and (TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE)
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+# apt 安装的语言包目录（tesseract-ocr-chi-sim 等，见 aptfile）
+_SYSTEM_TESSDATA_PATTERNS = ('/usr/share/tesseract-ocr/*/tessdata', '/usr/share/tessdata')
+
+
+def tessdata_path() -> Optional[str]:
+    """
+    Tesseract语言数据目录：优先使用 Config.OCR_TESSDATA_PATH，否则查找系统安装的语言包目录
+    （tesserocr 的 wheel 自带Tesseract库，默认在当前目录查找语言数据，找不到系统语言包）
+    """
+    if Config.OCR_TESSDATA_PATH:
+        return Config.OCR_TESSDATA_PATH
+    for pattern in _SYSTEM_TESSDATA_PATTERNS:
+        for path in sorted(glob.glob(pattern), reverse=True):
+            if os.path.isdir(path):
+                return path
+    return None
+
+
+def _init_worker():
+    """OCR工作线程初始化：创建本线程常驻的Tesseract实例"""
+    _worker_state.api = None
+    if TESSEROCR_AVAILABLE:
+        try:
+            path = tessdata_path()
+            if path:
+                _worker_state.api = tesserocr.PyTessBaseAPI(path=path, lang=Config.OCR_LANG)
+            else:
+                _worker_state.api = tesserocr.PyTessBaseAPI(lang=Config.OCR_LANG)
+        except Exception as e:
+            print(f"tesserocr初始化失败，改用pytesseract: {e}")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取OCR工作池（首次使用时创建，此后常驻）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if not TESSEROCR_AVAILABLE:
+                print("⚠ 未安装tesserocr，OCR改用pytesseract（每页启动一次tesseract进程）")
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.OCR_WORKERS,
+                thread_name_prefix='ocr-worker',
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def page_zoom(width: float, height: float) -> float:
+    """
+    根据页面尺寸计算渲染放大倍数
+
+    按 Config.OCR_TARGET_DPI 渲染（PDF坐标为72DPI），
+    若位图像素数超过 Config.OCR_MAX_PIXELS 则按比例降低，避免超大页面占用过多内存和识别时间。
+    """
+    zoom = Config.OCR_TARGET_DPI / 72.0
+    pixels = width * height * zoom * zoom
+    if pixels > Config.OCR_MAX_PIXELS:
+        zoom *= (Config.OCR_MAX_PIXELS / pixels) ** 0.5
+    return zoom
+
+
+def render_page_image(page):
+    """把fitz页面渲染为灰度PIL图像（直接使用位图像素，不经过PNG编码）"""
+    zoom = page_zoom(page.rect.width, page.rect.height)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes('L', (pix.width, pix.height), pix.samples)
+
+
+def _ocr_image(img, deadline: float) -> str:
+    """在OCR工作线程中识别一页（排队期间已超出文档时限则跳过）"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return ''
+    api = getattr(_worker_state, 'api', None)
+    if api is not None:
+        api.SetImage(img)
+        return api.GetUTF8Text()
+    # pytesseract 超时后会终止tesseract进程
+    return pytesseract.image_to_string(img, lang=Config.OCR_LANG, timeout=max(remaining, 1))
+
+
+def ocr_document(fitz_doc, max_pages: Optional[int] = None,
+                 time_budget: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    并行OCR识别整份文档
+
+    Args:
+        fitz_doc: 已打开的fitz文档
+        max_pages: 最多识别的页数，默认全部
+        time_budget: 单份文档的总时限（秒），默认 Config.OCR_DOC_TIME_BUDGET；
+                     超时未完成的页面返回空文本
+
+    Returns:
+        按页码顺序排列的 [{'page': 页码(从1开始), 'text': 文本}]
+    """
+    if not OCR_AVAILABLE or fitz_doc is None:
+        return []
+
+    budget = Config.OCR_DOC_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.monotonic() + budget
+    executor = _get_executor()
+    page_count = len(fitz_doc) if max_pages is None else min(len(fitz_doc), max_pages)
+
+    # fitz文档不是线程安全的，渲染在调用线程中进行；每渲染完一页立即提交识别，渲染与识别交叠进行
+    futures = []
+    for page_num in range(page_count):
+        if time.monotonic() >= deadline:
+            break
+        img = render_page_image(fitz_doc[page_num])
+        futures.append(executor.submit(_ocr_image, img, deadline))
+
+    pages = []
+    timed_out = page_count - len(futures)
+    for page_num, future in enumerate(futures):
+        text = ''
+        try:
+            text = future.result(timeout=max(deadline - time.monotonic(), 0)) or ''
+        except FutureTimeoutError:
+            future.cancel()
+            timed_out += 1
+        except Exception as e:
+            print(f"第{page_num + 1}页OCR失败: {e}")
+        pages.append({'page': page_num + 1, 'text': text.strip()})
+
+    for page_num in range(len(futures), page_count):
+        pages.append({'page': page_num + 1, 'text': ''})
+    if timed_out:
+        print(f"⚠ OCR超出时限（{budget}秒），{timed_out} 页未完成识别")
+    return pages
+
+
+def shutdown() -> None:
+    """关闭OCR工作池"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,158 @@
+"""
+列表分页工具
+游标分页（keyset）：按 (排序列, id) 记住上一页最后一行，下一页用 WHERE 条件直接从该位置继续读取，
+耗时不随页数增长；游标为不透明的字符串，由 encode_cursor/decode_cursor 编解码。
+另提供分页大小限制和带有效期的总数缓存。
+"""
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Callable
+
+from sqlalchemy import and_, or_, DateTime
+
+
+class CursorError(ValueError):
+    """游标无效（被篡改或与当前排序不一致）"""
+
+
+def clamp_page_size(value: Optional[int], default: int, maximum: int) -> int:
+    """把请求的每页条数限制在 1 ~ maximum 之间，未指定时使用默认值"""
+    if not value or value < 1:
+        return default
+    return min(value, maximum)
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise CursorError('无效的分页游标')
+    if not isinstance(data, dict):
+        raise CursorError('无效的分页游标')
+    return data
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'无法序列化: {type(value)}')
+
+
+def _restore_value(column, value):
+    """把游标中的排序值还原为列的类型（日期时间在游标中以ISO字符串保存）"""
+    if value is not None and isinstance(column.type, DateTime) and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def keyset_filter(column, id_column, descending: bool, last_value, last_id):
+    """
+    "排在上一页最后一行之后"的条件，与 ORDER BY column, id（同为升序或降序）配合使用
+
+    SQLite中NULL最小：升序时排在最前，降序时排在最后。
+    """
+    if descending:
+        if last_value is None:
+            return and_(column.is_(None), id_column < last_id)
+        return or_(column < last_value,
+                   and_(column == last_value, id_column < last_id),
+                   column.is_(None))
+    if last_value is None:
+        return or_(and_(column.is_(None), id_column > last_id), column.isnot(None))
+    return or_(column > last_value, and_(column == last_value, id_column > last_id))
+
+
+def keyset_page(query, column, id_column, descending: bool, cursor: Optional[str],
+                per_page: int, sort_key: str, row_key: Callable = None, offset: int = 0):
+    """
+    按 (column, id) 游标分页读取一页
+
+    Args:
+        query: 已加好筛选条件、尚未排序的查询
+        column: 排序列
+        id_column: 主键列（排序值相同时的次序，保证游标位置唯一）
+        descending: 是否降序
+        cursor: 上一页返回的 next_cursor，首页为None
+        per_page: 每页条数
+        sort_key: 排序方式标识（写入游标，防止换了排序后继续使用旧游标）
+        row_key: 从结果行取出模型对象的函数（查询返回元组时使用），默认结果行本身
+        offset: 没有游标时跳过的条数（直接跳到某一页，之后的翻页仍使用游标）
+
+    Returns:
+        (本页结果, 下一页游标或None)
+    """
+    if cursor:
+        data = decode_cursor(cursor)
+        if data.get('s') != sort_key or not isinstance(data.get('k'), list) or len(data['k']) != 2:
+            raise CursorError('分页游标与当前排序不一致')
+        last_value, last_id = data['k']
+        query = query.filter(keyset_filter(column, id_column, descending,
+                                           _restore_value(column, last_value), last_id))
+    if descending:
+        query = query.order_by(column.desc(), id_column.desc())
+    else:
+        query = query.order_by(column.asc(), id_column.asc())
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    # 多取一行判断是否还有下一页
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = None
+    if has_more and rows:
+        last = row_key(rows[-1]) if row_key else rows[-1]
+        next_cursor = encode_cursor({'s': sort_key, 'k': [getattr(last, column.key), getattr(last, id_column.key)]})
+    return rows, next_cursor
+
+
+class CountCache:
+    """列表总数缓存：同一筛选条件在有效期内复用上次的 count() 结果"""
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_count(self, key, count: Callable[[], int]) -> int:
+        if self.ttl <= 0:
+            return count()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+        value = count()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (value, now + self.ttl)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate_on_flush(self, *models) -> None:
+        """任一会话新增、修改或删除这些模型的记录时清空缓存（批量 query.delete() 等不经过会话的写入仍以有效期为准）"""
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        @event.listens_for(Session, 'after_flush')
+        def _clear_counts(session, flush_context):
+            for obj in (*session.new, *session.dirty, *session.deleted):
+                if isinstance(obj, models):
+                    self.clear()
+                    return
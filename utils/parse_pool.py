@@ -0,0 +1,152 @@
+"""
+简历解析进程池
+把CPU密集的文本提取（PDF/Word）和规则信息提取放到常驻子进程中执行，绕开GIL；
+子进程启动时预先加载 fitz/pdfplumber/pdfminer 和 InfoExtractor，避免每份简历重复初始化。
+未启用或当前平台不支持时，直接在调用线程中执行。
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, Tuple
+
+from utils.file_parser import extract_text
+from utils.pdf_extractor import extract_pdf_intelligent, record_tier
+from utils.info_extractor import InfoExtractor
+
+# 单份简历在子进程中的最长处理时间（秒）
+TASK_TIMEOUT = 300
+
+_executor = None
+_executor_lock = threading.Lock()
+# 子进程异常退出导致进程池损坏后不再重建：此时工作线程已在运行，在多线程状态下fork不安全，
+# 之后的解析改为在调用线程中执行（重启应用后恢复进程池）
+_pool_broken = False
+
+# 子进程内复用的规则提取器（由 _init_worker 创建）
+_worker_extractor = None
+
+
+def _init_worker():
+    """子进程初始化：预加载解析库和规则提取器"""
+    global _worker_extractor
+    for module in ('fitz', 'pdfplumber', 'pdfminer.high_level'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    _worker_extractor = InfoExtractor()
+
+
+def _ping():
+    return os.getpid()
+
+
+def extract_resume_text_local(file_path: str, details: Optional[Dict[str, Any]] = None) -> str:
+    """在当前进程中提取简历文本（PDF使用智能提取，Word使用原有方法）"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext == '.pdf':
+        return extract_pdf_intelligent(file_path, details=details)
+    return extract_text(file_path)
+
+
+def _extract_resume_text_task(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """文本提取任务：同时返回提取详情，供主进程记录分级命中统计"""
+    details = {}
+    text = extract_resume_text_local(file_path, details)
+    return text, details
+
+
+def extract_resume_info_local(text: str, ai_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """在当前进程中进行规则提取并融合AI结果"""
+    extractor = _worker_extractor or InfoExtractor()
+    return extractor.extract_all(text, ai_result=ai_result)
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    """获取进程池（未启用或平台不支持fork时返回None）"""
+    global _executor
+    from config import Config
+
+    if not Config.PARSE_PROCESS_POOL or _pool_broken:
+        return None
+
+    with _executor_lock:
+        if _pool_broken:
+            return None
+        if _executor is None:
+            # 仅使用fork：spawn会在子进程中重新导入主模块（app.py），触发数据库初始化和任务队列启动
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                print("⚠ 当前平台不支持fork，解析进程池未启用，将在线程中解析")
+                Config.PARSE_PROCESS_POOL = False
+                return None
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.PARSE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """子进程异常退出后丢弃损坏的进程池，此后在调用线程中解析（不在多线程状态下重新fork）"""
+    global _executor, _pool_broken
+    with _executor_lock:
+        _pool_broken = True
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _run(func, *args):
+    executor = _get_executor()
+    if executor is None:
+        return func(*args)
+    try:
+        return executor.submit(func, *args).result(timeout=TASK_TIMEOUT)
+    except BrokenProcessPool as e:
+        print(f"⚠ 解析进程池异常，本次运行期间改为在线程中解析: {e}")
+        _discard_executor(executor)
+        return func(*args)
+
+
+def warm_up() -> int:
+    """
+    预先创建全部子进程（应在启动工作线程之前调用，避免多线程状态下fork）
+
+    Returns:
+        已启动的子进程数，未启用时返回0
+    """
+    executor = _get_executor()
+    if executor is None:
+        return 0
+    from config import Config
+    # fork模式下首次提交任务即会创建全部子进程
+    executor.submit(_ping).result(timeout=TASK_TIMEOUT)
+    print(f"✓ 解析进程池已启动（进程数: {Config.PARSE_PROCESS_WORKERS}）")
+    return Config.PARSE_PROCESS_WORKERS
+
+
+def extract_resume_text(file_path: str) -> str:
+    """提取简历文本（启用进程池时在子进程中执行）"""
+    text, details = _run(_extract_resume_text_task, file_path)
+    if details.get('tier'):
+        record_tier(details['tier'])
+        print(f"PDF分级提取命中: {details['tier']}（{os.path.basename(file_path)}）")
+    return text
+
+
+def extract_resume_info(text: str, ai_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """规则提取简历信息并融合AI结果（启用进程池时在子进程中执行）"""
+    return _run(extract_resume_info_local, text, ai_result)
+
+
+def shutdown() -> None:
+    """关闭进程池"""
+    global _executor, _pool_broken
+    with _executor_lock:
+        executor, _executor = _executor, None
+        _pool_broken = False
+    if executor is not None:
+        executor.shutdown(wait=True)
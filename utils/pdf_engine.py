@@ -0,0 +1,285 @@
+"""
+PDF解析引擎
+每份PDF只打开一次：文件通过内存映射读取，同一个fitz文档对象供纯文本、块布局和OCR渲染共用，
+pdfplumber/pdfminer 也直接从同一块内存解析，避免重复读文件和重复初始化解析器。
+同时提供各提取策略共用的文本质量评分逻辑。
+"""
+import io
+import mmap
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+# 可选导入 PyMuPDF (fitz)
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+
+# 可选导入 pdfplumber
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+# 可选导入 pdfminer.six
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract
+    PDFMINER_AVAILABLE = True
+except ImportError:
+    PDFMINER_AVAILABLE = False
+
+# OCR (Tesseract) 的可选导入在 utils.ocr_pool 中处理
+from utils.ocr_pool import OCR_AVAILABLE, ocr_document
+
+
+class PDFDocument:
+    """
+    单次打开的PDF文档
+
+    用法:
+        with PDFDocument(file_path) as doc:
+            pages = doc.page_texts()
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        except ValueError:
+            # 空文件无法映射
+            self._mmap = None
+            self._buffer = memoryview(self._file.read())
+
+        self._fitz_doc = None
+        self._fitz_error = None
+        self._cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    @property
+    def fitz_doc(self):
+        """共享的fitz文档对象（首次访问时打开，打开失败返回None）"""
+        if self._fitz_doc is None and self._fitz_error is None and FITZ_AVAILABLE:
+            try:
+                self._fitz_doc = fitz.open(stream=self._buffer, filetype='pdf')
+            except Exception as e:
+                self._fitz_error = e
+                print(f"PyMuPDF打开PDF失败: {e}")
+        return self._fitz_doc
+
+    @property
+    def page_count(self) -> int:
+        doc = self.fitz_doc
+        return len(doc) if doc is not None else 0
+
+    def page_texts(self) -> List[Dict[str, Any]]:
+        """PyMuPDF纯文本，按页返回 [{'page': 页码(从1开始), 'text': 文本}]"""
+        if 'text' not in self._cache:
+            pages = []
+            doc = self.fitz_doc
+            if doc is not None:
+                for page_num in range(len(doc)):
+                    page_text = doc[page_num].get_text()
+                    pages.append({'page': page_num + 1, 'text': page_text.strip() if isinstance(page_text, str) else ''})
+            self._cache['text'] = pages
+        return self._cache['text']
+
+    def page_block_texts(self) -> List[Dict[str, Any]]:
+        """PyMuPDF块布局文本（文本块按从上到下、从左到右排序），按页返回"""
+        if 'blocks' not in self._cache:
+            pages = []
+            doc = self.fitz_doc
+            if doc is not None:
+                for page_num in range(len(doc)):
+                    blocks = doc[page_num].get_text('blocks')
+                    # block: (x0, y0, x1, y1, text, block_no, block_type)，block_type=0 为文本块
+                    text_blocks = sorted((b for b in blocks if b[6] == 0), key=lambda b: (round(b[1]), b[0]))
+                    page_text = '\n'.join(b[4].strip() for b in text_blocks if b[4].strip())
+                    pages.append({'page': page_num + 1, 'text': page_text})
+            self._cache['blocks'] = pages
+        return self._cache['blocks']
+
+    def plumber_page_texts(self) -> List[Dict[str, Any]]:
+        """pdfplumber文本（保持布局），按页返回"""
+        if 'plumber' not in self._cache:
+            pages = []
+            if PDFPLUMBER_AVAILABLE:
+                try:
+                    # pdfplumber 按文件对象读取，可直接使用内存映射
+                    source = self._mmap if self._mmap is not None else io.BytesIO(self._buffer)
+                    with pdfplumber.open(source) as pdf:
+                        for page_num, page in enumerate(pdf.pages):
+                            page_text = page.extract_text()
+                            pages.append({'page': page_num + 1, 'text': page_text.strip() if page_text else ''})
+                except Exception as e:
+                    print(f"pdfplumber提取失败: {e}")
+                    pages = []
+            self._cache['plumber'] = pages
+        return self._cache['plumber']
+
+    def pdfminer_text(self) -> str:
+        """pdfminer全文文本（中文优化）"""
+        if 'pdfminer' not in self._cache:
+            text = ''
+            if PDFMINER_AVAILABLE:
+                try:
+                    text = (pdfminer_extract(io.BytesIO(self._buffer)) or '').strip()
+                except Exception as e:
+                    print(f"pdfminer提取失败: {e}")
+            else:
+                print("pdfminer.six 未安装，跳过pdfminer提取")
+            self._cache['pdfminer'] = text
+        return self._cache['pdfminer']
+
+    def render_page(self, page_num: int, zoom: float = 2.0):
+        """把页面渲染为位图（供OCR使用），page_num 从0开始"""
+        doc = self.fitz_doc
+        if doc is None:
+            return None
+        return doc[page_num].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+
+    def ocr_page_texts(self, max_pages: Optional[int] = None,
+                       time_budget: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        OCR识别（扫描件），按页返回；页面并行分发给常驻OCR工作池，渲染DPI随页面尺寸自适应
+
+        Args:
+            max_pages: 最多识别的页数，默认全部
+            time_budget: 整份文档的OCR时限（秒），默认 Config.OCR_DOC_TIME_BUDGET
+        """
+        return ocr_document(self.fitz_doc, max_pages=max_pages, time_budget=time_budget)
+
+    def close(self) -> None:
+        """关闭文档并释放内存映射"""
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        self._cache.clear()
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # 仍有解析库持有缓冲区引用，交由垃圾回收释放
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def join_pages(pages: List[Dict[str, Any]], page_markers: bool = False) -> str:
+    """
+    合并按页提取的文本
+
+    Args:
+        pages: [{'page': 页码, 'text': 文本}]
+        page_markers: 多页时是否添加 "--- 第N页 ---" 分隔标记
+    """
+    non_empty = [p for p in pages if p['text']]
+    if page_markers and len(pages) > 1:
+        return "\n\n".join(f"--- 第{p['page']}页 ---\n{p['text']}" for p in non_empty)
+    return "\n\n".join(p['text'] for p in non_empty)
+
+
+# ============================================================================
+# 文本质量评分（各提取策略共用）
+# ============================================================================
+
+def text_stats(text: str) -> Dict[str, Any]:
+    """统计文本的字符数、中文字符数、不同字符数和中文占比"""
+    text = (text or '').strip()
+    total_chars = len(text)
+    chinese_chars = len(re.findall(r'[\u4e00-\u9fa5]', text))
+    return {
+        'total_chars': total_chars,
+        'chinese_chars': chinese_chars,
+        'unique_chars': len(set(text)),
+        'chinese_ratio': chinese_chars / total_chars if total_chars > 0 else 0
+    }
+
+
+def is_valid_text_pdf(text: str) -> bool:
+    """判断是否为有效的文本PDF提取结果（用于区分文本PDF与扫描件）"""
+    stats = text_stats(text)
+    return (stats['total_chars'] >= 200 and stats['chinese_chars'] >= 50 and
+            stats['chinese_ratio'] >= 0.1 and stats['unique_chars'] >= 50)
+
+
+def assess_text_quality(text: str) -> Dict[str, Any]:
+    """
+    评估提取文本的质量，用于判断是否可以提前结束分级提取
+
+    Returns:
+        dict: 包含 total_chars、chinese_ratio、unique_chars、line_score
+              （非碎片行占比，碎片行指不超过2个字符的行）
+    """
+    stats = text_stats(text)
+    lines = [line.strip() for line in (text or '').strip().split('\n') if line.strip()]
+    fragment_lines = sum(1 for line in lines if len(line) <= 2)
+
+    return {
+        'total_chars': stats['total_chars'],
+        'chinese_ratio': stats['chinese_ratio'],
+        'unique_chars': stats['unique_chars'],
+        'line_score': 1 - fragment_lines / len(lines) if lines else 0
+    }
+
+
+def is_quality_acceptable(quality: Dict[str, Any]) -> bool:
+    """判断文本质量是否达到分级提取的接受阈值（阈值见 Config.PDF_TIER_*）"""
+    from config import Config
+    return (quality['total_chars'] >= Config.PDF_TIER_MIN_CHARS and
+            quality['chinese_ratio'] >= Config.PDF_TIER_MIN_CHINESE_RATIO and
+            quality['unique_chars'] >= Config.PDF_TIER_MIN_UNIQUE_CHARS and
+            quality['line_score'] >= Config.PDF_TIER_MIN_LINE_SCORE)
+
+
+def select_best_result(results: List[Tuple[str, str]]) -> str:
+    """
+    从多个提取结果中选择最佳结果
+
+    Args:
+        results: [(method_name, text), ...] 格式的列表
+
+    Returns:
+        最佳文本内容
+    """
+    if not results:
+        return ""
+
+    best_text = ""
+    best_score = 0
+
+    for method_name, text in results:
+        if not text or not text.strip():
+            continue
+
+        # 判断是否为有效文本
+        if len(text) < 50:
+            continue
+
+        stats = text_stats(text)
+        # 评分标准：文本长度 + 中文字符数 * 2 + 唯一字符数
+        score = len(text) + stats['chinese_chars'] * 2 + len(set(text))
+
+        # 如果中文字符占比太低，降低评分
+        if stats['chinese_chars'] / len(text) < 0.05:
+            score *= 0.5
+
+        if score > best_score:
+            best_score = score
+            best_text = text
+
+    return best_text if best_text else (results[0][1] if results else "")
@@ -0,0 +1,241 @@
+"""
+智能PDF解析
+多种解析库提取文本后择优，并修复PDF提取导致的行混乱问题
+"""
+import re
+import threading
+
+from config import Config
+from utils.pdf_engine import (
+    PDFDocument, join_pages, assess_text_quality, is_quality_acceptable, select_best_result
+)
+
+# 分级提取命中统计（tier -> 次数）
+_tier_stats = {}
+_tier_stats_lock = threading.Lock()
+
+
+def _run_on_document(source, extract, method_name):
+    """source 可以是已打开的 PDFDocument，也可以是文件路径（此时临时打开）"""
+    try:
+        if isinstance(source, PDFDocument):
+            return extract(source)
+        with PDFDocument(source) as doc:
+            return extract(doc)
+    except Exception as e:
+        print(f"{method_name}提取失败: {e}")
+        return ""
+
+def extract_with_pymupdf(source):
+    """使用PyMuPDF提取PDF文本"""
+    return _run_on_document(source, lambda doc: join_pages(doc.page_texts()), "PyMuPDF")
+
+def extract_with_pymupdf_blocks(source):
+    """使用PyMuPDF块布局提取PDF文本（按阅读顺序排列文本块，适合多栏简历）"""
+    return _run_on_document(source, lambda doc: join_pages(doc.page_block_texts()), "PyMuPDF块布局")
+
+def extract_with_pdfplumber(source):
+    """使用pdfplumber提取PDF文本（保持布局）"""
+    return _run_on_document(source, lambda doc: join_pages(doc.plumber_page_texts()), "pdfplumber")
+
+def extract_with_pdfminer(source):
+    """使用pdfminer提取PDF文本（中文优化）"""
+    return _run_on_document(source, lambda doc: doc.pdfminer_text(), "pdfminer")
+
+def should_merge(prev_line, current_line):
+    """
+    判断两行是否应该合并
+    
+    Args:
+        prev_line: 前一行文本
+        current_line: 当前行文本
+    
+    Returns:
+        bool: 是否应该合并
+    """
+    if not prev_line or not current_line:
+        return False
+    
+    # 如果前一行以中文标点结束，不合并
+    if re.search(r'[。！？；：，、]$', prev_line):
+        return False
+    
+    # 如果前一行以英文标点结束，不合并
+    if re.search(r'[.!?;:,\-]$', prev_line):
+        return False
+    
+    # 如果当前行以标点符号开头，不合并
+    if re.match(r'^[。！？；：，、.!?;:]', current_line):
+        return False
+    
+    # 如果前一行以数字或字母结尾，当前行以数字或字母开头，可能需要合并
+    if re.search(r'[0-9a-zA-Z]$', prev_line) and re.match(r'^[0-9a-zA-Z]', current_line):
+        return True
+    
+    # 如果前一行以中文字符结尾，当前行以中文字符开头，可能需要合并
+    if re.search(r'[\u4e00-\u9fa5]$', prev_line) and re.match(r'^[\u4e00-\u9fa5]', current_line):
+        # 检查前一行长度，如果太短可能是被错误分割的
+        if len(prev_line) < 20:
+            return True
+    
+    # 如果前一行以空格或短横线结尾，可能是被错误分割的
+    if prev_line.endswith(' ') or prev_line.endswith('-'):
+        return True
+    
+    return False
+
+def is_complete_sentence(text):
+    """
+    判断文本是否是完整的句子
+    
+    Args:
+        text: 文本内容
+    
+    Returns:
+        bool: 是否是完整句子
+    """
+    if not text:
+        return False
+    
+    # 以中文标点结束
+    if re.search(r'[。！？；]$', text):
+        return True
+    
+    # 以英文标点结束
+    if re.search(r'[.!?;]$', text):
+        return True
+    
+    # 如果文本长度超过50且包含多个中文字符，可能是完整段落
+    if len(text) > 50 and len(re.findall(r'[\u4e00-\u9fa5]', text)) > 10:
+        return True
+    
+    return False
+
+def repair_line_breaks(text):
+    """
+    修复PDF提取的行混乱问题
+    合并被错误分割的中文行
+    
+    Args:
+        text: 原始文本
+    
+    Returns:
+        修复后的文本
+    """
+    if not text:
+        return text
+    
+    lines = text.split('\n')
+    repaired = []
+    buffer = ""
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            # 空行：如果buffer有内容，先保存buffer
+            if buffer:
+                repaired.append(buffer)
+                buffer = ""
+            continue
+        
+        if buffer:
+            # 判断是否需要合并
+            if should_merge(buffer, line):
+                buffer += line
+            else:
+                # 不合并，保存buffer，开始新行
+                repaired.append(buffer)
+                buffer = line
+        else:
+            buffer = line
+        
+        # 检查buffer是否完整（以标点结束）
+        if is_complete_sentence(buffer):
+            repaired.append(buffer)
+            buffer = ""
+    
+    # 处理剩余的buffer
+    if buffer:
+        repaired.append(buffer)
+    
+    return '\n'.join(repaired)
+
+def record_tier(tier):
+    """记录一次分级提取的命中层级"""
+    with _tier_stats_lock:
+        _tier_stats[tier] = _tier_stats.get(tier, 0) + 1
+
+def get_tier_stats():
+    """获取分级提取命中统计，包含各层级次数和命中率"""
+    with _tier_stats_lock:
+        counts = dict(_tier_stats)
+    total = sum(counts.values())
+    return {
+        'total': total,
+        'counts': counts,
+        'hit_rate': {tier: round(count / total, 4) for tier, count in counts.items()} if total else {}
+    }
+
+def extract_pdf_intelligent(file_path, details=None):
+    """
+    智能PDF提取：尝试多种方法，选择最佳结果，并修复行混乱问题
+    
+    整个过程只打开一次PDF（见 utils.pdf_engine.PDFDocument），各方法共用同一份文档。
+    分级模式（Config.PDF_TIERED_EXTRACTION）下先用最快的PyMuPDF提取，质量达标即返回；
+    否则依次尝试PyMuPDF块布局、pdfplumber，仍不达标才运行最慢的pdfminer并择优。
+    块布局只在分级模式下作为提前返回的一级，不参与最终择优：
+    全量比较（不分级，或分级都不达标）始终在 PyMuPDF、pdfplumber、pdfminer 三者中选择。
+    
+    Args:
+        file_path: PDF文件路径
+        details: 可选的字典，用于回传命中层级（tier）和所选文本的质量评估（quality）
+    
+    Returns:
+        提取并修复后的文本
+    """
+    if details is None:
+        details = {}
+    results = []
+    best_text = ""
+    
+    try:
+        doc = PDFDocument(file_path)
+    except Exception as e:
+        print(f"打开PDF失败: {e}")
+        details.update({'tier': 'none', 'quality': assess_text_quality("")})
+        return ""
+    
+    with doc:
+        # 方法1：PyMuPDF（快速）、方法2：PyMuPDF块布局（复用同一文档，仅分级模式）、方法3：pdfplumber（布局保持）
+        # (层级, 提取函数, 是否参与最终择优)
+        tiers = [("pymupdf", extract_with_pymupdf, True), ("pdfplumber", extract_with_pdfplumber, True)]
+        if Config.PDF_TIERED_EXTRACTION:
+            tiers.insert(1, ("pymupdf_blocks", extract_with_pymupdf_blocks, False))
+        for tier, extract, candidate in tiers:
+            text = extract(doc)
+            if not text:
+                continue
+            if candidate:
+                results.append((tier, text))
+            if Config.PDF_TIERED_EXTRACTION:
+                quality = assess_text_quality(text)
+                if is_quality_acceptable(quality):
+                    best_text = text
+                    details.update({'tier': tier, 'quality': quality})
+                    break
+        
+        # 方法4：pdfminer（中文优化），然后选择字符最多且中文比例合理的结果
+        if not best_text:
+            text4 = extract_with_pdfminer(doc)
+            if text4:
+                results.append(("pdfminer", text4))
+            best_text = select_best_result(results)
+            details.update({'tier': 'full' if best_text else 'none', 'quality': assess_text_quality(best_text)})
+    
+    if not best_text:
+        return ""
+    
+    # 修复行混乱问题
+    repaired_text = repair_line_breaks(best_text)
+    
+    return repaired_text
@@ -0,0 +1,290 @@
+"""
+简历全文检索（SQLite FTS5）
+FTS5自带的 unicode61 分词器把连续的汉字当作一个词，无法按姓名、学校中的部分汉字检索。
+这里在写入索引前把每段汉字切成重叠的二字词，最后一个字另作单字词，例如"张三丰"写成"张三 三丰 丰"；
+检索词按同样规则切分后做短语匹配，单个汉字和英文/数字按前缀匹配。
+
+索引表 resumes_fts 为无内容表（content=''），只保存倒排索引，不重复存储简历正文；
+由 resumes 表和正文表 resume_texts 上的触发器调用 search_tokens()/work_experience_tokens() 保持同步，
+这些SQL函数在每个SQLite连接建立时注册（见 models.register_sqlite_functions）。
+无内容表删除时需要提供与写入时相同的分词结果，修改分词规则后必须新增迁移版本重建索引。
+"""
+import json
+import re
+from typing import Optional, Tuple, Any
+
+FTS_TABLE = 'resumes_fts'
+
+# 索引列（与触发器、回填语句中的顺序一致）
+FTS_COLUMNS = ('name', 'school', 'major', 'companies', 'positions', 'raw_text')
+
+# bm25 列权重（与 FTS_COLUMNS 对应）：姓名命中排在最前，正文命中权重最低
+FTS_WEIGHTS = (10.0, 4.0, 4.0, 3.0, 3.0, 1.0)
+
+_CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+
+# 一段连续汉字，或一段连续的其他文字/数字（不含下划线）
+_TOKEN_RE = re.compile(rf'([{_CJK}]+)|([^\W_{_CJK}]+)')
+
+
+def tokenize_text(value: Any) -> str:
+    """把文本转换为写入索引的词序列（空格分隔）"""
+    if not value:
+        return ''
+    tokens = []
+    for match in _TOKEN_RE.finditer(str(value)):
+        cjk, word = match.groups()
+        if cjk:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+            tokens.append(cjk[-1])
+        else:
+            tokens.append(word.lower())
+    return ' '.join(tokens)
+
+
+def work_experience_tokens(value: Any, key: str) -> str:
+    """
+    从工作经历中取出公司或职位并分词
+
+    Args:
+        value: 工作经历（JSON字符串或已解析的列表）
+        key: 'company' 或 'position'
+    """
+    if not value:
+        return ''
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return ''
+    if not isinstance(value, list):
+        return ''
+    return tokenize_text(' '.join(str(item.get(key) or '') for item in value if isinstance(item, dict)))
+
+
+def register_search_functions(dbapi_connection) -> None:
+    """在SQLite连接上注册触发器使用的分词函数"""
+    dbapi_connection.create_function('search_tokens', 1, tokenize_text, deterministic=True)
+    dbapi_connection.create_function('work_experience_tokens', 2, work_experience_tokens, deterministic=True)
+
+
+def build_match_query(term: str, columns: Optional[Tuple[str, ...]] = None) -> Optional[str]:
+    """
+    把用户输入的检索词转换为FTS5 MATCH表达式，多个词之间为"且"关系
+
+    Args:
+        term: 检索词
+        columns: 只在这些索引列中检索（FTS_COLUMNS 的子集），默认全部列
+
+    Returns:
+        MATCH表达式；检索词中没有可检索的文字时返回None
+    """
+    parts = []
+    for match in _TOKEN_RE.finditer(term or ''):
+        cjk, word = match.groups()
+        if cjk and len(cjk) > 1:
+            parts.append('"' + ' '.join(cjk[i:i + 2] for i in range(len(cjk) - 1)) + '"')
+        else:
+            # 单个汉字匹配以它开头的二字词或段尾单字；英文/数字按前缀匹配
+            parts.append(f'"{(cjk or word).lower()}"*')
+    if not parts:
+        return None
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({' '.join(parts)})"
+    return ' '.join(parts)
+
+
+def search_row(resume: dict) -> Tuple[str, ...]:
+    """按 FTS_COLUMNS 顺序生成一份简历的索引内容（供无法使用触发器的数据库手动维护索引）"""
+    work_experience = resume.get('work_experience')
+    return (
+        tokenize_text(resume.get('name')),
+        tokenize_text(resume.get('school')),
+        tokenize_text(resume.get('major')),
+        work_experience_tokens(work_experience, 'company'),
+        work_experience_tokens(work_experience, 'position'),
+        tokenize_text(resume.get('raw_text')),
+    )
+
+
+def _token_values(prefix: str, raw_text: Optional[str] = None) -> str:
+    """
+    触发器中按 FTS_COLUMNS 顺序生成索引内容的SQL表达式
+
+    Args:
+        prefix: 简历行的别名（new/old/表名）
+        raw_text: 正文的SQL表达式，默认 {prefix}.raw_text
+    """
+    return ', '.join([
+        f"search_tokens({prefix}.name)",
+        f"search_tokens({prefix}.school)",
+        f"search_tokens({prefix}.major)",
+        f"work_experience_tokens({prefix}.work_experience, 'company')",
+        f"work_experience_tokens({prefix}.work_experience, 'position')",
+        f"search_tokens({raw_text or prefix + '.raw_text'})",
+    ])
+
+
+_COLUMN_LIST = ', '.join(FTS_COLUMNS)
+
+FTS_CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_COLUMN_LIST}, content='', tokenize='unicode61 remove_diacritics 2')"
+)
+
+_FTS_INSERT_NEW = f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_token_values('new')});"
+_FTS_DELETE_OLD = (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) "
+                   f"VALUES ('delete', old.id, {_token_values('old')});")
+
+# 建表、触发器和回填（在 models.INDEX_MIGRATIONS 中执行）
+FTS_MIGRATION = [
+    FTS_CREATE_TABLE,
+    f"CREATE TRIGGER IF NOT EXISTS resumes_fts_insert AFTER INSERT ON resumes BEGIN {_FTS_INSERT_NEW} END",
+    f"CREATE TRIGGER IF NOT EXISTS resumes_fts_delete AFTER DELETE ON resumes BEGIN {_FTS_DELETE_OLD} END",
+    (f"CREATE TRIGGER IF NOT EXISTS resumes_fts_update "
+     f"AFTER UPDATE OF name, school, major, work_experience, raw_text ON resumes "
+     f"BEGIN {_FTS_DELETE_OLD} {_FTS_INSERT_NEW} END"),
+    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) SELECT id, {_token_values('resumes')} FROM resumes",
+]
+
+# 简历正文改存 resume_texts 表（zlib压缩，见 models.ResumeText）后的触发器：
+# 索引内容 = resumes 行的各列 + resume_texts 中的正文，任一表变化时先按旧内容删除、再按新内容写入。
+# 删除简历时由触发器一并删除正文（ORM 删除时先删正文，此时简历行仍在，索引按"无正文"重写，随后删除简历行）。
+def _stored_text(resume_id: str) -> str:
+    return f"(SELECT resume_text(content) FROM resume_texts WHERE resume_id = {resume_id})"
+
+
+def _fts_rewrite_from_resume(resume_id: str, old_text: str, new_text: str) -> str:
+    return (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) "
+            f"SELECT 'delete', r.id, {_token_values('r', old_text)} FROM resumes r WHERE r.id = {resume_id}; "
+            f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) "
+            f"SELECT r.id, {_token_values('r', new_text)} FROM resumes r WHERE r.id = {resume_id};")
+
+
+FTS_TEXT_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS resumes_fts_insert",
+    "DROP TRIGGER IF EXISTS resumes_fts_delete",
+    "DROP TRIGGER IF EXISTS resumes_fts_update",
+    (f"CREATE TRIGGER resumes_fts_insert AFTER INSERT ON resumes BEGIN "
+     f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_token_values('new', _stored_text('new.id'))}); END"),
+    (f"CREATE TRIGGER resumes_fts_delete AFTER DELETE ON resumes BEGIN "
+     f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) "
+     f"VALUES ('delete', old.id, {_token_values('old', _stored_text('old.id'))}); "
+     f"DELETE FROM resume_texts WHERE resume_id = old.id; END"),
+    (f"CREATE TRIGGER resumes_fts_update AFTER UPDATE OF name, school, major, work_experience ON resumes BEGIN "
+     f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) "
+     f"VALUES ('delete', old.id, {_token_values('old', _stored_text('old.id'))}); "
+     f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_token_values('new', _stored_text('new.id'))}); END"),
+    (f"CREATE TRIGGER resume_texts_fts_insert AFTER INSERT ON resume_texts BEGIN "
+     f"{_fts_rewrite_from_resume('new.resume_id', 'NULL', 'resume_text(new.content)')} END"),
+    (f"CREATE TRIGGER resume_texts_fts_update AFTER UPDATE OF content ON resume_texts BEGIN "
+     f"{_fts_rewrite_from_resume('new.resume_id', 'resume_text(old.content)', 'resume_text(new.content)')} END"),
+    (f"CREATE TRIGGER resume_texts_fts_delete AFTER DELETE ON resume_texts BEGIN "
+     f"{_fts_rewrite_from_resume('old.resume_id', 'resume_text(old.content)', 'NULL')} END"),
+]
+
+# 手动维护索引（D1等无法在触发器中调用Python函数的数据库）
+FTS_INSERT_SQL = f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+FTS_DELETE_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', ?, ?, ?, ?, ?, ?, ?)"
+
+
+def bm25_sql() -> str:
+    """相关度表达式（越小越相关）"""
+    return f"bm25({FTS_TABLE}, {', '.join(str(weight) for weight in FTS_WEIGHTS)})"
+
+
+def rank_sql(param: str = ':match') -> str:
+    """
+    按相关度返回匹配简历ID的子查询（bm25越小越相关）
+
+    Args:
+        param: MATCH表达式的参数占位符（SQLAlchemy用 :match，D1用 ?）
+    """
+    return f"SELECT rowid AS resume_id, {bm25_sql()} AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH {param}"
+
+
+def count_matches(db, match_query: str, limit: Optional[int] = None) -> int:
+    """
+    统计匹配的简历数（只读全文索引，不回表）
+
+    Args:
+        db: 数据库会话
+        match_query: build_match_query() 生成的MATCH表达式
+        limit: 数到该数量即停止（只需判断匹配数是否超过某个值时使用）
+    """
+    from sqlalchemy import text
+
+    sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    params = {'match': match_query}
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params['limit'] = limit
+    return db.execute(text(f"SELECT count(*) FROM ({sql})"), params).scalar() or 0
+
+
+def apply_fulltext_search(query, match_query: str):
+    """
+    给简历查询加上全文检索条件
+
+    Args:
+        query: Resume 查询
+        match_query: build_match_query() 生成的MATCH表达式
+
+    Returns:
+        (加上条件的查询, 全文索引表)，索引表的 rowid 列即简历ID
+    """
+    from sqlalchemy import table, column, text
+    from models import Resume
+
+    fts = table(FTS_TABLE, column('rowid'))
+    query = query.join(fts, Resume.id == fts.c.rowid).filter(
+        text(f"{FTS_TABLE} MATCH :match").bindparams(match=match_query))
+    return query, fts
+
+
+def relevance_page(db, query, match_query: str, cursor: Optional[str], per_page: int, offset: int = 0):
+    """
+    按相关度读取一页检索结果
+
+    匹配数不超过 Config.SEARCH_RANK_LIMIT 时按bm25排序，翻页游标记录偏移量（结果集有上限，偏移代价很小）；
+    匹配数更多的常见词（逐条计算相关度的代价随匹配数线性增长）改为按简历ID倒序（即上传先后），
+    沿全文索引的rowid顺序读取，游标记录上一页最后的简历ID，取到一页即可停止。
+
+    Args:
+        db: 数据库会话
+        query: 已加好其他筛选条件的 Resume 查询（结果行需有 id 属性）
+        match_query: build_match_query() 生成的MATCH表达式
+        cursor: 上一页返回的游标，首页为None
+        per_page: 每页条数
+        offset: 没有游标时跳过的条数（直接跳到某一页）
+
+    Returns:
+        (本页结果, 下一页游标或None)
+    """
+    from sqlalchemy import text
+    from config import Config
+    from models import Resume
+    from utils.pagination import decode_cursor, encode_cursor, CursorError
+
+    data = decode_cursor(cursor) if cursor else {}
+    if data and data.get('s') != 'relevance':
+        raise CursorError('分页游标与当前排序不一致')
+    query, fts = apply_fulltext_search(query, match_query)
+
+    if count_matches(db, match_query, Config.SEARCH_RANK_LIMIT + 1) <= Config.SEARCH_RANK_LIMIT:
+        start = int(data.get('o', offset))
+        rows = query.order_by(text(bm25_sql()), Resume.upload_time.desc(), Resume.id.desc()) \
+            .offset(start).limit(per_page + 1).all()
+        next_data = {'s': 'relevance', 'o': start + per_page}
+    else:
+        query = query.order_by(fts.c.rowid.desc())
+        if 'k' in data:
+            query = query.filter(fts.c.rowid < int(data['k']))
+        elif offset:
+            query = query.offset(offset)
+        rows = query.limit(per_page + 1).all()
+        next_data = {'s': 'relevance', 'k': rows[per_page - 1].id if len(rows) > per_page else None}
+
+    if len(rows) <= per_page:
+        return rows, None
+    return rows[:per_page], encode_cursor(next_data)
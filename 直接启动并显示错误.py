@@ -128,6 +128,8 @@ print("=" * 70)
 print()
 
 try:
+    from app import start_parse_workers
+    start_parse_workers()
     app.run(debug=True, host='127.0.0.1', port=port, use_reloader=False)
 except KeyboardInterrupt:
     print("\n\n服务器已停止")
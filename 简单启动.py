@@ -21,7 +21,7 @@ print()
 try:
     print("正在导入应用...")
     # 导入前先设置环境变量
-    from app import app
+    from app import app, start_parse_workers
     
     print("✓ 应用导入成功")
     print()
@@ -34,6 +34,7 @@ try:
     print()
     
     # 启动服务器
+    start_parse_workers()
     app.run(debug=True, host='127.0.0.1', port=5000, use_reloader=False)
     
 except KeyboardInterrupt:
@@ -179,7 +179,8 @@ else:
     print("\n现在尝试启动服务器...")
     print("=" * 70)
     try:
-        from app import app
+        from app import app, start_parse_workers
+        start_parse_workers()
         print("\n服务器正在启动...")
         print("访问地址: http://127.0.0.1:5000")
         print("按 Ctrl+C 停止服务器\n")